@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Synthetic song catalogs for benchmarks.
+Generates deterministic catalogs of any size, loads them with
+bulk_upsert_songs in bounded batches and removes them again. Every generated
+id starts with ID_PREFIX so benchmark rows never mix with real data.
+
+Usage:
+    python benchmarks/catalog.py load --songs 100000
+    python benchmarks/catalog.py drop
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from src.database.operations import _connection, _songs_changed, bulk_upsert_songs
+
+ID_PREFIX = 'bench-'
+
+# Small vocabularies keep the genre/artist distributions realistic: a few
+# large genres, a long tail of artists, names that share words for search
+GENRES = ('Rock', 'Pop', 'Jazz', 'Classical', 'Hip Hop', 'Electronic', 'Folk', 'Blues',
+          'Country', 'Reggae', 'Metal', 'Soul', 'Gospel', 'Chant', 'Ambient', 'Latin')
+WORDS = ('love', 'night', 'river', 'light', 'heart', 'song', 'road', 'fire', 'rain', 'home',
+         'blue', 'gold', 'morning', 'shadow', 'dream', 'ocean', 'stone', 'wind', 'city', 'moon',
+         'angel', 'summer', 'silver', 'echo', 'glory', 'hymn', 'psalm', 'prayer', 'dawn', 'storm')
+_EPOCH = date(1950, 1, 1)
+
+def song_id(index: int) -> str:
+    """Id of the index-th generated song."""
+    return f"{ID_PREFIX}{index:08d}"
+
+def make_song(index: int, rng: random.Random, artists: int) -> Dict:
+    """Song fields for the index-th song, drawn from rng."""
+    # Skewed choices: low-numbered genres and artists get most songs
+    genre = GENRES[min(int(rng.expovariate(0.25)), len(GENRES) - 1)]
+    artist = min(int(rng.paretovariate(1.2)) - 1, artists - 1)
+    return {
+        'id': song_id(index),
+        'name': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title(),
+        'artist': f"Bench Artist {artist}",
+        'album': f"Bench Album {artist}-{rng.randint(0, 9)}",
+        'release_date': _EPOCH + timedelta(days=rng.randint(0, 27000)),
+        'genre': genre,
+        'duration_in_seconds': rng.randint(60, 600),
+    }
+
+def generate_songs(count: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Yield count synthetic songs; the same count and seed always give the same catalog.
+
+    Args:
+        count: Number of songs to generate
+        seed: Random seed
+
+    Yields:
+        Dict: Song fields accepted by create_song/bulk_upsert_songs
+    """
+    rng = random.Random(seed)
+    artists = max(10, count // 20)
+    for index in range(count):
+        yield make_song(index, rng, artists)
+
+def load_catalog(count: int, seed: int = 42, batch_size: int = 50000) -> float:
+    """
+    Upsert a generated catalog in batches of batch_size rows.
+
+    Returns:
+        float: Seconds taken
+    """
+    started = time.perf_counter()
+    songs = generate_songs(count, seed)
+    while True:
+        batch = list(islice(songs, batch_size))
+        if not batch:
+            break
+        result = bulk_upsert_songs(batch)
+        if result.errors:
+            raise RuntimeError(f"Generated rows were rejected: {result.errors[:3]}")
+    return time.perf_counter() - started
+
+def catalog_size() -> int:
+    """Number of benchmark songs currently stored."""
+    with _connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM songs WHERE id LIKE %s", (ID_PREFIX + '%',))
+            return cur.fetchone()[0]
+
+def drop_catalog() -> int:
+    """
+    Delete every benchmark song.
+
+    Returns:
+        int: Number of songs deleted
+    """
+    with _connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM songs WHERE id LIKE %s", (ID_PREFIX + '%',))
+            deleted = cur.rowcount
+    _songs_changed()
+    return deleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Load or drop a synthetic benchmark catalog")
+    parser.add_argument('action', choices=('load', 'drop', 'count'))
+    parser.add_argument('--songs', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    load_dotenv()
+    if args.action == 'load':
+        elapsed = load_catalog(args.songs, args.seed, args.batch_size)
+        print(f"Loaded {args.songs} songs in {elapsed:.1f}s ({args.songs / elapsed:.0f} rows/s)")
+    elif args.action == 'drop':
+        print(f"Deleted {drop_catalog()} songs")
+    else:
+        print(catalog_size())
+
+if __name__ == '__main__':
+    main()
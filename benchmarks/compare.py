@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files written by benchmarks/suite.py.
+Prints the change in throughput and latency percentiles per benchmark and
+exits with status 1 when any benchmark regressed by more than the threshold,
+so it can gate a CI job.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/head.json
+    python benchmarks/compare.py base.json head.json --threshold 0.2 --metric p99_ms
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+def compare(base: Dict, head: Dict, metric: str = 'p95_ms', threshold: float = 0.1) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Relative change of one metric for every benchmark present in both runs.
+
+    Latency regresses when it grows, throughput when it shrinks.
+
+    Returns:
+        List of (benchmark, base value, head value, relative change, regressed)
+    """
+    rows = []
+    for name, before in base['results'].items():
+        after = head['results'].get(name)
+        if after is None:
+            continue
+        old, new = before[metric], after[metric]
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric == 'throughput' else change
+        rows.append((name, old, new, change, worse > threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--metric', default='p95_ms', choices=LATENCY_METRICS + ('throughput',),
+                        help="Metric that decides whether a benchmark regressed")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed relative slowdown before failing (0.1 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    for label, report in (('base', base), ('head', head)):
+        print(f"{label}: {(report.get('commit') or 'unknown')[:12]}{' (dirty)' if report.get('dirty') else ''} "
+              f"songs={report['songs']} concurrency={report['concurrency']}")
+    if (base['songs'], base['concurrency'], base['cache']) != (head['songs'], head['concurrency'], head['cache']):
+        print("warning: runs used different settings; differences may not be regressions")
+
+    rows = compare(base, head, args.metric, args.threshold)
+    print(f"\n{'benchmark':<28} {'base':>10} {'head':>10} {'change':>8}")
+    for name, old, new, change, regressed in rows:
+        print(f"{name:<28} {old:>10.2f} {new:>10.2f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%} on {args.metric}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
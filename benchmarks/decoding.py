@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Row decoding benchmark for large result sets.
+Fetches a synthetic catalog (see benchmarks/catalog.py) in one query and
+compares the ways of turning its rows into songs: DictCursor rows through
+from_db_row into a dataclass with a per-instance __dict__ (the original
+path, kept here since the operations no longer use it), plain tuples into
+that same dataclass, and plain tuples straight into the slotted Song the
+operations now return. Reports per-row fetch and decode time, and with
+tracemalloc the peak memory of fetch plus decode and the memory the
+decoded songs keep.
+
+Usage:
+    python benchmarks/decoding.py --songs 100000
+    python benchmarks/decoding.py --songs 100000 --repeat 5 --keep
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import starmap
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from psycopg2 import sql
+from psycopg2.extensions import cursor as TupleCursor
+from psycopg2.extras import DictCursor
+
+from benchmarks import catalog
+from src.database.operations import SONG_COLUMNS, Song, _connection
+
+@dataclass
+class DictSong:
+    """Song as it was before __slots__: same fields, one __dict__ per instance."""
+    id: str
+    name: str
+    artist: str
+    album: str
+    release_date: date
+    genre: str
+    duration_in_seconds: int
+    created_at: datetime = None
+    updated_at: datetime = None
+
+    @classmethod
+    def from_db_row(cls, row):
+        """Create a song from a DictCursor row, as Song.from_db_row did."""
+        # Convert the row to a dictionary if it's not already
+        if not isinstance(row, dict):
+            row = dict(row)
+        
+        # Extract only the fields we need
+        song_data = {
+            'id': row['id'],
+            'name': row['name'],
+            'artist': row['artist'],
+            'album': row['album'],
+            'release_date': row['release_date'],
+            'genre': row['genre'],
+            'duration_in_seconds': row['duration_in_seconds'],
+            'created_at': row.get('created_at'),
+            'updated_at': row.get('updated_at')
+        }
+        
+        return cls(**song_data)
+
+# name -> (cursor class, rows -> songs)
+VARIANTS: Dict[str, tuple] = {
+    'dict rows, from_db_row': (DictCursor, lambda rows: [DictSong.from_db_row(row) for row in rows]),
+    'tuple rows, dataclass': (TupleCursor, lambda rows: list(starmap(DictSong, rows))),
+    'tuple rows, slotted Song': (TupleCursor, lambda rows: list(starmap(Song, rows))),
+}
+
+def measure(fetch: Callable[[], List], decode: Callable[[List], List], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time and trace fetch() followed by decode(rows).
+
+    Times are the best of repeat untraced runs; memory comes from one more
+    run under tracemalloc. Everything is reported per row.
+
+    Returns:
+        Dict[str, float]: rows, fetch_us, decode_us, peak_bytes (fetch and
+            decode together) and retained_bytes (the decoded songs alone)
+    """
+    fetch_times, decode_times = [], []
+    rows = []
+    for _ in range(repeat):
+        rows = None
+        gc.collect()
+        started = time.perf_counter()
+        rows = fetch()
+        fetched = time.perf_counter()
+        songs = decode(rows)
+        decoded = time.perf_counter()
+        fetch_times.append(fetched - started)
+        decode_times.append(decoded - fetched)
+        del songs
+    count = len(rows)
+    rows = None
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        rows = fetch()
+        songs = decode(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        rows = None
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del songs
+
+    per_row = max(count, 1)
+    return {
+        'rows': count,
+        'fetch_us': round(min(fetch_times) / per_row * 1e6, 3),
+        'decode_us': round(min(decode_times) / per_row * 1e6, 3),
+        'peak_bytes': round(peak / per_row, 1),
+        'retained_bytes': round(retained / per_row, 1),
+    }
+
+def _fetcher(conn, cursor_class, songs: int) -> Callable[[], List]:
+    query = sql.SQL("SELECT {} FROM songs WHERE id LIKE %s ORDER BY id LIMIT %s").format(
+        sql.SQL(', ').join(sql.Identifier(column) for column in SONG_COLUMNS)
+    )
+
+    def fetch():
+        with conn.cursor(cursor_factory=cursor_class) as cur:
+            cur.execute(query, (catalog.ID_PREFIX + '%', songs))
+            return cur.fetchall()
+    return fetch
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare row decoding paths on a large result set")
+    parser.add_argument('--songs', type=int, default=100000, help="Rows fetched per run (synthetic catalog size)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per variant (the best is reported)")
+    parser.add_argument('--keep', action='store_true', help="Keep the catalog loaded afterwards")
+    args = parser.parse_args()
+
+    load_dotenv()
+    stored = catalog.catalog_size()
+    if stored != args.songs:
+        if stored:
+            catalog.drop_catalog()
+        elapsed = catalog.load_catalog(args.songs)
+        print(f"Loaded {args.songs} songs in {elapsed:.1f}s", file=sys.stderr)
+
+    try:
+        print(f"{'variant':<26} {'rows':>8} {'fetch us/row':>13} {'decode us/row':>14} "
+              f"{'peak B/row':>11} {'kept B/row':>11}")
+        with _connection() as conn:
+            for name, (cursor_class, decode) in VARIANTS.items():
+                result = measure(_fetcher(conn, cursor_class, args.songs), decode, args.repeat)
+                print(f"{name:<26} {result['rows']:>8} {result['fetch_us']:>13.3f} {result['decode_us']:>14.3f} "
+                      f"{result['peak_bytes']:>11.0f} {result['retained_bytes']:>11.0f}")
+    finally:
+        if not args.keep:
+            catalog.drop_catalog()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for API request routing.
+Compares the routing trie against a linear if/elif-style scan as the number
+of registered routes grows. No database is needed.
+
+Usage:
+    python benchmarks/routing.py
+    python benchmarks/routing.py --routes 10 50 200 --iterations 200000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.routing import Router
+
+def _noop(event, params):
+    return None
+
+def _templates(count: int):
+    """Route templates resembling the API: collections, items and sub-resources."""
+    templates = []
+    i = 0
+    while len(templates) < count:
+        templates.append(f'/resource{i}')
+        templates.append(f'/resource{i}/{{item_id}}')
+        templates.append(f'/resource{i}/{{item_id}}/children')
+        i += 1
+    return templates[:count]
+
+def build_router(templates) -> Router:
+    router = Router()
+    for template in templates:
+        router.add('GET', template, _noop)
+    return router
+
+def build_linear(templates):
+    """Ordered (segments, handler) list matched one route at a time."""
+    return [(template.strip('/').split('/'), _noop) for template in templates]
+
+def resolve_linear(routes, method, path):
+    segments = path.strip('/').split('/')
+    for template, handler in routes:
+        if len(template) != len(segments):
+            continue
+        params = {}
+        for expected, actual in zip(template, segments):
+            if expected.startswith('{'):
+                params[expected[1:-1]] = actual
+            elif expected != actual:
+                break
+        else:
+            return handler, params
+    return None, {}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request routing")
+    parser.add_argument('--routes', type=int, nargs='+', default=[8, 24, 48, 96, 192])
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'routes':>7} {'trie (ns/op)':>14} {'linear (ns/op)':>16}")
+    for count in args.routes:
+        templates = _templates(count)
+        router = build_router(templates)
+        linear = build_linear(templates)
+        # Worst case for the linear scan: the last registered route
+        last = templates[-1].replace('{item_id}', 'ITEM42')
+
+        assert router.resolve('GET', last).handler is _noop
+        assert resolve_linear(linear, 'GET', last)[0] is _noop
+
+        trie = min(timeit.repeat(lambda: router.resolve('GET', last), number=args.iterations, repeat=3))
+        scan = min(timeit.repeat(lambda: resolve_linear(linear, 'GET', last), number=args.iterations, repeat=3))
+        print(f"{count:>7} {trie / args.iterations * 1e9:>14.0f} {scan / args.iterations * 1e9:>16.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the OurChants database layer and API routes.
+Loads a synthetic catalog (see benchmarks/catalog.py), then measures
+latency percentiles and throughput for each operation in
+src/database/operations.py and each route served by the Lambda handler.
+Results are written as JSON tagged with the git commit, for
+benchmarks/compare.py.
+
+Caches are disabled by default so results reflect the database path; pass
+--with-cache to measure the deployed configuration instead.
+
+Usage:
+    python benchmarks/suite.py --songs 10000
+    python benchmarks/suite.py --songs 1000000 --concurrency 8 --only get_song 'GET /songs/{id}'
+    python benchmarks/suite.py --keep --output benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dotenv import load_dotenv
+
+from benchmarks import catalog
+from src.database import operations
+from src.database.cache import NullCache
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """
+    Summarize one benchmark's per-call latencies (seconds).
+
+    Returns:
+        Dict[str, float]: Call count, errors, throughput (calls/s) and
+            mean/p50/p95/p99/max latency in milliseconds
+    """
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        'count': count,
+        'errors': errors,
+        'throughput': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        'mean_ms': round(sum(values) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+def run_benchmark(
+    call: Callable[[random.Random], None],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 10,
+    seed: int = 0
+) -> Dict[str, float]:
+    """
+    Time iterations calls of call(rng), spread over concurrency threads.
+
+    Each thread gets its own seeded Random so runs are repeatable. Calls that
+    raise are counted as errors and left out of the latencies.
+    """
+    warm_rng = random.Random(seed)
+    for _ in range(warmup):
+        call(warm_rng)
+
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(index: int, count: int):
+        rng = random.Random(seed * 1000 + index)
+        timings = []
+        failed = 0
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                call(rng)
+            except Exception:
+                failed += 1
+                continue
+            timings.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(timings)
+            errors[0] += failed
+
+    shares = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency), shares))
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ('git',) + args, cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def operation_benchmarks(songs: int) -> Dict[str, Callable[[random.Random], None]]:
+    """Benchmarks for the functions in src/database/operations.py."""
+    def any_id(rng):
+        return catalog.song_id(rng.randrange(songs))
+
+    deep_offset = max(0, songs - 100)
+    cursor = operations.list_songs_page(limit=100, genre='Rock').next_cursor
+
+    def create_delete(rng):
+        new_id = f"{catalog.ID_PREFIX}new-{threading.get_ident()}-{rng.random()}"
+        operations.create_song({
+            'id': new_id, 'name': 'Bench New', 'artist': 'Bench Artist 0', 'album': 'Bench Album 0-0',
+            'release_date': '2020-01-01', 'genre': 'Rock', 'duration_in_seconds': 200
+        })
+        operations.delete_song(new_id)
+
+    def bulk_upsert(rng):
+        # Rewrites 1000 consecutive existing songs with fresh values
+        start = rng.randrange(max(1, songs - 1000))
+        artists = max(10, songs // 20)
+        operations.bulk_upsert_songs(
+            catalog.make_song(index, rng, artists) for index in range(start, min(songs, start + 1000))
+        )
+
+    return {
+        'get_song': lambda rng: operations.get_song(any_id(rng)),
+        'get_song_version': lambda rng: operations.get_song_version(any_id(rng)),
+        'get_songs[50]': lambda rng: operations.get_songs([any_id(rng) for _ in range(50)]),
+        'list_songs_page': lambda rng: operations.list_songs_page(limit=100, genre=rng.choice(catalog.GENRES)),
+        'list_songs_page[cursor]': lambda rng: operations.list_songs_page(limit=100, cursor=cursor, genre='Rock'),
+        'list_songs[deep offset]': lambda rng: operations.list_songs(limit=100, offset=deep_offset),
+        'search_songs': lambda rng: operations.search_songs(rng.choice(catalog.WORDS), limit=20),
+        'get_stats': lambda rng: operations.get_stats(),
+        # One of the less common genres (see catalog.make_song's skew), read to the end
+        'export_songs[genre]': lambda rng: sum(1 for _ in operations.export_songs(genre=rng.choice(catalog.GENRES[8:]))),
+        'update_song': lambda rng: operations.update_song(any_id(rng), {'duration_in_seconds': rng.randint(60, 600)}),
+        'create_song+delete_song': create_delete,
+        'bulk_upsert_songs[1000]': bulk_upsert,
+    }
+
+def route_benchmarks(songs: int) -> Dict[str, Callable[[random.Random], None]]:
+    """Benchmarks for each route, driven through the Lambda handler."""
+    from src.api.api import handler
+
+    def call(event):
+        response = handler(event, None)
+        if response['statusCode'] >= 500:
+            raise RuntimeError(response['body'])
+
+    def any_id(rng):
+        return catalog.song_id(rng.randrange(songs))
+
+    def post_delete(rng):
+        new_id = f"{catalog.ID_PREFIX}new-{threading.get_ident()}-{rng.random()}"
+        call({'httpMethod': 'POST', 'path': '/songs', 'body': json.dumps({
+            'id': new_id, 'name': 'Bench New', 'artist': 'Bench Artist 0', 'album': 'Bench Album 0-0',
+            'release_date': '2020-01-01', 'genre': 'Rock', 'duration_in_seconds': 200
+        })})
+        call({'httpMethod': 'DELETE', 'path': f'/songs/{new_id}'})
+
+    return {
+        'GET /songs/{id}': lambda rng: call({'httpMethod': 'GET', 'path': f'/songs/{any_id(rng)}'}),
+        'GET /songs': lambda rng: call({
+            'httpMethod': 'GET', 'path': '/songs',
+            'queryStringParameters': {'limit': '100', 'genre': rng.choice(catalog.GENRES)}
+        }),
+        'GET /songs?ids': lambda rng: call({
+            'httpMethod': 'GET', 'path': '/songs',
+            'queryStringParameters': {'ids': ','.join(any_id(rng) for _ in range(50))}
+        }),
+        'POST /songs:batchGet': lambda rng: call({
+            'httpMethod': 'POST', 'path': '/songs:batchGet',
+            'body': json.dumps([any_id(rng) for _ in range(50)])
+        }),
+        'GET /songs/search': lambda rng: call({
+            'httpMethod': 'GET', 'path': '/songs/search', 'queryStringParameters': {'q': rng.choice(catalog.WORDS)}
+        }),
+        'GET /stats': lambda rng: call({'httpMethod': 'GET', 'path': '/stats'}),
+        # Filtered by a less common artist so the body stays under the handler's LAMBDA_MAX_BODY_BYTES
+        'GET /songs/export': lambda rng: call({
+            'httpMethod': 'GET', 'path': '/songs/export',
+            'queryStringParameters': {'artist': f"Bench Artist {rng.randrange(10, 100)}"}
+        }),
+        'PUT /songs/{id}': lambda rng: call({
+            'httpMethod': 'PUT', 'path': f'/songs/{any_id(rng)}',
+            'body': json.dumps({'duration_in_seconds': rng.randint(60, 600)})
+        }),
+        'POST+DELETE /songs': post_delete,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database operations and API routes")
+    parser.add_argument('--songs', type=int, default=10000, help="Synthetic catalog size")
+    parser.add_argument('--iterations', type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument('--warmup', type=int, default=10, help="Untimed calls per benchmark")
+    parser.add_argument('--concurrency', type=int, default=1, help="Threads issuing calls")
+    parser.add_argument('--only', nargs='+', help="Run only these benchmarks")
+    parser.add_argument('--with-cache', action='store_true', help="Keep the song/list caches enabled")
+    parser.add_argument('--keep', action='store_true', help="Keep the catalog loaded afterwards")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    # Keep the cold-start EMF line out of the results table
+    os.environ.setdefault('METRICS_ENABLED', 'false')
+    if not args.with_cache:
+        operations.set_song_cache(NullCache())
+        operations.set_list_cache(NullCache())
+
+    stored = catalog.catalog_size()
+    if stored != args.songs:
+        if stored:
+            catalog.drop_catalog()
+        elapsed = catalog.load_catalog(args.songs)
+        print(f"Loaded {args.songs} songs in {elapsed:.1f}s", file=sys.stderr)
+
+    benchmarks = dict(operation_benchmarks(args.songs), **route_benchmarks(args.songs))
+    if args.only:
+        unknown = set(args.only) - set(benchmarks)
+        if unknown:
+            parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+        benchmarks = {name: benchmarks[name] for name in args.only}
+
+    results = {}
+    try:
+        print(f"{'benchmark':<28} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for index, (name, call) in enumerate(benchmarks.items()):
+            result = run_benchmark(call, args.iterations, args.concurrency, args.warmup, seed=index)
+            results[name] = result
+            print(f"{name:<28} {result['throughput']:>9.1f} {result['p50_ms']:>9.2f} "
+                  f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}")
+    finally:
+        if not args.keep:
+            catalog.drop_catalog()
+
+    sha = _git('rev-parse', 'HEAD')
+    report = {
+        'commit': sha,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'songs': args.songs,
+        'iterations': args.iterations,
+        'concurrency': args.concurrency,
+        'cache': args.with_cache,
+        'results': results,
+    }
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{(sha or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
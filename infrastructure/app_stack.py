@@ -93,11 +93,41 @@ class OurChantsStack(Stack):
                 "DB_NAME": "ourchants",
                 "DB_PORT": "5432",
                 "ASSETS_BUCKET": assets_bucket.bucket_name,
+                # Credentials are read from the secret and cached per container
+                "DB_SECRET_ARN": db_instance.secret.secret_arn,
+                # Open a pooled connection during init rather than on the first request
+                "DB_POOL_PREWARM": "1",
             },
             timeout=Duration.seconds(30),
             memory_size=256,
         )
 
+        # Optional read replica for read-only operations (cdk deploy -c read_replica=true);
+        # reads fall back to the primary when it is unreachable
+        if self.node.try_get_context("read_replica") in (True, "true"):
+            read_replica = rds.DatabaseInstanceReadReplica(
+                self, "OurChantsReadReplica",
+                source_database_instance=db_instance,
+                instance_type=ec2.InstanceType.of(
+                    ec2.InstanceClass.BURSTABLE3,
+                    ec2.InstanceSize.MICRO,
+                ),
+                vpc=vpc,
+                vpc_subnets=ec2.SubnetSelection(
+                    subnet_type=ec2.SubnetType.PRIVATE_ISOLATED
+                ),
+                security_groups=[db_security_group],
+                removal_policy=RemovalPolicy.DESTROY,
+                deletion_protection=False,
+            )
+            api_function.add_environment("DB_READ_HOST", read_replica.instance_endpoint.hostname)
+            
+            CfnOutput(
+                self, "ReadReplicaEndpoint",
+                value=read_replica.instance_endpoint.hostname,
+                description="Read replica endpoint",
+            )
+
         # Grant permissions
         db_instance.secret.grant_read(api_function)
         assets_bucket.grant_read_write(api_function)
@@ -107,6 +137,8 @@ class OurChantsStack(Stack):
             self, "OurChantsAPIGateway",
             rest_api_name="OurChants API",
             description="API for OurChants application",
+            # Lets the Lambda return gzip/br bodies as base64 (see src/api/compression.py)
+            binary_media_types=["*/*"],
             deploy_options=apigw.StageOptions(
                 stage_name="prod",
                 logging_level=apigw.MethodLoggingLevel.INFO,
@@ -122,6 +154,21 @@ class OurChantsStack(Stack):
         songs.add_method("GET", api_integration)
         songs.add_method("POST", api_integration)
         
+        songs_batch = api.root.add_resource("songs:batch")
+        songs_batch.add_method("POST", api_integration)
+        
+        songs_batch_get = api.root.add_resource("songs:batchGet")
+        songs_batch_get.add_method("POST", api_integration)
+        
+        songs_search = songs.add_resource("search")
+        songs_search.add_method("GET", api_integration)
+
+        songs_export = songs.add_resource("export")
+        songs_export.add_method("GET", api_integration)
+
+        stats = api.root.add_resource("stats")
+        stats.add_method("GET", api_integration)
+        
         song = songs.add_resource("{song_id}")
         song.add_method("GET", api_integration)
         song.add_method("PUT", api_integration)
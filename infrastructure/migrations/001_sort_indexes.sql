@@ -0,0 +1,20 @@
+-- Replace the single-column sort indexes with (column, id) indexes on a
+-- live database without blocking writes. CONCURRENTLY cannot run inside a
+-- transaction, so run this file with psql (one transaction per statement):
+--
+--     psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f infrastructure/migrations/001_sort_indexes.sql
+--
+-- Safe to re-run. A build interrupted part-way leaves an INVALID index;
+-- drop it and run the file again.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_artist_id ON songs(artist, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_genre_id ON songs(genre, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_release_date_id ON songs(release_date, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_name_id ON songs(name, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_album_id ON songs(album, id);
+
+-- The new indexes serve every query the old ones did
+DROP INDEX CONCURRENTLY IF EXISTS idx_songs_artist;
+DROP INDEX CONCURRENTLY IF EXISTS idx_songs_genre;
+DROP INDEX CONCURRENTLY IF EXISTS idx_songs_release_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_songs_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_songs_album;
@@ -11,12 +11,44 @@ CREATE TABLE IF NOT EXISTS songs (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create indexes for common query patterns
-CREATE INDEX idx_songs_artist ON songs(artist);
-CREATE INDEX idx_songs_genre ON songs(genre);
-CREATE INDEX idx_songs_release_date ON songs(release_date);
-CREATE INDEX idx_songs_name ON songs(name);
-CREATE INDEX idx_songs_album ON songs(album);
+-- Create indexes for common query patterns. Every sortable column is
+-- indexed as (column, id) so sorted and keyset-paged lists never need a sort.
+-- They replace the original single-column idx_songs_<column> indexes, which
+-- are dropped here; infrastructure/migrations/001_sort_indexes.sql does the
+-- same without blocking writes on a live database.
+CREATE INDEX IF NOT EXISTS idx_songs_artist_id ON songs(artist, id);
+CREATE INDEX IF NOT EXISTS idx_songs_genre_id ON songs(genre, id);
+CREATE INDEX IF NOT EXISTS idx_songs_release_date_id ON songs(release_date, id);
+CREATE INDEX IF NOT EXISTS idx_songs_name_id ON songs(name, id);
+CREATE INDEX IF NOT EXISTS idx_songs_album_id ON songs(album, id);
+DROP INDEX IF EXISTS idx_songs_artist;
+DROP INDEX IF EXISTS idx_songs_genre;
+DROP INDEX IF EXISTS idx_songs_release_date;
+DROP INDEX IF EXISTS idx_songs_name;
+DROP INDEX IF EXISTS idx_songs_album;
+
+-- Full-text search: a generated tsvector kept in sync by PostgreSQL itself.
+-- The 'simple' configuration avoids English stemming of titles and names
+-- from many languages.
+ALTER TABLE songs ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(artist, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(album, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(genre, '')), 'D')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_songs_search ON songs USING GIN (search_vector);
+
+-- Fuzzy matching on name/artist/album; skipped where pg_trgm is not installed
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS idx_songs_name_trgm ON songs USING GIN (name gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_songs_artist_trgm ON songs USING GIN (artist gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_songs_album_trgm ON songs USING GIN (album gin_trgm_ops);
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pg_trgm unavailable (%), fuzzy search disabled', SQLERRM;
+END $$;
 
 -- Create function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -28,7 +60,122 @@ END;
 $$ language 'plpgsql';
 
 -- Create trigger to automatically update updated_at
+DROP TRIGGER IF EXISTS update_songs_updated_at ON songs;
 CREATE TRIGGER update_songs_updated_at
     BEFORE UPDATE ON songs
     FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at_column(); 
\ No newline at end of file
+    EXECUTE FUNCTION update_updated_at_column(); 
+
+-- Catalog statistics rollup. One row per (dimension, value) with the song
+-- count and total duration. Statement-level triggers apply the net change of
+-- each write from its transition tables, so GET /stats never scans songs.
+-- There is no catalog-wide row: every write would update it, serializing all
+-- writers on one row lock. Totals are summed from the genre rows when read.
+CREATE TABLE IF NOT EXISTS song_stats (
+    dimension VARCHAR(20) NOT NULL,
+    value VARCHAR(255) NOT NULL,
+    song_count BIGINT NOT NULL,
+    total_duration BIGINT NOT NULL,
+    PRIMARY KEY (dimension, value)
+);
+-- Finds buckets emptied by an update or delete without scanning the table
+CREATE INDEX IF NOT EXISTS idx_song_stats_empty ON song_stats(dimension) WHERE song_count = 0;
+
+CREATE OR REPLACE FUNCTION apply_song_stats_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    delta TEXT;
+BEGIN
+    delta := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT genre, artist, release_date, duration_in_seconds, 1 AS n FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT genre, artist, release_date, duration_in_seconds, -1 AS n FROM old_rows'
+        ELSE
+            'SELECT genre, artist, release_date, duration_in_seconds, 1 AS n FROM new_rows
+             UNION ALL
+             SELECT genre, artist, release_date, duration_in_seconds, -1 AS n FROM old_rows'
+    END;
+
+    -- Rows are upserted in key order so concurrent writers lock them in the
+    -- same order; updates that do not touch a rollup column net to zero and
+    -- are skipped entirely
+    EXECUTE format($sql$
+        WITH delta AS (%s),
+        dims AS (
+            SELECT 'genre'::text AS dimension, genre::text AS value, n, n * duration_in_seconds AS d FROM delta
+            UNION ALL
+            SELECT 'artist', artist, n, n * duration_in_seconds FROM delta
+            UNION ALL
+            SELECT 'release_year', extract(year FROM release_date)::int::text, n, n * duration_in_seconds FROM delta
+        )
+        INSERT INTO song_stats AS s (dimension, value, song_count, total_duration)
+        SELECT dimension, value, sum(n), sum(d)
+        FROM dims
+        GROUP BY dimension, value
+        HAVING sum(n) <> 0 OR sum(d) <> 0
+        ORDER BY dimension, value
+        ON CONFLICT (dimension, value) DO UPDATE
+        SET song_count = s.song_count + EXCLUDED.song_count,
+            total_duration = s.total_duration + EXCLUDED.total_duration
+    $sql$, delta);
+
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM song_stats WHERE song_count = 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full recompute; used for the initial backfill and to repair drift
+CREATE OR REPLACE FUNCTION refresh_song_stats()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM song_stats;
+    INSERT INTO song_stats (dimension, value, song_count, total_duration)
+    SELECT 'genre', genre, count(*), sum(duration_in_seconds) FROM songs GROUP BY genre
+    UNION ALL
+    SELECT 'artist', artist, count(*), sum(duration_in_seconds) FROM songs GROUP BY artist
+    UNION ALL
+    SELECT 'release_year', extract(year FROM release_date)::int::text, count(*), sum(duration_in_seconds)
+    FROM songs GROUP BY extract(year FROM release_date)::int;
+    DELETE FROM song_stats WHERE song_count = 0;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_song_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_song_stats();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS song_stats_insert ON songs;
+CREATE TRIGGER song_stats_insert
+    AFTER INSERT ON songs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_song_stats_delta();
+
+DROP TRIGGER IF EXISTS song_stats_update ON songs;
+CREATE TRIGGER song_stats_update
+    AFTER UPDATE ON songs
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_song_stats_delta();
+
+DROP TRIGGER IF EXISTS song_stats_delete ON songs;
+CREATE TRIGGER song_stats_delete
+    AFTER DELETE ON songs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_song_stats_delta();
+
+DROP TRIGGER IF EXISTS song_stats_truncate ON songs;
+CREATE TRIGGER song_stats_truncate
+    AFTER TRUNCATE ON songs
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION clear_song_stats();
+
+SELECT refresh_song_stats();
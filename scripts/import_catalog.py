@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Streaming catalog importer for the OurChants application.
+Reads JSON ({"songs": [...]} or a top-level list), NDJSON or CSV files
+incrementally, validates each record against the Song model and loads
+fixed-size batches with bulk_upsert_songs, so memory stays bounded no
+matter how large the input file is.
+
+Usage:
+    python scripts/import_catalog.py data/sample_songs.json
+    python scripts/import_catalog.py catalog.ndjson --batch-size 10000 --resume
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, TextIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from models.song import Song
+from src.database.operations import bulk_upsert_songs
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# A single JSON record larger than this is treated as corrupt input
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+}
+
+class CatalogFormatError(Exception):
+    """Raised when an input file cannot be parsed."""
+    pass
+
+class _JsonStream:
+    """Character buffer over a text file that refills on demand."""
+
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping consumed text. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise CatalogFormatError(f"Expected '{char}' in JSON input")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder):
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if len(self.buffer) - self.pos < MAX_RECORD_SIZE and self.fill():
+                    continue
+                raise CatalogFormatError(f"Invalid JSON: {e.msg}")
+            # A number may be cut off at the end of the buffer
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self.fill():
+                    continue
+            self.pos = end
+            return value
+
+def iter_json_records(fp: TextIO) -> Iterator[Dict]:
+    """
+    Yield song records from a JSON document one at a time.
+
+    Accepts the data/sample_songs.json shape ({"songs": [...]}) or a
+    top-level list. Only one record is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    stream = _JsonStream(fp)
+
+    if stream.peek() == '{':
+        stream.pos += 1
+        while True:
+            if stream.peek() == '}':
+                raise CatalogFormatError("JSON object has no 'songs' list")
+            key = stream.value(decoder)
+            stream.expect(':')
+            if key == 'songs':
+                break
+            stream.value(decoder)
+            if stream.peek() == ',':
+                stream.pos += 1
+
+    stream.expect('[')
+    if stream.peek() == ']':
+        return
+    while True:
+        yield stream.value(decoder)
+        char = stream.peek()
+        if char == ',':
+            stream.pos += 1
+        elif char == ']':
+            return
+        else:
+            raise CatalogFormatError("Expected ',' or ']' between JSON records")
+
+def iter_ndjson_records(fp: TextIO) -> Iterator[Dict]:
+    """Yield song records from newline-delimited JSON, skipping blank lines."""
+    for line_number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CatalogFormatError(f"Invalid JSON on line {line_number}: {e.msg}")
+
+def iter_csv_records(fp: TextIO) -> Iterator[Dict]:
+    """Yield song records from CSV with a header row."""
+    for row in csv.DictReader(fp):
+        duration = row.get('duration_in_seconds')
+        if duration is not None:
+            try:
+                row['duration_in_seconds'] = int(duration)
+            except ValueError:
+                pass  # reported by validation
+        yield row
+
+READERS = {
+    'json': iter_json_records,
+    'ndjson': iter_ndjson_records,
+    'csv': iter_csv_records,
+}
+
+def detect_format(path: str) -> str:
+    """Pick a reader from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise CatalogFormatError(f"Cannot detect format of '{path}'; use --format")
+    return FORMATS[extension]
+
+def validate_record(record) -> Dict:
+    """
+    Validate a record against the Song model rules.
+
+    Returns:
+        A dictionary holding only the song fields
+
+    Raises:
+        ValueError: If the record is not a valid song
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+
+    required_fields = ['id', 'name', 'artist', 'album', 'release_date', 'genre', 'duration_in_seconds']
+    missing_fields = [field for field in required_fields if record.get(field) in (None, '')]
+    if missing_fields:
+        raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+
+    for field in ('id', 'name', 'artist', 'album', 'genre'):
+        if not isinstance(record[field], str):
+            raise ValueError(f"Field '{field}' must be a string")
+
+    duration = record['duration_in_seconds']
+    if not isinstance(duration, int) or isinstance(duration, bool):
+        raise ValueError("Duration must be an integer")
+
+    try:
+        release_date = datetime.strptime(str(record['release_date']), '%Y-%m-%d')
+    except ValueError:
+        raise ValueError("Release date must be in YYYY-MM-DD format")
+
+    Song(
+        id=record['id'],
+        name=record['name'],
+        artist=record['artist'],
+        album=record['album'],
+        release_date=release_date,
+        genre=record['genre'],
+        duration_in_seconds=record['duration_in_seconds']
+    )
+
+    return {field: record[field] for field in required_fields}
+
+def load_checkpoint(path: Optional[str]) -> Dict:
+    """Read a checkpoint file, or return an empty checkpoint."""
+    if not path or not os.path.exists(path):
+        return {'records': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_checkpoint(path: str, checkpoint: Dict) -> None:
+    """Atomically write a checkpoint file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, path)
+
+def import_catalog(
+    source: str,
+    file_format: Optional[str] = None,
+    batch_size: int = 5000,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = False,
+    errors: Optional[TextIO] = None,
+    progress: Optional[TextIO] = sys.stderr
+) -> Dict:
+    """
+    Stream a catalog file into the database.
+
+    A checkpoint is written after every committed batch; with resume=True
+    records already covered by the checkpoint are skipped.
+
+    Args:
+        source: Path of the catalog file
+        file_format: 'json', 'ndjson' or 'csv' (detected from the extension if omitted)
+        batch_size: Number of records per database transaction
+        checkpoint_path: Where to record progress (None disables checkpoints)
+        resume: Skip records recorded in an existing checkpoint
+        errors: Stream receiving one NDJSON line per rejected record
+        progress: Stream receiving progress lines (None for quiet)
+
+    Returns:
+        Final checkpoint dictionary with running totals
+    """
+    file_format = file_format or detect_format(source)
+    reader = READERS[file_format]
+
+    checkpoint = load_checkpoint(checkpoint_path if resume else None)
+    skip = checkpoint['records']
+    started = time.monotonic()
+    loaded_this_run = 0
+
+    with open(source, 'r', encoding='utf-8', newline='' if file_format == 'csv' else None) as fp:
+        records = enumerate(reader(fp))
+        if skip:
+            for _ in islice(records, skip):
+                pass
+
+        while True:
+            batch: List[Dict] = []
+            seen = 0
+            for index, record in islice(records, batch_size):
+                seen += 1
+                try:
+                    batch.append(validate_record(record))
+                except ValueError as e:
+                    checkpoint['rejected'] += 1
+                    if errors is not None:
+                        song_id = record.get('id') if isinstance(record, dict) else None
+                        errors.write(json.dumps({'record': index, 'id': song_id, 'error': str(e)}) + '\n')
+            if not seen:
+                break
+
+            if batch:
+                result = bulk_upsert_songs(batch)
+                checkpoint['inserted'] += result.inserted
+                checkpoint['updated'] += result.updated
+                checkpoint['unchanged'] += result.unchanged
+                checkpoint['rejected'] += len(result.errors)
+                if errors is not None:
+                    for error in result.errors:
+                        errors.write(json.dumps({'id': error.id, 'error': error.error}) + '\n')
+
+            checkpoint['records'] += seen
+            loaded_this_run += seen
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, checkpoint)
+
+            if progress is not None:
+                elapsed = time.monotonic() - started
+                rate = loaded_this_run / elapsed if elapsed else 0.0
+                progress.write(
+                    f"{checkpoint['records']} records processed "
+                    f"({checkpoint['inserted']} inserted, {checkpoint['updated']} updated, "
+                    f"{checkpoint['rejected']} rejected) {rate:.0f} records/s\n"
+                )
+                progress.flush()
+
+    return checkpoint
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a song catalog into the OurChants database.")
+    parser.add_argument('source', help="Catalog file (.json, .ndjson/.jsonl or .csv)")
+    parser.add_argument('--format', choices=sorted(READERS), help="Input format (default: from extension)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Records per transaction (default: 5000)")
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <source>.checkpoint)")
+    parser.add_argument('--resume', action='store_true', help="Continue from the checkpoint file")
+    parser.add_argument('--errors', help="Write rejected records as NDJSON to this file")
+    parser.add_argument('--quiet', action='store_true', help="Suppress progress output")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    checkpoint_path = args.checkpoint or f"{args.source}.checkpoint"
+    errors = open(args.errors, 'a') if args.errors else None
+    try:
+        checkpoint = import_catalog(
+            args.source,
+            file_format=args.format,
+            batch_size=args.batch_size,
+            checkpoint_path=checkpoint_path,
+            resume=args.resume,
+            errors=errors,
+            progress=None if args.quiet else sys.stderr
+        )
+    except (CatalogFormatError, OSError) as e:
+        print(f"Error importing catalog: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if errors is not None:
+            errors.close()
+
+    print(
+        f"Successfully imported {checkpoint['records']} records "
+        f"({checkpoint['inserted']} inserted, {checkpoint['updated']} updated, "
+        f"{checkpoint['unchanged']} unchanged, {checkpoint['rejected']} rejected)"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
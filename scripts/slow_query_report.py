@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Summarize the slow-query log written by src/database/slow_queries.py.
+Reads log files (plain application logs or CloudWatch exports; any line
+containing a slow_query JSON record counts), groups the records by
+statement and reports count, total/mean/p95/max duration and, from the
+slowest captured plan, the plan nodes that usually point at a missing
+index (sequential scans, sorts).
+
+Usage:
+    python scripts/slow_query_report.py app.log
+    aws logs tail /aws/lambda/OurChantsApi --since 1d | python scripts/slow_query_report.py --top 10
+    python scripts/slow_query_report.py app.log --json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+_MARKER = '{"event":"slow_query"'
+
+# Plan nodes reported as hints; sequential scans and sorts on a growing
+# table are the usual sign of a missing index
+_HINT_NODES = ('Seq Scan', 'Sort', 'Bitmap Heap Scan', 'Hash Join', 'Nested Loop')
+
+def read_records(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield slow_query records from log lines, skipping everything else."""
+    for line in lines:
+        start = line.find(_MARKER)
+        if start < 0:
+            continue
+        try:
+            yield json.loads(line[start:].strip())
+        except ValueError:
+            continue
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get('Plans', []):
+        yield from _plan_nodes(child)
+
+def plan_hints(plan: Dict[str, Any]) -> List[str]:
+    """Describe the notable nodes of an EXPLAIN (FORMAT JSON) plan, e.g. 'Seq Scan on songs (10000 rows)'."""
+    hints = []
+    for node in _plan_nodes(plan.get('Plan', plan)):
+        node_type = node.get('Node Type', '')
+        if node_type not in _HINT_NODES:
+            continue
+        hint = node_type
+        if node.get('Relation Name'):
+            hint += f" on {node['Relation Name']}"
+        if node.get('Sort Key'):
+            hint += f" by {', '.join(node['Sort Key'])}"
+        if 'Actual Rows' in node:
+            hint += f" ({node['Actual Rows']} rows)"
+        hints.append(hint)
+    return hints
+
+def summarize(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group records by statement, slowest total time first.
+
+    Returns:
+        List of dicts with statement, count, total_ms, mean_ms, p95_ms,
+        max_ms, params (shape of the slowest call), plans (number of
+        captured plans) and hints (from the slowest captured plan)
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record['statement'], []).append(record)
+
+    summary = []
+    for statement, entries in groups.items():
+        durations = sorted(entry['duration_ms'] for entry in entries)
+        slowest = max(entries, key=lambda entry: entry['duration_ms'])
+        planned = [entry for entry in entries if entry.get('plan')]
+        slowest_plan = max(planned, key=lambda entry: entry['duration_ms']) if planned else None
+        summary.append({
+            'statement': statement,
+            'count': len(entries),
+            'total_ms': round(sum(durations), 3),
+            'mean_ms': round(sum(durations) / len(durations), 3),
+            'p95_ms': durations[max(0, -(-95 * len(durations) // 100) - 1)],
+            'max_ms': durations[-1],
+            'params': slowest.get('params'),
+            'plans': len(planned),
+            'hints': plan_hints(slowest_plan['plan']) if slowest_plan else [],
+        })
+    summary.sort(key=lambda group: group['total_ms'], reverse=True)
+    return summary
+
+def print_report(summary: List[Dict[str, Any]], out: TextIO, width: int = 160) -> None:
+    if not summary:
+        print("No slow queries found", file=out)
+        return
+    for rank, group in enumerate(summary, 1):
+        statement = group['statement']
+        if len(statement) > width:
+            statement = statement[:width - 3] + '...'
+        print(f"#{rank} {group['count']} calls, total {group['total_ms']:.1f} ms, "
+              f"mean {group['mean_ms']:.1f} ms, p95 {group['p95_ms']:.1f} ms, max {group['max_ms']:.1f} ms", file=out)
+        print(f"   {statement}", file=out)
+        print(f"   params: {json.dumps(group['params'])}", file=out)
+        if group['hints']:
+            print(f"   plan ({group['plans']} captured): {'; '.join(group['hints'])}", file=out)
+        print(file=out)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the slow-query log by statement")
+    parser.add_argument('files', nargs='*', help="Log files to read (default: stdin)")
+    parser.add_argument('--top', type=int, default=20, help="Number of statements to show")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    records = []
+    if args.files:
+        for path in args.files:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                records.extend(read_records(f))
+    else:
+        records.extend(read_records(sys.stdin))
+
+    summary = summarize(records)[:args.top]
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(summary, sys.stdout)
+
+if __name__ == '__main__':
+    main()
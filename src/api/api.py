@@ -1,82 +1,407 @@
+import time
+
+# Marks the start of module initialization (the Lambda init phase)
+_init_started = time.perf_counter()
+
 import json
+import logging
 import os
-import boto3
-from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 from src.database.operations import (
     create_song,
     get_song,
+    get_song_version,
+    get_songs,
+    get_stats,
     update_song,
     delete_song,
+    export_songs,
     list_songs,
+    list_songs_page,
+    bulk_upsert_songs,
+    get_list_cache,
+    get_song_cache,
+    prewarm_pool,
+    search_songs,
+    use_primary,
+    REPLICA_MAX_LAG,
     Song,
     DatabaseError,
     SongNotFoundError,
     InvalidDataError,
 )
+from src.database import instrumentation
+from src.api.conditional import (
+    get_header,
+    has_conditions,
+    is_not_modified,
+    list_etag,
+    not_modified_response,
+    song_etag,
+    validator_headers,
+)
+from src.api.compression import compress_response, request_body
+from src.api.metrics import SERVICE, emit_metrics
+from src.api.routing import Router
+from src.api.serialization import dumps, dumps_song, dumps_songs, iter_songs_csv, iter_songs_ndjson
+
+logger = logging.getLogger(__name__)
+
+def _consistency_token() -> str:
+    """Token returned by writes; clients echo it as X-Consistency-Token to read their writes."""
+    return str(int(time.time() * 1000))
+
+def _needs_primary(event: Dict[str, Any]) -> bool:
+    """Whether the request carries a consistency token from a write that replicas may not have yet."""
+    token = get_header(event, 'X-Consistency-Token')
+    if not token:
+        return False
+    try:
+        written_at = int(token) / 1000
+    except ValueError:
+        return False
+    return time.time() - written_at < REPLICA_MAX_LAG
+
+def _int_param(params: Dict[str, str], name: str, default: int) -> int:
+    """Read an integer query string parameter, rejecting malformed values."""
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidDataError(f"Query parameter '{name}' must be an integer")
+
+def _list_response(event: Dict[str, Any], songs: List[Song], next_cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a list response with validators, or a 304 if the client's copy is current.
+    """
+    etag = list_etag(songs, next_cursor or '')
+    timestamps = [song.updated_at for song in songs if song.updated_at is not None]
+    last_modified = max(timestamps) if timestamps else None
+    
+    headers = validator_headers(etag, last_modified)
+    if next_cursor:
+        headers['X-Next-Cursor'] = next_cursor
+    
+    if is_not_modified(event, etag, last_modified, use_date=False):
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': dumps_songs(songs)
+    }
+
+# API Gateway rejects Lambda responses over 6 MB with an opaque 502; streamed
+# bodies joined for Lambda are cut off at this size and answered with a 413
+LAMBDA_MAX_BODY_BYTES = int(os.getenv('LAMBDA_MAX_BODY_BYTES', str(5 * 1024 * 1024)))
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda function handler for the OurChants API.
     Handles all song-related operations through API Gateway.
     """
+    # API Gateway needs the whole body; only src/api/server.py streams
+    return respond(event, context, stream=False)
+
+def _joined(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Join a streamed body into a string, for responses that cannot stream.
+
+    A body larger than LAMBDA_MAX_BODY_BYTES is abandoned for a 413 pointing
+    to the streaming server, and a database error while reading it becomes a 500.
+    """
+    body = response.get('body')
+    if body is None or isinstance(body, str):
+        return response
+    chunks = []
+    size = 0
     try:
-        # Get HTTP method and path
-        http_method = event['httpMethod']
-        path = event['path']
-        
-        # Handle different endpoints
-        if path == '/songs':
-            if http_method == 'GET':
-                # List all songs
-                limit = int(event.get('queryStringParameters', {}).get('limit', 10))
-                offset = int(event.get('queryStringParameters', {}).get('offset', 0))
-                genre = event.get('queryStringParameters', {}).get('genre')
-                artist = event.get('queryStringParameters', {}).get('artist')
-                
-                songs = list_songs(limit=limit, offset=offset, genre=genre, artist=artist)
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps([song.__dict__ for song in songs])
-                }
-                
-            elif http_method == 'POST':
-                # Create new song
-                body = json.loads(event['body'])
-                song = create_song(body)
-                return {
-                    'statusCode': 201,
-                    'body': json.dumps(song.__dict__)
-                }
-                
-        elif path.startswith('/songs/'):
-            song_id = path.split('/')[-1]
-            
-            if http_method == 'GET':
-                # Get single song
-                song = get_song(song_id)
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps(song.__dict__)
-                }
-                
-            elif http_method == 'PUT':
-                # Update song
-                body = json.loads(event['body'])
-                song = update_song(song_id, body)
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps(song.__dict__)
-                }
-                
-            elif http_method == 'DELETE':
-                # Delete song
-                delete_song(song_id)
+        for chunk in body:
+            size += len(chunk.encode('utf-8'))
+            if size > LAMBDA_MAX_BODY_BYTES:
                 return {
-                    'statusCode': 204,
-                    'body': ''
+                    'statusCode': 413,
+                    'body': json.dumps({
+                        'error': f"Response exceeds {LAMBDA_MAX_BODY_BYTES} bytes; narrow it with filters "
+                                 "or request it from the streaming server (src/api/server.py)"
+                    })
                 }
-                
+            chunks.append(chunk)
+    except DatabaseError as e:
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
+    finally:
+        # An abandoned export would otherwise hold its connection until garbage collection
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+    return dict(response, body=''.join(chunks))
+
+def respond(event: Dict[str, Any], context: Any, stream: bool = True) -> Dict[str, Any]:
+    """
+    Handle one API Gateway-shaped event and return the proxy response.
+
+    Shared by the Lambda handler and the long-lived server adapter. The body
+    is normally a string, but a route may return an iterator of strings,
+    which the server streams.
+
+    Args:
+        event: API Gateway proxy event
+        context: Lambda context (None outside Lambda)
+        stream: Keep iterator bodies; when False they are joined (see _joined)
+            before compression, as the Lambda handler needs
+    """
+    global _cold_start
+    if _cold_start:
+        _cold_start = False
+        emit_metrics(
+            {'InitDuration': (INIT_DURATION_MS, 'Milliseconds'), 'ColdStart': (1, 'Count')},
+            properties={
+                'PrewarmedConnections': _prewarmed,
+                'RequestId': getattr(context, 'aws_request_id', None)
+            }
+        )
+    token = instrumentation.start_request()
+    if token is None:
+        return compress_response(event, _build_response(event, context, stream))
+    try:
+        response = compress_response(event, _build_response(event, context, stream))
+    finally:
+        metrics = instrumentation.finish_request(token)
+    return _report_timings(response, metrics, context)
+
+def _report_timings(
+    response: Dict[str, Any],
+    metrics: instrumentation.RequestMetrics,
+    context: Any
+) -> Dict[str, Any]:
+    """Add a Server-Timing header and emit the request's timings as EMF metrics."""
+    headers = dict(response.get('headers') or {})
+    headers['Server-Timing'] = metrics.server_timing()
+    response = dict(response, headers=headers)
+    emit_metrics(
+        metrics.metrics(),
+        dimensions={'Service': SERVICE, 'Route': metrics.route or 'unmatched'},
+        properties={
+            'StatusCode': response['statusCode'],
+            'RequestId': getattr(context, 'aws_request_id', None)
+        }
+    )
+    return response
+
+def _batch_response(song_ids: List[str]) -> Dict[str, Any]:
+    """Fetch songs by ID and report the ones that do not exist."""
+    batch = get_songs(song_ids)
+    return {
+        'statusCode': 200,
+        'body': '{"songs":' + dumps_songs(batch.songs) + ',"missing":' + dumps(batch.missing) + '}'
+    }
+
+# Routes are registered below with @router.route and resolved per request
+router = Router()
+
+@router.route('GET', '/songs')
+def _get_songs(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """List songs, or fetch specific ones with ?ids=a,b,c; offset paging is kept for older clients only."""
+    params = event.get('queryStringParameters') or {}
+    if 'ids' in params:
+        return _batch_response([song_id for song_id in params['ids'].split(',') if song_id])
+    
+    limit = _int_param(params, 'limit', 10)
+    genre = params.get('genre')
+    artist = params.get('artist')
+    sort = params.get('sort', 'name')
+    order = params.get('order', 'asc')
+    
+    if 'offset' in params:
+        offset = _int_param(params, 'offset', 0)
+        songs = list_songs(
+            limit=limit, offset=offset, genre=genre, artist=artist, sort=sort, order=order
+        )
+        return _list_response(event, songs)
+    
+    page = list_songs_page(
+        limit=limit, cursor=params.get('cursor'), genre=genre, artist=artist, sort=sort, order=order
+    )
+    return _list_response(event, page.songs, page.next_cursor)
+
+@router.route('POST', '/songs')
+def _post_song(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Create a new song."""
+    body = json.loads(request_body(event))
+    song = create_song(body)
+    return {
+        'statusCode': 201,
+        'headers': {'X-Consistency-Token': _consistency_token()},
+        'body': dumps_song(song)
+    }
+
+@router.route('POST', '/songs:batch')
+def _post_songs_batch(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Bulk create/update songs; accepts a list or {"songs": [...]}."""
+    body = json.loads(request_body(event))
+    rows = body.get('songs') if isinstance(body, dict) else body
+    if not isinstance(rows, list):
+        raise InvalidDataError("Request body must be a list of songs")
+    
+    result = bulk_upsert_songs(rows)
+    return {
+        'statusCode': 200,
+        'headers': {'X-Consistency-Token': _consistency_token()},
+        'body': dumps({
+            'inserted': result.inserted,
+            'updated': result.updated,
+            'unchanged': result.unchanged,
+            'errors': [error.__dict__ for error in result.errors]
+        })
+    }
+
+@router.route('POST', '/songs:batchGet')
+def _post_songs_batch_get(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch many songs in one request; accepts a list of ids or {"ids": [...]}."""
+    body = json.loads(request_body(event))
+    song_ids = body.get('ids') if isinstance(body, dict) else body
+    if not isinstance(song_ids, list):
+        raise InvalidDataError("Request body must be a list of song IDs")
+    return _batch_response(song_ids)
+
+@router.route('GET', '/songs/search')
+def _search_songs(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Ranked full-text/fuzzy search with keyset pagination."""
+    params = event.get('queryStringParameters') or {}
+    page = search_songs(
+        params.get('q', ''),
+        limit=_int_param(params, 'limit', 20),
+        cursor=params.get('cursor')
+    )
+    headers = {}
+    if page.next_cursor:
+        headers['X-Next-Cursor'] = page.next_cursor
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': dumps_songs(page.songs)
+    }
+
+# ?format= values of GET /songs/export: (content type, chunk encoder)
+_EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_songs_ndjson),
+    'csv': ('text/csv; charset=utf-8', iter_songs_csv),
+}
+
+@router.route('GET', '/songs/export')
+def _export_songs(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Stream every song (list_songs filters and sort apply) as NDJSON or CSV."""
+    params = event.get('queryStringParameters') or {}
+    export_format = params.get('format', 'ndjson')
+    if export_format not in _EXPORT_FORMATS:
+        raise InvalidDataError(f"Export format must be one of: {', '.join(_EXPORT_FORMATS)}")
+    content_type, encode = _EXPORT_FORMATS[export_format]
+    
+    songs = export_songs(
+        genre=params.get('genre'),
+        artist=params.get('artist'),
+        sort=params.get('sort', 'name'),
+        order=params.get('order', 'asc')
+    )
+    chunks = encode(songs)
+    # Run the query before answering, so a database failure is a 500 rather than a cut-off stream
+    first = next(chunks, '')
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': content_type,
+            'Content-Disposition': f'attachment; filename="songs.{export_format}"'
+        },
+        'body': _export_body(first, chunks, songs)
+    }
+
+def _export_body(first: str, chunks: Iterator[str], songs: Iterator[Song]) -> Iterator[str]:
+    """Export body; closing it early closes the export, releasing its cursor and connection."""
+    try:
+        yield first
+        yield from chunks
+    finally:
+        chunks.close()
+        songs.close()
+
+@router.route('GET', '/songs/{song_id}')
+def _get_song(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Get a single song; conditional requests only read updated_at."""
+    song_id = path_params['song_id']
+    if has_conditions(event):
+        updated_at = get_song_version(song_id)
+        if updated_at is not None:
+            etag = song_etag(song_id, updated_at)
+            if is_not_modified(event, etag, updated_at):
+                return not_modified_response(etag, updated_at)
+    
+    song = get_song(song_id)
+    headers = {}
+    if song.updated_at is not None:
+        headers = validator_headers(song_etag(song.id, song.updated_at), song.updated_at)
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': dumps_song(song)
+    }
+
+@router.route('PUT', '/songs/{song_id}')
+def _put_song(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Update a song."""
+    body = json.loads(request_body(event))
+    song = update_song(path_params['song_id'], body)
+    return {
+        'statusCode': 200,
+        'headers': {'X-Consistency-Token': _consistency_token()},
+        'body': dumps_song(song)
+    }
+
+@router.route('DELETE', '/songs/{song_id}')
+def _delete_song(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Delete a song."""
+    delete_song(path_params['song_id'])
+    return {
+        'statusCode': 204,
+        'headers': {'X-Consistency-Token': _consistency_token()},
+        'body': ''
+    }
+
+@router.route('GET', '/stats')
+def _get_stats(event: Dict[str, Any], path_params: Dict[str, str]) -> Dict[str, Any]:
+    """Catalog counts and durations by genre, artist and release year (?dimension= narrows it)."""
+    params = event.get('queryStringParameters') or {}
+    return {
+        'statusCode': 200,
+        'body': dumps(get_stats(params.get('dimension')))
+    }
+
+def _build_response(event: Dict[str, Any], context: Any, stream: bool) -> Dict[str, Any]:
+    """Route a request, joining a streamed body unless the caller can stream it."""
+    response = _handle_request(event, context)
+    return response if stream else _joined(response)
+
+def _handle_request(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Route a request and build its uncompressed response."""
+    try:
+        match = router.resolve(event['httpMethod'], event['path'])
+        metrics = instrumentation.current()
+        if metrics is not None and match.template is not None:
+            metrics.route = f"{event['httpMethod'].upper()} {match.template}"
+        if match.handler is not None:
+            if _needs_primary(event):
+                with use_primary():
+                    return match.handler(event, match.params)
+            return match.handler(event, match.params)
+        if match.allowed:
+            return {
+                'statusCode': 405,
+                'headers': {'Allow': ', '.join(sorted(match.allowed))},
+                'body': json.dumps({'error': 'Method Not Allowed'})
+            }
         return {
             'statusCode': 404,
             'body': json.dumps({'error': 'Not Found'})
@@ -101,4 +426,32 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             'statusCode': 500,
             'body': json.dumps({'error': 'Internal Server Error'})
-        } 
\ No newline at end of file
+        }
+
+def _initialize() -> int:
+    """
+    One-time setup per container, run while the module is imported.
+
+    Builds the caches and, when DB_POOL_PREWARM is a positive number, opens
+    that many pooled connections so the first request skips the connect.
+    A failed prewarm is logged rather than raised: the import must not fail
+    when the database is briefly unreachable, requests then connect lazily.
+
+    Returns:
+        int: Number of connections opened
+    """
+    get_song_cache()
+    get_list_cache()
+    connections = int(os.getenv('DB_POOL_PREWARM', '0'))
+    if connections <= 0:
+        return 0
+    try:
+        prewarm_pool(connections)
+    except DatabaseError as e:
+        logger.warning("Connection pool prewarm failed: %s", e)
+        return 0
+    return connections
+
+_prewarmed = _initialize()
+_cold_start = True
+INIT_DURATION_MS = (time.perf_counter() - _init_started) * 1000
@@ -0,0 +1,136 @@
+"""
+Response compression for the OurChants API.
+Negotiates a content coding from Accept-Encoding and compresses bodies above
+a size threshold, returning them base64 encoded as the API Gateway proxy
+integration expects for binary payloads.
+"""
+
+import base64
+import gzip
+import os
+from typing import Any, Dict, Optional
+
+from src.api.conditional import get_header
+from src.database.instrumentation import timed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Codings in server preference order, used to break ties between equal q-values
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Read once per container rather than on every request
+MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into a mapping of coding to q-value.
+
+    Malformed q-values are treated as 0 so the coding is never selected.
+    """
+    codings = {}
+    if not header:
+        return codings
+    for item in header.split(','):
+        parts = [part.strip() for part in item.split(';')]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+def choose_encoding(header: Optional[str]) -> Optional[str]:
+    """
+    Pick the best supported coding for an Accept-Encoding header.
+
+    Returns None when the body should be sent uncompressed.
+    """
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with the given coding."""
+    if encoding == 'gzip':
+        # mtime=0 keeps the output deterministic for identical bodies
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    raise ValueError(f"Unsupported content coding '{encoding}'")
+
+def compress_response(
+    event: Dict[str, Any],
+    response: Dict[str, Any],
+    min_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compress a proxy response body if the client accepts it and it is large enough.
+
+    Args:
+        event: API Gateway event carrying the request headers
+        response: Proxy response with a text body
+        min_size: Smallest body in bytes worth compressing
+            (defaults to COMPRESSION_MIN_SIZE, 1024)
+
+    Returns:
+        Dict[str, Any]: The response, compressed and base64 encoded when applicable
+    """
+    if min_size is None:
+        min_size = MIN_SIZE
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+    headers = response.get('headers') or {}
+    if any(key.lower() == 'content-encoding' for key in headers):
+        return response
+
+    data = body.encode('utf-8')
+    if len(data) < min_size:
+        return response
+
+    # Past the threshold the representation depends on Accept-Encoding
+    headers = dict(headers)
+    headers['Vary'] = 'Accept-Encoding'
+    response = dict(response, headers=headers)
+
+    encoding = choose_encoding(get_header(event, 'Accept-Encoding'))
+    if encoding is None:
+        return response
+    with timed('compress'):
+        compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response
+
+    headers['Content-Encoding'] = encoding
+    response['body'] = base64.b64encode(compressed).decode('ascii')
+    response['isBase64Encoded'] = True
+    return response
+
+def request_body(event: Dict[str, Any]) -> str:
+    """
+    Text body of a request, decoding it if API Gateway delivered it base64 encoded.
+
+    Binary media types are enabled for compressed responses, so API Gateway
+    also base64 encodes incoming request bodies.
+    """
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        return base64.b64decode(body).decode('utf-8')
+    return body
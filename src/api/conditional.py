@@ -0,0 +1,109 @@
+"""
+Conditional GET support for the OurChants API.
+Builds ETag / Last-Modified validators from song updated_at timestamps and
+evaluates If-None-Match / If-Modified-Since request headers.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Case-insensitive lookup of a request header in an API Gateway event."""
+    headers = event.get('headers') or {}
+    wanted = name.lower()
+    for key, value in headers.items():
+        if key.lower() == wanted:
+            return value
+    return None
+
+def song_etag(song_id: str, updated_at: datetime) -> str:
+    """Weak ETag for a single song, derived from its id and updated_at."""
+    digest = hashlib.md5(f"{song_id}|{updated_at.isoformat()}".encode('utf-8')).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+def list_etag(songs: Iterable[Any], extra: str = '') -> str:
+    """
+    Weak ETag for a page of songs.
+
+    Any insert, update or delete affecting the page changes the set of
+    (id, updated_at) pairs and therefore the tag. Extra covers other parts
+    of the response, such as the continuation token.
+    """
+    digest = hashlib.md5(extra.encode('utf-8'))
+    for song in songs:
+        updated_at = song.updated_at.isoformat() if song.updated_at else ''
+        digest.update(f"\n{song.id}|{updated_at}".encode('utf-8'))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp as an HTTP date (second precision, GMT)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """Response headers carrying the validators."""
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if header.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def is_not_modified(
+    event: Dict[str, Any],
+    etag: str,
+    last_modified: Optional[datetime],
+    use_date: bool = True
+) -> bool:
+    """
+    Decide whether a GET can be answered with 304 Not Modified.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the client sent no entity tags and use_date is set. Lists pass
+    use_date=False because deleting a song does not move the newest
+    updated_at of a page, so a date alone cannot prove a page unchanged.
+    """
+    if_none_match = get_header(event, 'If-None-Match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = get_header(event, 'If-Modified-Since')
+    if not use_date or if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have second precision
+    return last_modified.replace(microsecond=0) <= since
+
+def has_conditions(event: Dict[str, Any]) -> bool:
+    """Whether the request carries any conditional GET header."""
+    return get_header(event, 'If-None-Match') is not None or \
+        get_header(event, 'If-Modified-Since') is not None
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Dict[str, Any]:
+    """Empty 304 response carrying the current validators."""
+    return {
+        'statusCode': 304,
+        'headers': validator_headers(etag, last_modified),
+        'body': ''
+    }
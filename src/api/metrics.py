@@ -0,0 +1,64 @@
+"""
+CloudWatch metrics for the OurChants API.
+Metrics are written to stdout as CloudWatch Embedded Metric Format (EMF) log
+lines, which Lambda forwards to CloudWatch Logs without an API call.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+NAMESPACE = os.getenv('METRICS_NAMESPACE', 'OurChants')
+SERVICE = os.getenv('METRICS_SERVICE', 'ourchants-api')
+ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() not in ('0', 'false', 'no', 'off')
+
+def emf_record(
+    metrics: Dict[str, Tuple[float, str]],
+    dimensions: Optional[Dict[str, str]] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    namespace: str = NAMESPACE
+) -> Dict[str, Any]:
+    """
+    Build an EMF log record.
+
+    Args:
+        metrics: Metric name -> (value, unit), e.g. {'InitDuration': (120.5, 'Milliseconds')}
+        dimensions: Dimension name -> value (defaults to the service name)
+        properties: Extra fields logged with the record but not turned into metrics
+        namespace: CloudWatch namespace
+
+    Returns:
+        Dict[str, Any]: Record ready to be serialized as one JSON log line
+    """
+    if dimensions is None:
+        dimensions = {'Service': SERVICE}
+    record = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': namespace,
+                'Dimensions': [list(dimensions)],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (_, unit) in metrics.items()]
+            }]
+        }
+    }
+    record.update(dimensions)
+    if properties:
+        record.update(properties)
+    record.update({name: value for name, (value, _) in metrics.items()})
+    return record
+
+def emit_metrics(
+    metrics: Dict[str, Tuple[float, str]],
+    dimensions: Optional[Dict[str, str]] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    stream: Optional[TextIO] = None
+) -> None:
+    """Write an EMF record as a single log line (no-op when METRICS_ENABLED is off)."""
+    if not ENABLED:
+        return
+    stream = stream or sys.stdout
+    stream.write(json.dumps(emf_record(metrics, dimensions, properties), separators=(',', ':')) + '\n')
+    stream.flush()
@@ -0,0 +1,116 @@
+"""
+Request routing for the OurChants API.
+Maps (HTTP method, path template) pairs to handler functions using a trie of
+path segments, so dispatch cost depends on the depth of the path rather than
+on the number of registered routes.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional
+
+RouteHandler = Callable[[Dict[str, Any], Dict[str, str]], Dict[str, Any]]
+
+class RouteMatch(NamedTuple):
+    """
+    Result of resolving a request.
+
+    handler is None when nothing matched; allowed then lists the methods
+    registered for the path (empty if the path itself is unknown).
+    template is the matched path template, e.g. '/songs/{song_id}'.
+    """
+    handler: Optional[RouteHandler]
+    params: Dict[str, str]
+    allowed: FrozenSet[str]
+    template: Optional[str] = None
+
+class _Node:
+    """One path segment in the routing trie."""
+
+    __slots__ = ('static', 'param', 'param_name', 'handlers', 'allowed', 'template')
+
+    def __init__(self):
+        self.static: Dict[str, '_Node'] = {}
+        self.param: Optional['_Node'] = None
+        self.param_name: Optional[str] = None
+        self.handlers: Dict[str, RouteHandler] = {}
+        self.allowed: FrozenSet[str] = frozenset()
+        self.template: Optional[str] = None
+
+def _segments(path: str):
+    return path.strip('/').split('/')
+
+class Router:
+    """
+    Routing table built once at import.
+
+    Templates are literal segments and {name} parameters, e.g.
+    '/songs/{song_id}'. Literal segments take precedence over parameters,
+    so '/songs/search' is matched before '/songs/{song_id}', but only for the
+    methods the literal route has: PUT /songs/search still reaches
+    '/songs/{song_id}' with song_id 'search'.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, method: str, template: str, handler: RouteHandler) -> None:
+        """Register a handler for a method and path template."""
+        node = self._root
+        for segment in _segments(template):
+            if segment.startswith('{') and segment.endswith('}'):
+                name = segment[1:-1]
+                if node.param is None:
+                    node.param = _Node()
+                    node.param_name = name
+                elif node.param_name != name:
+                    raise ValueError(
+                        f"Conflicting parameter names '{node.param_name}' and '{name}' in '{template}'"
+                    )
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        method = method.upper()
+        if method in node.handlers:
+            raise ValueError(f"Route {method} {template} is already registered")
+        node.handlers[method] = handler
+        node.allowed = frozenset(node.handlers)
+        node.template = template
+
+    def route(self, method: str, template: str) -> Callable[[RouteHandler], RouteHandler]:
+        """Decorator form of add()."""
+        def register(handler: RouteHandler) -> RouteHandler:
+            self.add(method, template, handler)
+            return handler
+        return register
+
+    def _find(self, node: _Node, segments, index: int, params: Dict[str, str],
+              method: Optional[str]) -> Optional[_Node]:
+        # With a method, only nodes handling it match; with None, any route does
+        if index == len(segments):
+            if method is None:
+                return node if node.handlers else None
+            return node if method in node.handlers else None
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._find(child, segments, index + 1, params, method)
+            if found is not None:
+                return found
+        if node.param is not None and segment:
+            found = self._find(node.param, segments, index + 1, params, method)
+            if found is not None:
+                params[node.param_name] = segment
+                return found
+        return None
+
+    def resolve(self, method: str, path: str) -> RouteMatch:
+        """Find the handler and path parameters for a request."""
+        params: Dict[str, str] = {}
+        segments = _segments(path)
+        method = method.upper()
+        node = self._find(self._root, segments, 0, params, method)
+        if node is None:
+            # No route has the method; report the methods of the path's best match
+            node = self._find(self._root, segments, 0, params, None)
+        if node is None:
+            return RouteMatch(None, {}, frozenset())
+        return RouteMatch(node.handlers.get(method), params, node.allowed, node.template)
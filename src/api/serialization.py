@@ -0,0 +1,144 @@
+"""
+JSON serialization for API responses.
+Encodes Song objects straight to JSON text (dates in ISO 8601) without
+building an intermediate dict per song. Uses orjson when it is installed,
+unless OURCHANTS_JSON_BACKEND=stdlib is set.
+"""
+
+import csv
+import dataclasses
+import io
+import json
+import os
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+from typing import Any, Iterable, Iterator
+
+from src.database.instrumentation import timed
+
+try:
+    if os.getenv('OURCHANTS_JSON_BACKEND', 'auto').lower() == 'stdlib':
+        raise ImportError
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the active backend, reported by benchmarks and metrics
+BACKEND = 'orjson' if orjson is not None else 'stdlib'
+
+def _default(value: Any) -> Any:
+    """Fallback for json.dumps: dates, datetimes and dataclasses."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _encode_text(value) -> str:
+    return 'null' if value is None else encode_basestring_ascii(value)
+
+def _encode_date(value) -> str:
+    return 'null' if value is None else '"' + value.isoformat() + '"'
+
+def _encode_song_stdlib(song) -> str:
+    """Encode one song by concatenating pre-escaped fields."""
+    return ''.join((
+        '{"id":', _encode_text(song.id),
+        ',"name":', _encode_text(song.name),
+        ',"artist":', _encode_text(song.artist),
+        ',"album":', _encode_text(song.album),
+        ',"release_date":', _encode_date(song.release_date),
+        ',"genre":', _encode_text(song.genre),
+        ',"duration_in_seconds":', 'null' if song.duration_in_seconds is None else str(int(song.duration_in_seconds)),
+        ',"created_at":', _encode_date(song.created_at),
+        ',"updated_at":', _encode_date(song.updated_at),
+        '}'
+    ))
+
+def _encode_song_orjson(song) -> str:
+    return orjson.dumps(song).decode('utf-8')
+
+encode_song = _encode_song_orjson if orjson is not None else _encode_song_stdlib
+
+def dumps_song(song) -> str:
+    """Serialize a single Song to JSON text."""
+    with timed('serialize'):
+        return encode_song(song)
+
+def iter_songs_json(songs: Iterable[Any], chunk_size: int = 100) -> Iterator[str]:
+    """
+    Yield a JSON array of songs in chunks of up to chunk_size songs.
+
+    Lets streaming callers start sending before the last song is encoded.
+    """
+    yield '['
+    chunk = []
+    first = True
+    for song in songs:
+        chunk.append(encode_song(song))
+        if len(chunk) >= chunk_size:
+            yield ('' if first else ',') + ','.join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield ('' if first else ',') + ','.join(chunk)
+    yield ']'
+
+def iter_songs_ndjson(songs: Iterable[Any], chunk_size: int = 500) -> Iterator[str]:
+    """Yield songs as newline-delimited JSON, chunk_size lines per chunk."""
+    chunk = []
+    for song in songs:
+        chunk.append(encode_song(song))
+        if len(chunk) >= chunk_size:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
+
+# Song fields in CSV column order; the header row names them
+CSV_COLUMNS = ('id', 'name', 'artist', 'album', 'release_date', 'genre',
+               'duration_in_seconds', 'created_at', 'updated_at')
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def iter_songs_csv(songs: Iterable[Any], chunk_size: int = 500) -> Iterator[str]:
+    """
+    Yield songs as CSV with a header row, chunk_size rows per chunk.
+
+    Dates are ISO 8601 like the JSON responses; missing values are empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    for song in songs:
+        writer.writerow([_csv_value(getattr(song, column)) for column in CSV_COLUMNS])
+        rows += 1
+        if rows >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def dumps_songs(songs: Iterable[Any]) -> str:
+    """Serialize a list of Songs to a JSON array."""
+    with timed('serialize'):
+        if orjson is not None:
+            if not isinstance(songs, list):
+                songs = list(songs)
+            return orjson.dumps(songs).decode('utf-8')
+        return '[' + ','.join(map(_encode_song_stdlib, songs)) + ']'
+
+def dumps(value: Any) -> str:
+    """Serialize any other response payload (dates and dataclasses allowed)."""
+    with timed('serialize'):
+        if orjson is not None:
+            return orjson.dumps(value, default=_default).decode('utf-8')
+        return json.dumps(value, default=_default, separators=(',', ':'))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Long-lived HTTP server adapter for the OurChants API.
+Translates WSGI and ASGI requests into API Gateway proxy events for
+src.api.api.respond, so the same routes run in one process whose connection
+pool, caches and other warm state live as long as the server.
+
+Usage:
+    python -m src.api.server --port 8000
+    gunicorn 'src.api.server:wsgi_app'
+    uvicorn src.api.server:asgi_app
+"""
+
+import argparse
+import asyncio
+import base64
+import logging
+import uuid
+from http import HTTPStatus
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from src.api.api import respond
+
+logger = logging.getLogger(__name__)
+
+class LocalContext:
+    """Stand-in for the Lambda context object; only aws_request_id is used."""
+
+    __slots__ = ('aws_request_id',)
+
+    def __init__(self):
+        self.aws_request_id = str(uuid.uuid4())
+
+def _query_parameters(query_string: str) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, List[str]]]]:
+    """Single- and multi-value query parameters as API Gateway delivers them (None when empty)."""
+    multi = parse_qs(query_string, keep_blank_values=True)
+    if not multi:
+        return None, None
+    return {name: values[-1] for name, values in multi.items()}, multi
+
+def _body_fields(body: bytes) -> Dict[str, Any]:
+    """Event body fields; non-UTF-8 payloads are base64 encoded like API Gateway binary bodies."""
+    if not body:
+        return {'body': None, 'isBase64Encoded': False}
+    try:
+        return {'body': body.decode('utf-8'), 'isBase64Encoded': False}
+    except UnicodeDecodeError:
+        return {'body': base64.b64encode(body).decode('ascii'), 'isBase64Encoded': True}
+
+def build_event(
+    method: str,
+    path: str,
+    query_string: str = '',
+    headers: Optional[Dict[str, str]] = None,
+    body: bytes = b''
+) -> Dict[str, Any]:
+    """
+    Build an API Gateway REST proxy event for a plain HTTP request.
+
+    Args:
+        method: HTTP method
+        path: Request path (without the query string)
+        query_string: Raw query string
+        headers: Request headers (name -> value)
+        body: Raw request body
+
+    Returns:
+        Dict[str, Any]: Event accepted by respond()/handler()
+    """
+    params, multi_params = _query_parameters(query_string)
+    event = {
+        'httpMethod': method.upper(),
+        'path': path or '/',
+        'queryStringParameters': params,
+        'multiValueQueryStringParameters': multi_params,
+        'headers': headers or {},
+        'requestContext': {'requestId': str(uuid.uuid4()), 'stage': 'local'}
+    }
+    event.update(_body_fields(body))
+    return event
+
+def _status_line(code: int) -> str:
+    try:
+        return f"{code} {HTTPStatus(code).phrase}"
+    except ValueError:
+        return f"{code} Unknown"
+
+def _response_body(response: Dict[str, Any]) -> Iterable[bytes]:
+    """Body chunks of a proxy response, decoding base64 and streaming iterator bodies."""
+    body = response.get('body')
+    if body is None or body == '':
+        return []
+    if isinstance(body, str):
+        if response.get('isBase64Encoded'):
+            return [base64.b64decode(body)]
+        return [body.encode('utf-8')]
+    return _encoded(body)
+
+def _encoded(body: Iterable[str]) -> Iterator[bytes]:
+    """Encode a streamed body; closing this (as WSGI servers do) closes the body too."""
+    try:
+        for chunk in body:
+            if chunk:
+                yield chunk.encode('utf-8')
+    finally:
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+
+def _response_headers(response: Dict[str, Any]) -> List[Tuple[str, str]]:
+    headers = [(name, str(value)) for name, value in (response.get('headers') or {}).items()]
+    for name, values in (response.get('multiValueHeaders') or {}).items():
+        headers.extend((name, str(value)) for value in values)
+    if not any(name.lower() == 'content-type' for name, _ in headers):
+        headers.append(('Content-Type', 'application/json'))
+    return headers
+
+def _read_wsgi_body(environ: Dict[str, Any]) -> bytes:
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    return environ['wsgi.input'].read(length) if length > 0 else b''
+
+def wsgi_app(environ: Dict[str, Any], start_response) -> Iterable[bytes]:
+    """WSGI application serving the API routes."""
+    headers = {}
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            headers[key[5:].replace('_', '-').title()] = value
+    for key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+        if environ.get(key):
+            headers[key.replace('_', '-').title()] = environ[key]
+
+    event = build_event(
+        environ['REQUEST_METHOD'],
+        environ.get('PATH_INFO', '/'),
+        environ.get('QUERY_STRING', ''),
+        headers,
+        _read_wsgi_body(environ)
+    )
+    response = respond(event, LocalContext())
+    start_response(_status_line(response['statusCode']), _response_headers(response))
+    return _response_body(response)
+
+async def asgi_app(scope: Dict[str, Any], receive, send) -> None:
+    """
+    ASGI application serving the API routes.
+
+    Route handlers are synchronous, so each request runs on the event loop's
+    default thread pool; streamed bodies are pulled chunk by chunk the same way.
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+
+    headers = {}
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').title()
+        value = value.decode('latin-1')
+        headers[name] = f"{headers[name]},{value}" if name in headers else value
+
+    event = build_event(
+        scope['method'],
+        scope['path'],
+        scope.get('query_string', b'').decode('latin-1'),
+        headers,
+        body
+    )
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(None, respond, event, LocalContext())
+    await send({
+        'type': 'http.response.start',
+        'status': response['statusCode'],
+        'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in _response_headers(response)]
+    })
+    chunks = iter(_response_body(response))
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    finally:
+        # Releases a streamed export's connection when the client goes away
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            await loop.run_in_executor(None, close)
+    await send({'type': 'http.response.body', 'body': b''})
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """wsgiref server handling each connection on its own thread."""
+    daemon_threads = True
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def make_app_server(host: str = '127.0.0.1', port: int = 8000, quiet: bool = False) -> ThreadingWSGIServer:
+    """Create (but do not start) a threaded WSGI server for the API."""
+    handler_class = _QuietHandler if quiet else WSGIRequestHandler
+    return make_server(host, port, wsgi_app, server_class=ThreadingWSGIServer, handler_class=handler_class)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the OurChants API over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--quiet', action='store_true', help="Do not log each request (for load tests)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_app_server(args.host, args.port, args.quiet)
+    logger.info("Serving OurChants API on http://%s:%d", args.host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
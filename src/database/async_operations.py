@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Asyncio variants of the OurChants song operations.
+Same Song dataclass, exceptions, validation, SQL and caches as
+src.database.operations, run over an AsyncConnectionPool so one event loop
+can keep many queries in flight at once.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+from datetime import datetime
+
+import psycopg2
+
+from src.database import async_pool
+from src.database.async_pool import AsyncConnectionPool
+from src.database.cache import SharedCache
+from src.database.credentials import CredentialError, Credentials, get_credential_provider
+from src.database.operations import (
+    DatabaseError,
+    InvalidDataError,
+    Song,
+    SongBatch,
+    SongNotFoundError,
+    SongPage,
+    _DELETE_SONG,
+    _INSERT_SONG,
+    _SELECT_SONG,
+    _SELECT_SONGS,
+    _cached,
+    _evict_songs,
+    _fill_song_cache,
+    _is_auth_failure,
+    _list_key,
+    _list_query,
+    _page_query,
+    _read_from_primary,
+    _song_cache_version,
+    _song_key,
+    _song_from_row,
+    _song_page,
+    _songs_from_rows,
+    _songs_changed,
+    _unique_ids,
+    _update_query,
+    _validate_new_song,
+    _validate_sort,
+    decode_cursor,
+    get_list_cache,
+    get_song_cache,
+)
+
+async def _connect(credentials: Credentials):
+    return await async_pool.connect(
+        host=credentials.host,
+        database=credentials.dbname,
+        user=credentials.user,
+        password=credentials.password,
+        port=credentials.port
+    )
+
+async def get_db_connection():
+    """
+    Open an asynchronous connection to the PostgreSQL database.
+
+    Uses the same credential provider as get_db_connection, including the
+    single retry with refreshed credentials after an authentication failure.
+
+    Raises:
+        DatabaseError: If the connection cannot be established
+    """
+    db_name = None
+    try:
+        provider = get_credential_provider()
+        credentials = provider.get()
+        db_name = credentials.dbname
+        try:
+            return await _connect(credentials)
+        except psycopg2.OperationalError as e:
+            if not provider.refreshable or not _is_auth_failure(e):
+                raise
+            provider.invalidate()
+            return await _connect(provider.get())
+    except psycopg2.OperationalError as e:
+        raise DatabaseError(f"Failed to connect to database '{db_name}': {str(e)}")
+    except CredentialError as e:
+        raise DatabaseError(str(e)) from e
+    except Exception as e:
+        raise DatabaseError(f"Database connection error: {str(e)}")
+
+# One pool per event loop: asyncio primitives and reader callbacks belong to
+# the loop that created them, so a new loop (e.g. each asyncio.run) gets a
+# fresh pool. Pools are tracked by loop; those left behind by loops that have
+# since closed are closed when the next pool is created.
+_pools: Dict[asyncio.AbstractEventLoop, AsyncConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool() -> AsyncConnectionPool:
+    """
+    Return the async connection pool for the running event loop.
+
+    Sized from the same settings as the synchronous pool (DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE, DB_POOL_MAX_AGE, DB_POOL_MAX_IDLE, DB_POOL_TIMEOUT).
+    Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        abandoned = [_pools.pop(old_loop) for old_loop in list(_pools) if old_loop.is_closed()]
+        pool = _pools[loop] = AsyncConnectionPool(
+            get_db_connection,
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '0')),
+            max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            max_age=float(os.getenv('DB_POOL_MAX_AGE', '3600')),
+            max_idle=float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', '10'))
+        )
+    for old in abandoned:
+        old.close_abandoned()
+    return pool
+
+async def close_pool() -> None:
+    """Close the running loop's async pool; the next operation creates a fresh one."""
+    with _pools_lock:
+        pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+# The cache backends are synchronous. A shared (Redis) backend does network
+# I/O on every call, which would stall the event loop, so its calls run in
+# the default executor; the in-process backends are called directly.
+def _blocking_caches() -> bool:
+    return isinstance(get_song_cache(), SharedCache) or isinstance(get_list_cache(), SharedCache)
+
+async def _cache_io(func, *args):
+    """Call a cache method or helper, off the event loop when a cache is shared."""
+    if _blocking_caches():
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+async def _fetch(query, params, fetch: str = 'all'):
+    """Run one statement on a pooled connection and return fetchone()/fetchall() tuples."""
+    async with get_pool().connection() as conn:
+        cur = conn.cursor()
+        try:
+            await async_pool.execute(cur, query, params)
+            return cur.fetchone() if fetch == 'one' else cur.fetchall()
+        finally:
+            cur.close()
+
+async def create_song(song_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+    """
+    Create a new song in the database.
+
+    Args:
+        song_data: Dictionary containing song information
+
+    Returns:
+        Song object representing the created song
+
+    Raises:
+        InvalidDataError: If required fields are missing or invalid
+        DatabaseError: If database operation fails
+    """
+    values = _validate_new_song(song_data)
+
+    try:
+        song = _song_from_row(await _fetch(_INSERT_SONG, values, 'one'))
+    except psycopg2.IntegrityError as e:
+        raise InvalidDataError(f"Invalid data provided: {str(e)}")
+    except Exception as e:
+        raise DatabaseError(f"Failed to create song: {str(e)}")
+
+    await _cache_io(_evict_songs, [song.id])
+    await _cache_io(_songs_changed)
+    return song
+
+async def get_song(song_id: str) -> Song:
+    """
+    Retrieve a song by its ID, reading through the song cache.
+
+    Args:
+        song_id: Unique identifier of the song
+
+    Returns:
+        Song object if found
+
+    Raises:
+        SongNotFoundError: If song with given ID doesn't exist
+        DatabaseError: If database operation fails
+    """
+    cache = get_song_cache()
+    song = await _cache_io(_cached, cache, _song_key(song_id))
+    if song is not None:
+        return song
+
+    version = await _cache_io(_song_cache_version, cache)
+    try:
+        result = await _fetch(_SELECT_SONG, (song_id,), 'one')
+    except Exception as e:
+        raise DatabaseError(f"Failed to retrieve song: {str(e)}")
+    if not result:
+        raise SongNotFoundError(f"Song with ID {song_id} not found")
+
+    song = _song_from_row(result)
+    await _cache_io(_fill_song_cache, cache, version, [song])
+    return song
+
+async def get_songs(song_ids: Iterable[str]) -> SongBatch:
+    """
+    Retrieve many songs by ID with at most one query.
+
+    Args:
+        song_ids: Song IDs in the order the caller wants them back
+
+    Returns:
+        SongBatch: Found songs in request order and the ids that were not found
+
+    Raises:
+        InvalidDataError: If an id is not a string or more than MAX_BATCH_GET ids are given
+        DatabaseError: If database operation fails
+    """
+    ids = _unique_ids(song_ids)
+
+    cache = get_song_cache()
+    keys = {_song_key(song_id): song_id for song_id in ids}
+    cached = {} if _read_from_primary.get() else await _cache_io(cache.get_many, keys)
+    found = {keys[key]: song for key, song in cached.items()}
+    wanted = [song_id for song_id in ids if song_id not in found]
+
+    if wanted:
+        version = await _cache_io(_song_cache_version, cache)
+        try:
+            rows = await _fetch(_SELECT_SONGS, (wanted,))
+        except Exception as e:
+            raise DatabaseError(f"Failed to retrieve songs: {str(e)}")
+
+        songs = _songs_from_rows(rows)
+        for song in songs:
+            found[song.id] = song
+        await _cache_io(_fill_song_cache, cache, version, songs)
+
+    return SongBatch(
+        songs=[found[song_id] for song_id in ids if song_id in found],
+        missing=[song_id for song_id in ids if song_id not in found]
+    )
+
+async def update_song(song_id: str, update_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+    """
+    Update a song's information.
+
+    Args:
+        song_id: Unique identifier of the song to update
+        update_data: Dictionary containing fields to update
+
+    Returns:
+        Updated Song object
+
+    Raises:
+        SongNotFoundError: If song with given ID doesn't exist
+        InvalidDataError: If update data is invalid
+        DatabaseError: If database operation fails
+    """
+    _, query, values = _update_query(update_data)
+    values.append(song_id)
+
+    try:
+        result = await _fetch(query, values, 'one')
+    except psycopg2.IntegrityError as e:
+        raise InvalidDataError(f"Invalid update data: {str(e)}")
+    except Exception as e:
+        raise DatabaseError(f"Failed to update song: {str(e)}")
+    if not result:
+        await _cache_io(get_song_cache().delete, _song_key(song_id))
+        raise SongNotFoundError(f"Song with ID {song_id} not found")
+
+    song = _song_from_row(result)
+    await _cache_io(_evict_songs, [song_id])
+    await _cache_io(_songs_changed)
+    return song
+
+async def delete_song(song_id: str) -> bool:
+    """
+    Delete a song from the database.
+
+    Args:
+        song_id: Unique identifier of the song to delete
+
+    Returns:
+        True if song was deleted, False if song didn't exist
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    try:
+        result = await _fetch(_DELETE_SONG, (song_id,), 'one')
+    except Exception as e:
+        raise DatabaseError(f"Failed to delete song: {str(e)}")
+    finally:
+        await _cache_io(_evict_songs, [song_id])
+
+    if result:
+        await _cache_io(_songs_changed)
+    return bool(result)
+
+async def list_songs(
+    limit: int = 100,
+    offset: int = 0,
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    sort: str = 'name',
+    order: str = 'asc'
+) -> List[Song]:
+    """
+    List songs with optional filtering and offset pagination.
+
+    Shares its list cache entries with the synchronous list_songs.
+
+    Raises:
+        InvalidDataError: If the sort or order is not allowed
+        DatabaseError: If database operation fails
+    """
+    _validate_sort(sort, order)
+
+    cache = get_list_cache()
+    version = await _cache_io(cache.version, 'songs')
+    if version is not None:
+        key = _list_key(version, 'offset', genre, artist, sort, order, limit, offset)
+        songs = await _cache_io(_cached, cache, key)
+        if songs is not None:
+            return songs
+
+    _, query, params = _list_query(limit, offset, genre, artist, sort, order)
+    try:
+        songs = _songs_from_rows(await _fetch(query, params))
+    except Exception as e:
+        raise DatabaseError(f"Failed to list songs: {str(e)}")
+
+    if version is not None:
+        await _cache_io(cache.set, key, songs)
+    return songs
+
+async def list_songs_page(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    sort: str = 'name',
+    order: str = 'asc'
+) -> SongPage:
+    """
+    List songs with keyset pagination.
+
+    Cursors are interchangeable with the synchronous list_songs_page.
+
+    Raises:
+        InvalidDataError: If the cursor, limit, sort or order is invalid
+        DatabaseError: If database operation fails
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise InvalidDataError("Limit must be a positive integer")
+    _validate_sort(sort, order)
+
+    position = decode_cursor(cursor, sort, order) if cursor else None
+
+    cache = get_list_cache()
+    version = await _cache_io(cache.version, 'songs')
+    if version is not None:
+        key = _list_key(version, 'keyset', genre, artist, sort, order, limit, cursor)
+        page = await _cache_io(_cached, cache, key)
+        if page is not None:
+            return page
+
+    _, query, params = _page_query(limit, position, genre, artist, sort, order)
+    try:
+        page = _song_page(await _fetch(query, params), limit, sort, order)
+    except Exception as e:
+        raise DatabaseError(f"Failed to list songs: {str(e)}")
+
+    if version is not None:
+        await _cache_io(cache.set, key, page)
+    return page
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Asyncio connection pool for the OurChants database layer.
+Uses psycopg2's asynchronous connection mode, driven by the event loop's
+reader/writer callbacks, so many queries can be in flight on one thread
+without adding another database driver.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+from src.database.pool import PoolClosedError, PoolError, PoolExhaustedError
+
+async def wait(conn) -> None:
+    """
+    Drive an asynchronous connection until its pending operation completes.
+
+    Raises whatever psycopg2 raises for the operation (for example a query
+    error) once the server has answered.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            return
+        fd = conn.fileno()
+        ready = loop.create_future()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fd, ready.set_result, None)
+            try:
+                await ready
+            finally:
+                loop.remove_reader(fd)
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fd, ready.set_result, None)
+            try:
+                await ready
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError(f"Unexpected poll state {state}")
+
+async def connect(**kwargs):
+    """Open an asynchronous psycopg2 connection (always in autocommit mode)."""
+    conn = psycopg2.connect(async_=True, **kwargs)
+    try:
+        await wait(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+async def execute(cur, query, params=None) -> None:
+    """Run a statement on a cursor of an asynchronous connection."""
+    cur.execute(query, params)
+    await wait(cur.connection)
+
+class _PooledConnection:
+    """Bookkeeping for a single connection owned by the pool."""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+class AsyncConnectionPool:
+    """
+    Pool of asynchronous psycopg2 connections for one event loop.
+
+    Mirrors ConnectionPool: LIFO reuse, max_age/max_idle recycling on
+    checkout and return, a SELECT 1 ping for connections idle longer than
+    health_check_after, and a bounded wait when max_size are checked out.
+    Asynchronous connections are always in autocommit mode, so each
+    statement commits on its own.
+
+    Args:
+        connect: Coroutine function returning a new asynchronous connection
+        min_size: Number of idle connections kept open by the reaper
+        max_size: Maximum number of connections open at once
+        max_age: Seconds after which a connection is closed instead of reused
+        max_idle: Seconds a connection may sit idle before it is reaped
+        health_check_after: Idle seconds after which a checkout pings the server
+        checkout_timeout: Seconds getconn() waits for a free connection
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable],
+        min_size: int = 0,
+        max_size: int = 10,
+        max_age: Optional[float] = 3600.0,
+        max_idle: Optional[float] = 600.0,
+        health_check_after: Optional[float] = 30.0,
+        checkout_timeout: float = 10.0
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.checkout_timeout = checkout_timeout
+        self._idle: List[_PooledConnection] = []
+        self._in_use = {}
+        self._opening = 0
+        self._closed = False
+        self._cond = asyncio.Condition()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out."""
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def _expired(self, entry: _PooledConnection, now: float) -> bool:
+        if entry.conn.closed:
+            return True
+        if self.max_age is not None and now - entry.created_at >= self.max_age:
+            return True
+        return False
+
+    def _collect_expired(self) -> List[_PooledConnection]:
+        """Remove idle connections past max_age or max_idle, keeping min_size."""
+        now = time.monotonic()
+        keep, stale = [], []
+        for entry in self._idle:
+            idle_too_long = self.max_idle is not None and now - entry.last_used >= self.max_idle
+            if self._expired(entry, now) or idle_too_long:
+                stale.append(entry)
+            else:
+                keep.append(entry)
+        # Refill from the freshest stale entries that are still usable
+        while len(keep) < self.min_size and stale:
+            candidate = stale[-1]
+            if self._expired(candidate, now):
+                break
+            keep.insert(0, stale.pop())
+        self._idle = keep
+        return stale
+
+    async def _is_healthy(self, entry: _PooledConnection) -> bool:
+        if entry.conn.closed:
+            return False
+        if self.health_check_after is None or time.monotonic() - entry.last_used < self.health_check_after:
+            return True
+        try:
+            cur = entry.conn.cursor()
+            await execute(cur, "SELECT 1")
+            cur.close()
+            return True
+        except psycopg2.Error:
+            return False
+
+    async def getconn(self):
+        """
+        Check a connection out of the pool.
+
+        Raises:
+            PoolClosedError: If the pool has been closed
+            PoolExhaustedError: If no connection frees up within checkout_timeout
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            async with self._cond:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                for stale in self._collect_expired():
+                    stale.conn.close()
+                entry = None
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._in_use[id(entry.conn)] = entry
+                elif self.size < self.max_size:
+                    self._opening += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No connection available within {self.checkout_timeout} seconds"
+                        )
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            if entry is not None:
+                if await self._is_healthy(entry):
+                    return entry.conn
+                async with self._cond:
+                    self._in_use.pop(id(entry.conn), None)
+                    self._cond.notify()
+                entry.conn.close()
+                continue
+
+            try:
+                conn = await self._connect()
+            except BaseException:
+                async with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+            async with self._cond:
+                self._opening -= 1
+                self._in_use[id(conn)] = _PooledConnection(conn)
+            return conn
+
+    async def putconn(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Connections that are closed, still executing (for example after a
+        cancelled query), past max_age, or explicitly discarded are closed.
+        """
+        async with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+            if entry is None:
+                raise PoolError("Connection does not belong to this pool")
+            now = time.monotonic()
+            keep = not discard and not self._closed and not conn.closed and not conn.isexecuting()
+            if keep and self.max_age is not None and now - entry.created_at >= self.max_age:
+                keep = False
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+            stale = self._collect_expired()
+            self._cond.notify()
+        if not keep:
+            conn.close()
+        for old in stale:
+            old.conn.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Async context manager yielding a pooled connection.
+
+        Connections that fail at the driver level, or whose query was
+        interrupted, are discarded rather than reused.
+        """
+        conn = await self.getconn()
+        discard = False
+        try:
+            yield conn
+        except BaseException as e:
+            discard = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError, asyncio.CancelledError))
+            raise
+        finally:
+            await self.putconn(conn, discard=discard)
+
+    async def close(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        async with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for entry in idle:
+            entry.conn.close()
+
+    def close_abandoned(self) -> None:
+        """
+        Close every connection of a pool whose event loop has closed.
+
+        close() needs the pool's own loop; once that loop is gone nothing can
+        return or await a connection, so idle and checked-out connections are
+        closed synchronously.
+        """
+        self._closed = True
+        entries, self._idle = self._idle + list(self._in_use.values()), []
+        self._in_use = {}
+        for entry in entries:
+            entry.conn.close()
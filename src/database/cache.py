@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Cache backends for the OurChants database layer.
+Provides an in-process LRU cache with TTL and a shared key/value backend
+(Redis, or an in-memory stand-in for local development and tests).
+"""
+
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Cache:
+    """
+    Interface implemented by every cache backend.
+
+    Values are returned as stored; callers must treat them as read-only.
+    A get() of a missing or expired key returns None.
+
+    Every backend also keeps named version counters. They are never evicted,
+    so callers can scope keys by a version and invalidate a whole family of
+    entries with a single bump().
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Values for the keys that are present; missing keys are left out."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def set_if_version(self, key: str, value: Any, name: str, version: int,
+                       ttl: Optional[float] = None) -> bool:
+        """
+        Set key only while the version counter name still equals version.
+
+        The comparison and the set are atomic with respect to bump(), so a
+        value computed before a bump is never stored after it.
+
+        Returns:
+            bool: Whether the value was stored
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def version(self, name: str) -> Optional[int]:
+        """Current value of a version counter (None if it cannot be read)."""
+        raise NotImplementedError
+
+    def bump(self, name: str) -> None:
+        """Increment a version counter."""
+        raise NotImplementedError
+
+class NullCache(Cache):
+    """Cache that stores nothing; used when caching is disabled."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        return {}
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def set_if_version(self, key: str, value: Any, name: str, version: int,
+                       ttl: Optional[float] = None) -> bool:
+        return False
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def version(self, name: str) -> Optional[int]:
+        return None
+
+    def bump(self, name: str) -> None:
+        pass
+
+class LRUCache(Cache):
+    """
+    Thread-safe in-process LRU cache with a per-entry time to live.
+
+    Args:
+        maxsize: Maximum number of entries before the least recently used is evicted
+        ttl: Default seconds an entry stays valid (None for no expiry)
+        clock: Monotonic time source, replaceable in tests
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def set_if_version(self, key: str, value: Any, name: str, version: int,
+                       ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._versions.get(name, 0) != version:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        # Caller holds self._lock
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def version(self, name: str) -> Optional[int]:
+        return self._versions.get(name, 0)
+
+    def bump(self, name: str) -> None:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+# KEYS: entry, version counter; ARGV: expected version, value, seconds to live (0 for none)
+_SET_IF_VERSION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+if ARGV[3] == '0' then
+    redis.call('SET', KEYS[1], ARGV[2])
+else
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return 1
+"""
+
+class LocalKeyValueStore:
+    """
+    In-memory stand-in for the subset of the Redis client used by SharedCache.
+
+    Lets the shared backend (serialization, key prefixes, TTLs) run locally
+    and in tests without a Redis server.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[key] = (self._clock() + ex if ex else None, value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def eval(self, script: str, numkeys: int, *keys_and_args) -> int:
+        """Run one of the scripts SharedCache sends, atomically like Redis would."""
+        if script != _SET_IF_VERSION_SCRIPT:
+            raise ValueError("LocalKeyValueStore only runs SharedCache's scripts")
+        (key, version_key), (version, value, ex) = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        with self._lock:
+            entry = self._data.get(version_key)
+            current = entry[1] if entry is not None else b'0'
+            if current != str(version).encode('ascii'):
+                return 0
+            self._data[key] = (self._clock() + int(ex) if int(ex) else None, value)
+            return 1
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            expires_at, value = self._data.get(key, (None, b'0'))
+            value = str(int(value) + 1).encode('ascii')
+            self._data[key] = (expires_at, value)
+            return int(value)
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+class SharedCache(Cache):
+    """
+    Cache backed by a Redis-compatible client shared between processes.
+
+    Values are pickled, so the backend must only be reachable by trusted
+    services. Backend failures are logged and treated as cache misses so an
+    unavailable cache degrades to database reads instead of failing requests.
+
+    Args:
+        client: Redis client (or LocalKeyValueStore)
+        prefix: Namespace prepended to every key
+        ttl: Default seconds an entry stays valid
+    """
+
+    def __init__(self, client, prefix: str = 'ourchants:', ttl: Optional[float] = 60.0):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            data = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+        return pickle.loads(data) if data is not None else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = self.client.mget([self.prefix + key for key in keys])
+        except Exception as e:
+            logger.warning("Cache get_many failed: %s", e)
+            return {}
+        return {key: pickle.loads(data) for key, data in zip(keys, values) if data is not None}
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(
+                self.prefix + key,
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                ex=max(1, int(ttl)) if ttl is not None else None
+            )
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    def set_if_version(self, key: str, value: Any, name: str, version: int,
+                       ttl: Optional[float] = None) -> bool:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            return bool(self.client.eval(
+                _SET_IF_VERSION_SCRIPT, 2,
+                self.prefix + key, f"{self.prefix}version:{name}",
+                version,
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                max(1, int(ttl)) if ttl is not None else 0
+            ))
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+            return False
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def delete_many(self, keys: Iterable[str], chunk_size: int = 1000) -> None:
+        chunk = []
+        try:
+            for key in keys:
+                chunk.append(self.prefix + key)
+                if len(chunk) >= chunk_size:
+                    self.client.delete(*chunk)
+                    chunk = []
+            if chunk:
+                self.client.delete(*chunk)
+        except Exception as e:
+            logger.warning("Cache invalidation failed: %s", e)
+
+    def clear(self) -> None:
+        # Only the local stand-in is cleared wholesale; a shared Redis
+        # database may hold other services' keys
+        if isinstance(self.client, LocalKeyValueStore):
+            self.client.flushdb()
+
+    def version(self, name: str) -> Optional[int]:
+        try:
+            value = self.client.get(f"{self.prefix}version:{name}")
+        except Exception as e:
+            logger.warning("Cache version read failed for %s: %s", name, e)
+            return None
+        return int(value) if value is not None else 0
+
+    def bump(self, name: str) -> None:
+        try:
+            self.client.incr(f"{self.prefix}version:{name}")
+        except Exception as e:
+            logger.warning("Cache version bump failed for %s: %s", name, e)
+
+def cache_from_env(name: str, default_size: int = 1024, default_ttl: float = 60.0) -> Cache:
+    """
+    Build a cache from environment settings named after the cache.
+
+    For name='song' the settings are:
+        SONG_CACHE_BACKEND: 'memory' (default), 'local', 'redis' or 'none'
+        SONG_CACHE_SIZE: Maximum entries for the memory backend
+        SONG_CACHE_TTL: Seconds an entry stays valid
+        SONG_CACHE_REDIS_URL: Redis URL for the redis backend
+
+    Raises:
+        ValueError: If the backend is unknown or misconfigured
+    """
+    setting = name.upper() + '_CACHE_'
+    backend = os.getenv(setting + 'BACKEND', 'memory').lower()
+    ttl = float(os.getenv(setting + 'TTL', str(default_ttl)))
+
+    if backend == 'none':
+        return NullCache()
+    if backend == 'memory':
+        return LRUCache(maxsize=int(os.getenv(setting + 'SIZE', str(default_size))), ttl=ttl)
+    if backend == 'local':
+        return SharedCache(LocalKeyValueStore(), prefix=f'ourchants:{name}:', ttl=ttl)
+    if backend == 'redis':
+        url = os.getenv(setting + 'REDIS_URL')
+        if not url:
+            raise ValueError(f"{setting}REDIS_URL is required for the redis cache backend")
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("The redis cache backend requires the 'redis' package")
+        return SharedCache(redis.Redis.from_url(url), prefix=f'ourchants:{name}:', ttl=ttl)
+    raise ValueError(f"Unknown cache backend '{backend}' in {setting}BACKEND")
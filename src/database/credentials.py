@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Database credential providers for the OurChants database layer.
+Resolves connection credentials from environment variables or from an AWS
+Secrets Manager secret cached in-process, with a refresh hook for rotation.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+class CredentialError(Exception):
+    """Raised when database credentials cannot be resolved."""
+    pass
+
+@dataclass(frozen=True)
+class Credentials:
+    """Everything needed to open a database connection."""
+    host: str
+    port: str
+    dbname: str
+    user: str
+    password: str
+
+class CredentialProvider:
+    """
+    Interface implemented by every credential source.
+
+    get() may be called on every new connection, so implementations must be
+    cheap once warm. invalidate() is called after an authentication failure;
+    providers backed by a rotating secret drop their cached value so the
+    next get() fetches the current one.
+    """
+
+    # Whether invalidate() can produce different credentials on the next get()
+    refreshable = False
+
+    def get(self) -> Credentials:
+        raise NotImplementedError
+
+    def invalidate(self) -> None:
+        pass
+
+def _from_settings(settings: Dict[str, Optional[str]]) -> Credentials:
+    """Build Credentials, naming the environment variables that are missing."""
+    missing = [name for name, value in settings.items() if not value]
+    if missing:
+        raise CredentialError(f"Missing required environment variables: {', '.join(missing)}")
+    return Credentials(
+        host=settings['DB_HOST'],
+        port=str(settings['DB_PORT']),
+        dbname=settings['DB_NAME'],
+        user=settings['DB_USER'],
+        password=settings['DB_PASSWORD']
+    )
+
+class EnvCredentialProvider(CredentialProvider):
+    """Credentials from DB_HOST, DB_PORT, DB_NAME, DB_USER and DB_PASSWORD."""
+
+    def get(self) -> Credentials:
+        return _from_settings({
+            'DB_HOST': os.getenv('DB_HOST'),
+            'DB_NAME': os.getenv('DB_NAME'),
+            'DB_USER': os.getenv('DB_USER'),
+            'DB_PASSWORD': os.getenv('DB_PASSWORD'),
+            'DB_PORT': os.getenv('DB_PORT')
+        })
+
+class StaticCredentialProvider(CredentialProvider):
+    """Fixed credentials, for local development and tests."""
+
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+
+    def get(self) -> Credentials:
+        return self.credentials
+
+class SecretsManagerCredentialProvider(CredentialProvider):
+    """
+    Credentials from an RDS-style Secrets Manager secret, cached with a TTL.
+
+    The secret is fetched once and reused until ttl expires or invalidate()
+    is called, so connections do not pay for a Secrets Manager round trip.
+    User and password always come from the secret; host, port and database
+    name come from DB_HOST / DB_PORT / DB_NAME when set, else from the secret.
+
+    Args:
+        secret_id: Secret ARN or name
+        ttl: Seconds a fetched secret is reused
+        client: Secrets Manager client (a boto3 client is created lazily if None)
+        clock: Monotonic time source, replaceable in tests
+    """
+
+    refreshable = True
+
+    def __init__(self, secret_id: str, ttl: float = 300.0, client: Any = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.secret_id = secret_id
+        self.ttl = ttl
+        self._client = client
+        self._clock = clock
+        self._cached: Optional[Credentials] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def _get_client(self):
+        if self._client is None:
+            # boto3 adds ~140ms to imports; only load it when a secret is used
+            import boto3
+            self._client = boto3.client('secretsmanager')
+        return self._client
+
+    def _fetch(self) -> Credentials:
+        try:
+            response = self._get_client().get_secret_value(SecretId=self.secret_id)
+            secret = json.loads(response['SecretString'])
+        except Exception as e:
+            raise CredentialError(f"Failed to read secret '{self.secret_id}': {str(e)}")
+        self.fetches += 1
+        return _from_settings({
+            'DB_HOST': os.getenv('DB_HOST') or secret.get('host'),
+            'DB_NAME': os.getenv('DB_NAME') or secret.get('dbname'),
+            'DB_USER': secret.get('username'),
+            'DB_PASSWORD': secret.get('password'),
+            'DB_PORT': os.getenv('DB_PORT') or secret.get('port')
+        })
+
+    def get(self) -> Credentials:
+        with self._lock:
+            if self._cached is None or self._clock() >= self._expires_at:
+                self._cached = self._fetch()
+                self._expires_at = self._clock() + self.ttl
+            return self._cached
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cached = None
+
+# Process-wide provider; lives for the lifetime of the process (or warm Lambda container)
+_provider: Optional[CredentialProvider] = None
+_provider_lock = threading.Lock()
+
+def get_credential_provider() -> CredentialProvider:
+    """
+    Return the process-wide credential provider, creating it on first use.
+
+    Uses Secrets Manager when DB_SECRET_ARN is set (cached for DB_SECRET_TTL
+    seconds, default 300) and environment variables otherwise.
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                secret_id = os.getenv('DB_SECRET_ARN')
+                if secret_id:
+                    _provider = SecretsManagerCredentialProvider(
+                        secret_id, ttl=float(os.getenv('DB_SECRET_TTL', '300'))
+                    )
+                else:
+                    _provider = EnvCredentialProvider()
+    return _provider
+
+def set_credential_provider(provider: Optional[CredentialProvider]) -> None:
+    """Replace the provider (None rebuilds it from the environment on next use)."""
+    global _provider
+    _provider = provider
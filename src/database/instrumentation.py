@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Per-request timing instrumentation for the OurChants API.
+Collects how long a request spends connecting, querying, fetching rows,
+converting them to Song objects and serializing/compressing the response,
+plus round-trip and row counts. The API handler reports the totals as a
+Server-Timing header and as EMF metrics.
+
+Disabled unless OURCHANTS_INSTRUMENTATION is set; when disabled, or outside
+a request, every hook is a single context variable lookup.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from psycopg2.extensions import cursor as _BaseCursor
+
+from src.database import slow_queries
+
+ENABLED = os.getenv('OURCHANTS_INSTRUMENTATION', 'false').lower() in ('1', 'true', 'yes', 'on')
+
+# Phases in the order they are reported
+PHASES = ('connect', 'query', 'fetch', 'decode', 'serialize', 'compress')
+
+class RequestMetrics:
+    """Timers (seconds) and counters accumulated for one request."""
+
+    __slots__ = ('timings', 'counts', 'started', 'route')
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {'connects': 0, 'round_trips': 0, 'rows': 0}
+        self.started = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; durations in milliseconds."""
+        entries = []
+        for phase in PHASES:
+            if phase in self.timings:
+                entry = f"{phase};dur={self.timings[phase] * 1000:.2f}"
+                if phase == 'query':
+                    entry += f';desc="{self.counts["round_trips"]} round trips"'
+                entries.append(entry)
+        entries.append(f"total;dur={self.elapsed * 1000:.2f}")
+        return ', '.join(entries)
+
+    def metrics(self) -> Dict[str, Tuple[float, str]]:
+        """Timers and counters in the shape emit_metrics() expects."""
+        values = {
+            f"{phase.title()}Time": (self.timings[phase] * 1000, 'Milliseconds')
+            for phase in PHASES if phase in self.timings
+        }
+        values['Duration'] = (self.elapsed * 1000, 'Milliseconds')
+        values['Connects'] = (self.counts['connects'], 'Count')
+        values['RoundTrips'] = (self.counts['round_trips'], 'Count')
+        values['Rows'] = (self.counts['rows'], 'Count')
+        return values
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+def start_request():
+    """
+    Begin collecting metrics for the current context.
+
+    Returns:
+        A token for finish_request(), or None when instrumentation is disabled
+    """
+    if not ENABLED:
+        return None
+    return _current.set(RequestMetrics())
+
+def finish_request(token) -> Optional[RequestMetrics]:
+    """Stop collecting and return what start_request() began (None when disabled)."""
+    if token is None:
+        return None
+    metrics = _current.get()
+    _current.reset(token)
+    return metrics
+
+def current() -> Optional[RequestMetrics]:
+    """Metrics for the request being handled, if any."""
+    return _current.get()
+
+class _Timer:
+    __slots__ = ('metrics', 'phase', 'started')
+
+    def __init__(self, metrics: RequestMetrics, phase: str):
+        self.metrics = metrics
+        self.phase = phase
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add(self.phase, time.perf_counter() - self.started)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timed(phase: str):
+    """Context manager adding its duration to phase for the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return _NULL_TIMER
+    return _Timer(metrics, phase)
+
+def count(name: str, amount: int = 1) -> None:
+    """Increment a counter for the current request."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.count(name, amount)
+
+class _Instrumented:
+    """
+    Cursor mixin timing execute (one round trip each) and fetches.
+
+    psycopg2 transfers a plain cursor's whole result during execute() and
+    converts values to Python types as rows are fetched, so 'query' is
+    server time plus transfer and 'fetch' is type conversion. Statements
+    slower than the slow-query threshold are handed to slow_queries.record.
+    """
+
+    def execute(self, query, vars=None):
+        metrics = _current.get()
+        threshold = slow_queries.THRESHOLD
+        if metrics is None and threshold is None:
+            return super().execute(query, vars)
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        finally:
+            duration = time.perf_counter() - started
+            if metrics is not None:
+                metrics.add('query', duration)
+                metrics.count('round_trips')
+        if threshold is not None and duration >= threshold:
+            slow_queries.record(self, query, vars, duration)
+        return result
+
+    def copy_expert(self, sql, file, size=8192):
+        metrics = _current.get()
+        if metrics is None:
+            return super().copy_expert(sql, file, size)
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            metrics.add('query', time.perf_counter() - started)
+            metrics.count('round_trips')
+
+    def fetchone(self):
+        metrics = _current.get()
+        if metrics is None:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        metrics.add('fetch', time.perf_counter() - started)
+        if row is not None:
+            metrics.count('rows')
+        return row
+
+    def fetchmany(self, size=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().fetchmany(size) if size is not None else super().fetchmany()
+        started = time.perf_counter()
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        metrics.add('fetch', time.perf_counter() - started)
+        metrics.count('rows', len(rows))
+        return rows
+
+    def fetchall(self):
+        metrics = _current.get()
+        if metrics is None:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        metrics.add('fetch', time.perf_counter() - started)
+        metrics.count('rows', len(rows))
+        return rows
+
+class InstrumentedCursor(_Instrumented, _BaseCursor):
+    """Default cursor for pooled connections."""
@@ -4,14 +4,51 @@ Database operations module for OurChants application.
 Provides CRUD operations for song data in PostgreSQL database.
 """
 
+import base64
+import csv
+import io
+import json
 import os
+import re
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import DictCursor
 from datetime import datetime, date
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from itertools import starmap
 
+from src.database import statements
+from src.database.cache import Cache, cache_from_env
+from src.database.credentials import CredentialError, Credentials, get_credential_provider
+from src.database.instrumentation import InstrumentedCursor, count, timed
+from src.database.pool import ConnectionPool, PoolError, PoolExhaustedError
+
+logger = logging.getLogger(__name__)
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields.
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10 (the Lambda
+    runtime is 3.9). Instances have no per-instance __dict__, so they are
+    smaller and quicker to build when a large result is decoded.
+    """
+    names = tuple(field.name for field in fields(cls))
+    # Defaults live on in the generated __init__; as class attributes they would clash with the slots
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@_slotted
 @dataclass
 class Song:
     """Data class representing a song in the database."""
@@ -25,27 +62,20 @@ class Song:
     created_at: datetime = None
     updated_at: datetime = None
 
-    @classmethod
-    def from_db_row(cls, row):
-        """Create a Song instance from a database row."""
-        # Convert the row to a dictionary if it's not already
-        if not isinstance(row, dict):
-            row = dict(row)
-        
-        # Extract only the fields we need
-        song_data = {
-            'id': row['id'],
-            'name': row['name'],
-            'artist': row['artist'],
-            'album': row['album'],
-            'release_date': row['release_date'],
-            'genre': row['genre'],
-            'duration_in_seconds': row['duration_in_seconds'],
-            'created_at': row.get('created_at'),
-            'updated_at': row.get('updated_at')
-        }
-        
-        return cls(**song_data)
+# Columns fetched for Song objects, in field order so that a plain tuple row
+# unpacks straight into Song(*row); avoids pulling search_vector on every read
+SONG_COLUMNS = tuple(field.name for field in fields(Song))
+_SONG_COLUMNS_SQL = sql.SQL(', ').join(sql.Identifier(column) for column in SONG_COLUMNS)
+
+def _song_from_row(row) -> Song:
+    """Convert one tuple row of SONG_COLUMNS, timed as the request's 'decode' phase."""
+    with timed('decode'):
+        return Song(*row)
+
+def _songs_from_rows(rows) -> List[Song]:
+    """Convert tuple rows of SONG_COLUMNS, timed as the request's 'decode' phase."""
+    with timed('decode'):
+        return list(starmap(Song, rows))
 
 class DatabaseError(Exception):
     """Base exception for database operations."""
@@ -59,53 +89,319 @@ class InvalidDataError(DatabaseError):
     """Raised when invalid data is provided for a song."""
     pass
 
-def get_db_connection():
-    """Establish a connection to the PostgreSQL database."""
-    try:
-        # Get database credentials from environment variables
-        db_host = os.getenv('DB_HOST')
-        db_name = os.getenv('DB_NAME')
-        db_user = os.getenv('DB_USER')
-        db_password = os.getenv('DB_PASSWORD')
-        db_port = os.getenv('DB_PORT')
-
-        # Verify all required environment variables are set
-        if not all([db_host, db_name, db_user, db_password, db_port]):
-            missing = []
-            if not db_host: missing.append('DB_HOST')
-            if not db_name: missing.append('DB_NAME')
-            if not db_user: missing.append('DB_USER')
-            if not db_password: missing.append('DB_PASSWORD')
-            if not db_port: missing.append('DB_PORT')
-            raise DatabaseError(f"Missing required environment variables: {', '.join(missing)}")
-
-        # Connect to the database
-        conn = psycopg2.connect(
-            host=db_host,
-            database=db_name,  # Use the database name from environment
-            user=db_user,
-            password=db_password,
-            port=db_port
+def _is_auth_failure(error: psycopg2.OperationalError) -> bool:
+    """Whether a connect error was caused by rejected credentials."""
+    if getattr(error, 'pgcode', None) in ('28P01', '28000'):
+        return True
+    return 'authentication failed' in str(error)
+
+def _connect(credentials: Credentials):
+    count('connects')
+    with timed('connect'):
+        return psycopg2.connect(
+            host=credentials.host,
+            database=credentials.dbname,
+            user=credentials.user,
+            password=credentials.password,
+            port=credentials.port,
+            connection_factory=statements.PreparedConnection,
+            cursor_factory=InstrumentedCursor
         )
-        return conn
+
+def get_db_connection(host: Optional[str] = None, port: Optional[str] = None):
+    """
+    Establish a connection to the PostgreSQL database.
+    
+    Credentials come from the process-wide provider (environment variables,
+    or a cached Secrets Manager secret when DB_SECRET_ARN is set). If the
+    server rejects cached credentials, for example after a rotation, the
+    provider is refreshed and the connect retried once.
+    
+    Args:
+        host: Connect to this host instead of the configured one (read replica)
+        port: Port to use with host (defaults to the configured port)
+    """
+    db_name = None
+    
+    def located(credentials: Credentials) -> Credentials:
+        if host is None:
+            return credentials
+        return replace(credentials, host=host, port=port or credentials.port)
+    
+    try:
+        provider = get_credential_provider()
+        credentials = located(provider.get())
+        db_name = credentials.dbname
+        try:
+            return _connect(credentials)
+        except psycopg2.OperationalError as e:
+            if not provider.refreshable or not _is_auth_failure(e):
+                raise
+            provider.invalidate()
+            return _connect(located(provider.get()))
     except psycopg2.OperationalError as e:
         raise DatabaseError(f"Failed to connect to database '{db_name}': {str(e)}")
+    except CredentialError as e:
+        raise DatabaseError(str(e)) from e
     except Exception as e:
         raise DatabaseError(f"Database connection error: {str(e)}")
 
-def create_song(song_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+# Process-wide pool; lives for the lifetime of the process (or warm Lambda container)
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
     """
-    Create a new song in the database.
+    Return the process-wide connection pool, creating it on first use.
     
+    Pool sizing is read from the environment once:
+        DB_POOL_MIN_SIZE: Connections opened when the pool is created and
+            kept open while idle (default 0)
+        DB_POOL_MAX_SIZE: Maximum open connections (default 10)
+        DB_POOL_MAX_AGE: Seconds before a connection is recycled (default 3600)
+        DB_POOL_MAX_IDLE: Seconds before an idle connection is closed (default 300)
+        DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 10)
+    """
+    global _pool
+    created = None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = created = ConnectionPool(
+                    get_db_connection,
+                    min_size=int(os.getenv('DB_POOL_MIN_SIZE', '0')),
+                    max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                    max_age=float(os.getenv('DB_POOL_MAX_AGE', '3600')),
+                    max_idle=float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+                    checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', '10'))
+                )
+    if created is not None:
+        try:
+            created.fill()
+        except DatabaseError as e:
+            # Checkouts open connections on demand, so this only costs the warm-up
+            logger.warning("Could not open DB_POOL_MIN_SIZE connections: %s", e)
+    return _pool
+
+def close_pool() -> None:
+    """Close the process-wide pool; the next operation creates a fresh one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+def prewarm_pool(connections: int = 1) -> None:
+    """
+    Open pooled connections ahead of the first request.
+
+    Called during Lambda init so the first invocation does not pay for the
+    TCP/TLS handshake and authentication. Connections stay idle in the pool
+    until DB_POOL_MAX_IDLE expires them.
+
     Args:
-        song_data: Dictionary containing song information
-        
-    Returns:
-        Song object representing the created song
-        
+        connections: Number of connections to open (capped at the pool size)
+
+    Raises:
+        DatabaseError: If a connection cannot be opened
+    """
+    get_pool().fill(connections)
+
+@contextmanager
+def _connection():
+    """Borrow a pooled connection for the duration of one operation."""
+    with get_pool().connection() as conn:
+        yield conn
+
+# Optional read replica (DB_READ_HOST). Read-only operations use it unless
+# reads are pinned to the primary, and fall back to the primary when it is
+# unreachable.
+_read_pool: Optional[ConnectionPool] = None
+_replica_retry_at = 0.0
+# Seconds a replica may trail the primary; reads that may have gone to the
+# replica this soon after a write do not fill the caches
+REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+_read_from_primary: ContextVar[bool] = ContextVar('read_from_primary', default=False)
+
+def get_read_pool() -> Optional[ConnectionPool]:
+    """
+    Return the read replica pool, or None when DB_READ_HOST is not set.
+    
+    The pool is created on first use from:
+        DB_READ_HOST: Replica endpoint (same credentials and database as the primary)
+        DB_READ_PORT: Replica port (defaults to the primary's)
+        DB_READ_POOL_MAX_SIZE: Maximum open replica connections (default DB_POOL_MAX_SIZE)
+    """
+    global _read_pool
+    host = os.getenv('DB_READ_HOST')
+    if not host:
+        return None
+    if _read_pool is None:
+        with _pool_lock:
+            if _read_pool is None:
+                port = os.getenv('DB_READ_PORT')
+                _read_pool = ConnectionPool(
+                    lambda: get_db_connection(host=host, port=port),
+                    max_size=int(os.getenv('DB_READ_POOL_MAX_SIZE', os.getenv('DB_POOL_MAX_SIZE', '10'))),
+                    max_age=float(os.getenv('DB_POOL_MAX_AGE', '3600')),
+                    max_idle=float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+                    checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', '10'))
+                )
+    return _read_pool
+
+def close_read_pool() -> None:
+    """Close the read replica pool; the next read creates a fresh one."""
+    global _read_pool, _replica_retry_at
+    with _pool_lock:
+        pool, _read_pool = _read_pool, None
+        _replica_retry_at = 0.0
+    if pool is not None:
+        pool.close()
+
+@contextmanager
+def use_primary():
+    """
+    Send reads in this context to the primary and bypass the caches.
+    
+    Gives a client read-your-writes consistency right after its own write,
+    while the replica may still be catching up.
+    """
+    token = _read_from_primary.set(True)
+    try:
+        yield
+    finally:
+        _read_from_primary.reset(token)
+
+def _cached(cache: Cache, key: str):
+    """Cache lookup for reads; skipped while reads are pinned to the primary."""
+    return None if _read_from_primary.get() else cache.get(key)
+
+# Kept in each cache for REPLICA_MAX_LAG seconds after a write, so that every
+# process sharing the cache knows the replica may not have the write yet
+_RECENT_WRITE_KEY = 'recent-write'
+
+def _note_write(cache: Cache) -> None:
+    """Mark a write in cache; called before the cache's version is bumped."""
+    cache.set(_RECENT_WRITE_KEY, True, ttl=REPLICA_MAX_LAG)
+
+def _may_fill(cache: Cache) -> bool:
+    """Whether a finished read may fill cache (not from a replica that may lag a recent write)."""
+    if _read_from_primary.get() or get_read_pool() is None:
+        return True
+    return cache.get(_RECENT_WRITE_KEY) is None
+
+@contextmanager
+def _read_connection():
+    """
+    Borrow a connection for a read-only operation.
+    
+    Prefers the replica pool. If the replica cannot be reached it is skipped
+    for DB_READ_RETRY_AFTER seconds (default 30) and reads go to the primary;
+    an exhausted replica pool spills the read to the primary as well.
+    """
+    global _replica_retry_at
+    pool = None if _read_from_primary.get() else get_read_pool()
+    conn = None
+    if pool is not None and time.monotonic() >= _replica_retry_at:
+        try:
+            conn = pool.getconn()
+        except PoolExhaustedError:
+            pass
+        except (DatabaseError, PoolError) as e:
+            _replica_retry_at = time.monotonic() + float(os.getenv('DB_READ_RETRY_AFTER', '30'))
+            logger.warning("Read replica unavailable, reading from primary: %s", e)
+    
+    if conn is None:
+        with _connection() as conn:
+            yield conn
+    else:
+        with pool.connection(conn) as conn:
+            yield conn
+
+# Read-through cache for get_song, configured from SONG_CACHE_* settings
+_song_cache: Optional[Cache] = None
+_cache_lock = threading.Lock()
+
+def get_song_cache() -> Cache:
+    """Return the process-wide song cache, creating it on first use."""
+    global _song_cache
+    if _song_cache is None:
+        with _cache_lock:
+            if _song_cache is None:
+                _song_cache = cache_from_env('song')
+    return _song_cache
+
+def set_song_cache(cache: Optional[Cache]) -> None:
+    """Replace the song cache (None rebuilds it from the environment on next use)."""
+    global _song_cache
+    _song_cache = cache
+
+def _song_key(song_id: str) -> str:
+    return f"song:{song_id}"
+
+# Writes only ever evict songs from the song cache; reads fill it. A read
+# notes the song cache's 'songs' version before it queries and fills with
+# set_if_version, which stores nothing once a write has bumped the version,
+# so a row read just before a write cannot replace the eviction with its
+# older copy.
+def _song_cache_version(cache: Cache) -> Optional[int]:
+    """Version to pass to _fill_song_cache, read before the database is queried."""
+    return cache.version('songs')
+
+def _fill_song_cache(cache: Cache, version: Optional[int], songs: Iterable[Song]) -> None:
+    """Cache songs read from the database unless a write ran since version was read."""
+    if version is None or not _may_fill(cache):
+        return
+    for song in songs:
+        if not cache.set_if_version(_song_key(song.id), song, 'songs', version):
+            return
+
+def _evict_songs(song_ids: Iterable[str]) -> None:
+    """Drop written songs from the song cache (after the write has committed)."""
+    cache = get_song_cache()
+    _note_write(cache)
+    # Bump before deleting: a fill compared after the bump stores nothing,
+    # and one stored before it is deleted below
+    cache.bump('songs')
+    cache.delete_many(_song_key(song_id) for song_id in song_ids)
+
+# Result cache for list pages, configured from LIST_CACHE_* settings. Keys
+# embed the 'songs' version counter, which every write bumps, so a page
+# cached before a write is never looked up again. With the per-process
+# memory backend only this process's writes are seen; deployments with
+# several writers should use a shared backend.
+_list_cache: Optional[Cache] = None
+
+def get_list_cache() -> Cache:
+    """Return the process-wide list page cache, creating it on first use."""
+    global _list_cache
+    if _list_cache is None:
+        with _cache_lock:
+            if _list_cache is None:
+                _list_cache = cache_from_env('list', default_size=256, default_ttl=30.0)
+    return _list_cache
+
+def set_list_cache(cache: Optional[Cache]) -> None:
+    """Replace the list cache (None rebuilds it from the environment on next use)."""
+    global _list_cache
+    _list_cache = cache
+
+def _list_key(version: int, *params) -> str:
+    """Build a list cache key from the normalized query parameters."""
+    return 'list:' + json.dumps([version] + [param or None for param in params], separators=(',', ':'))
+
+def _songs_changed() -> None:
+    """Invalidate every cached list page after a write."""
+    cache = get_list_cache()
+    _note_write(cache)
+    cache.bump('songs')
+
+def _validate_new_song(song_data: Dict) -> tuple:
+    """
+    Check the fields of a new song and return the INSERT parameters.
+    
     Raises:
         InvalidDataError: If required fields are missing or invalid
-        DatabaseError: If database operation fails
     """
     required_fields = ['id', 'name', 'artist', 'album', 'release_date', 'genre', 'duration_in_seconds']
     
@@ -118,34 +414,56 @@ def create_song(song_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
     if not isinstance(song_data['duration_in_seconds'], int) or song_data['duration_in_seconds'] <= 0:
         raise InvalidDataError("Duration must be a positive integer")
     
+    return tuple(song_data[field] for field in required_fields)
+
+_INSERT_SONG = sql.SQL("""
+    INSERT INTO songs (id, name, artist, album, release_date, genre, duration_in_seconds)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING {}
+""").format(_SONG_COLUMNS_SQL)
+_SELECT_SONG = sql.SQL("SELECT {} FROM songs WHERE id = %s").format(_SONG_COLUMNS_SQL)
+_SELECT_SONGS = sql.SQL("SELECT {} FROM songs WHERE id = ANY(%s)").format(_SONG_COLUMNS_SQL)
+_DELETE_SONG = sql.SQL("DELETE FROM songs WHERE id = %s RETURNING id")
+_SELECT_SONG_VERSION = "SELECT updated_at FROM songs WHERE id = %s"
+
+def create_song(song_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+    """
+    Create a new song in the database.
+    
+    Args:
+        song_data: Dictionary containing song information
+        
+    Returns:
+        Song object representing the created song
+        
+    Raises:
+        InvalidDataError: If required fields are missing or invalid
+        DatabaseError: If database operation fails
+    """
+    values = _validate_new_song(song_data)
+    
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                query = sql.SQL("""
-                    INSERT INTO songs (id, name, artist, album, release_date, genre, duration_in_seconds)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING *
-                """)
-                cur.execute(query, (
-                    song_data['id'],
-                    song_data['name'],
-                    song_data['artist'],
-                    song_data['album'],
-                    song_data['release_date'],
-                    song_data['genre'],
-                    song_data['duration_in_seconds']
-                ))
+        with _connection() as conn:
+            with conn.cursor() as cur:
+                statements.execute(cur, 'insert_song', _INSERT_SONG, values)
                 result = cur.fetchone()
-                return Song.from_db_row(result)
+                song = _song_from_row(result)
     except psycopg2.IntegrityError as e:
         raise InvalidDataError(f"Invalid data provided: {str(e)}")
     except Exception as e:
         raise DatabaseError(f"Failed to create song: {str(e)}")
+    
+    _evict_songs([song.id])
+    _songs_changed()
+    return song
 
 def get_song(song_id: str) -> Song:
     """
     Retrieve a song by its ID.
     
+    Reads through the song cache; create_song, update_song and delete_song
+    evict the songs they write.
+    
     Args:
         song_id: Unique identifier of the song
         
@@ -156,79 +474,224 @@ def get_song(song_id: str) -> Song:
         SongNotFoundError: If song with given ID doesn't exist
         DatabaseError: If database operation fails
     """
+    cache = get_song_cache()
+    song = _cached(cache, _song_key(song_id))
+    if song is not None:
+        return song
+    
+    version = _song_cache_version(cache)
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                query = sql.SQL("SELECT * FROM songs WHERE id = %s")
-                cur.execute(query, (song_id,))
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                statements.execute(cur, 'select_song', _SELECT_SONG, (song_id,))
                 result = cur.fetchone()
                 
                 if not result:
                     raise SongNotFoundError(f"Song with ID {song_id} not found")
                 
-                return Song.from_db_row(result)
+                song = _song_from_row(result)
     except SongNotFoundError:
         raise
     except Exception as e:
         raise DatabaseError(f"Failed to retrieve song: {str(e)}")
+    
+    _fill_song_cache(cache, version, [song])
+    return song
 
-def update_song(song_id: str, update_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+# Upper bound on ids per get_songs call; keeps the ANY() array and the response bounded
+MAX_BATCH_GET = 500
+
+@dataclass
+class SongBatch:
+    """Songs found by get_songs, in request order, plus the ids that do not exist."""
+    songs: List[Song]
+    missing: List[str]
+
+def _unique_ids(song_ids: Iterable[str]) -> List[str]:
     """
-    Update a song's information.
+    Validate and de-duplicate the ids of a batch get, keeping their order.
     
+    Raises:
+        InvalidDataError: If an id is not a string or more than MAX_BATCH_GET ids are given
+    """
+    ids = []
+    seen = set()
+    for song_id in song_ids:
+        if not isinstance(song_id, str) or not song_id:
+            raise InvalidDataError("Song IDs must be non-empty strings")
+        if song_id not in seen:
+            seen.add(song_id)
+            ids.append(song_id)
+    if len(ids) > MAX_BATCH_GET:
+        raise InvalidDataError(f"At most {MAX_BATCH_GET} song IDs can be fetched at once")
+    return ids
+
+def get_songs(song_ids: Iterable[str]) -> SongBatch:
+    """
+    Retrieve many songs by ID with at most one query.
+
+    Cached songs are served from the song cache; the rest are fetched with a
+    single `id = ANY(...)` query and cached. Duplicate ids are returned once.
+
     Args:
-        song_id: Unique identifier of the song to update
-        update_data: Dictionary containing fields to update
+        song_ids: Song IDs in the order the caller wants them back
+
+    Returns:
+        SongBatch: Found songs in request order and the ids that were not found
+
+    Raises:
+        InvalidDataError: If an id is not a string or more than MAX_BATCH_GET ids are given
+        DatabaseError: If database operation fails
+    """
+    ids = _unique_ids(song_ids)
+
+    cache = get_song_cache()
+    keys = {_song_key(song_id): song_id for song_id in ids}
+    found = {keys[key]: song for key, song in ({} if _read_from_primary.get() else cache.get_many(keys)).items()}
+    wanted = [song_id for song_id in ids if song_id not in found]
+
+    if wanted:
+        version = _song_cache_version(cache)
+        try:
+            with _read_connection() as conn:
+                with conn.cursor() as cur:
+                    statements.execute(cur, 'select_songs', _SELECT_SONGS, (wanted,))
+                    rows = cur.fetchall()
+        except Exception as e:
+            raise DatabaseError(f"Failed to retrieve songs: {str(e)}")
+
+        songs = _songs_from_rows(rows)
+        for song in songs:
+            found[song.id] = song
+        _fill_song_cache(cache, version, songs)
+
+    return SongBatch(
+        songs=[found[song_id] for song_id in ids if song_id in found],
+        missing=[song_id for song_id in ids if song_id not in found]
+    )
+
+def get_song_version(song_id: str) -> Optional[datetime]:
+    """
+    Return a song's updated_at timestamp without fetching the whole row.
+    
+    Used to answer conditional GETs; a cached song is used when available.
+    
+    Args:
+        song_id: Unique identifier of the song
         
     Returns:
-        Updated Song object
+        The song's updated_at timestamp
         
     Raises:
         SongNotFoundError: If song with given ID doesn't exist
-        InvalidDataError: If update data is invalid
         DatabaseError: If database operation fails
     """
-    # Validate update data
+    song = _cached(get_song_cache(), _song_key(song_id))
+    if song is not None:
+        return song.updated_at
+    
+    try:
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                statements.execute(cur, 'select_song_version', _SELECT_SONG_VERSION, (song_id,))
+                result = cur.fetchone()
+                
+                if not result:
+                    raise SongNotFoundError(f"Song with ID {song_id} not found")
+                
+                return result[0]
+    except SongNotFoundError:
+        raise
+    except Exception as e:
+        raise DatabaseError(f"Failed to retrieve song version: {str(e)}")
+
+# Columns update_song may set, in the order they appear in the SET clause
+UPDATABLE_COLUMNS = ('name', 'artist', 'album', 'release_date', 'genre', 'duration_in_seconds')
+
+@lru_cache(maxsize=None)
+def _update_sql(columns: Tuple[str, ...]) -> sql.Composed:
+    """UPDATE statement setting columns (a subset of UPDATABLE_COLUMNS), composed once per set."""
+    set_clauses = [sql.SQL("{} = %s").format(sql.Identifier(column)) for column in columns]
+    return sql.SQL("""
+        UPDATE songs
+        SET {}
+        WHERE id = %s
+        RETURNING {}
+    """).format(sql.SQL(', ').join(set_clauses), _SONG_COLUMNS_SQL)
+
+def _update_query(update_data: Dict) -> Tuple[tuple, sql.Composed, list]:
+    """
+    Validate update data and build the UPDATE statement and its parameters.
+    
+    The statement depends only on which columns are set, so it is composed
+    once per set of columns; the returned shape key identifies it.
+    The song id is the final parameter and is left for the caller to append.
+    
+    Returns:
+        Tuple of (shape key, statement, parameters)
+    
+    Raises:
+        InvalidDataError: If update data is invalid
+    """
     if not update_data:
         raise InvalidDataError("No update data provided")
     
+    unknown = [key for key in update_data if key not in UPDATABLE_COLUMNS]
+    if unknown:
+        raise InvalidDataError(
+            f"Cannot update {', '.join(map(repr, unknown))}; expected one of: {', '.join(UPDATABLE_COLUMNS)}"
+        )
+    
     if 'duration_in_seconds' in update_data and (
         not isinstance(update_data['duration_in_seconds'], int) or 
         update_data['duration_in_seconds'] <= 0
     ):
         raise InvalidDataError("Duration must be a positive integer")
     
+    columns = tuple(column for column in UPDATABLE_COLUMNS if column in update_data)
+    values = [update_data[column] for column in columns]
+    return ('update_song', columns), _update_sql(columns), values
+
+def update_song(song_id: str, update_data: Dict[str, Union[str, int, datetime.date]]) -> Song:
+    """
+    Update a song's information.
+    
+    Args:
+        song_id: Unique identifier of the song to update
+        update_data: Dictionary containing fields to update
+        
+    Returns:
+        Updated Song object
+        
+    Raises:
+        SongNotFoundError: If song with given ID doesn't exist
+        InvalidDataError: If update data is invalid
+        DatabaseError: If database operation fails
+    """
+    shape, query, values = _update_query(update_data)
+    values.append(song_id)
+    
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                # Build dynamic update query
-                set_clauses = []
-                values = []
-                for key, value in update_data.items():
-                    set_clauses.append(sql.SQL("{} = %s").format(sql.Identifier(key)))
-                    values.append(value)
-                
-                query = sql.SQL("""
-                    UPDATE songs
-                    SET {}
-                    WHERE id = %s
-                    RETURNING *
-                """).format(sql.SQL(', ').join(set_clauses))
-                
-                values.append(song_id)
-                cur.execute(query, values)
+        with _connection() as conn:
+            with conn.cursor() as cur:
+                statements.execute(cur, shape, query, values)
                 result = cur.fetchone()
                 
                 if not result:
                     raise SongNotFoundError(f"Song with ID {song_id} not found")
                 
-                return Song.from_db_row(result)
+                song = _song_from_row(result)
     except SongNotFoundError:
+        get_song_cache().delete(_song_key(song_id))
         raise  # Re-raise SongNotFoundError without wrapping
     except psycopg2.IntegrityError as e:
         raise InvalidDataError(f"Invalid update data: {str(e)}")
     except Exception as e:
         raise DatabaseError(f"Failed to update song: {str(e)}")
+    
+    _evict_songs([song_id])
+    _songs_changed()
+    return song
 
 def delete_song(song_id: str) -> bool:
     """
@@ -244,62 +707,749 @@ def delete_song(song_id: str) -> bool:
         DatabaseError: If database operation fails
     """
     try:
-        with get_db_connection() as conn:
+        with _connection() as conn:
             with conn.cursor() as cur:
-                query = sql.SQL("DELETE FROM songs WHERE id = %s RETURNING id")
-                cur.execute(query, (song_id,))
+                statements.execute(cur, 'delete_song', _DELETE_SONG, (song_id,))
                 result = cur.fetchone()
-                return bool(result)
     except Exception as e:
         raise DatabaseError(f"Failed to delete song: {str(e)}")
+    finally:
+        _evict_songs([song_id])
+    
+    if result:
+        _songs_changed()
+    return bool(result)
+
+def _filter_conditions(has_genre: bool, has_artist: bool) -> List[sql.Composable]:
+    """WHERE conditions for the filters in use, in the order _filter_params gives their values."""
+    conditions = []
+    if has_genre:
+        conditions.append(sql.SQL("genre = %s"))
+    if has_artist:
+        conditions.append(sql.SQL("artist = %s"))
+    return conditions
+
+def _filter_params(genre: Optional[str], artist: Optional[str]) -> list:
+    """Values for the conditions from _filter_conditions."""
+    return [value for value in (genre, artist) if value]
+
+# Sortable columns; each has a (column, id) index in infrastructure/schema.sql,
+# so every ordering can be served by an index scan instead of a sort
+SORT_COLUMNS = ('name', 'artist', 'album', 'release_date', 'genre')
+SORT_ORDERS = ('asc', 'desc')
+
+def _validate_sort(sort: str, order: str) -> None:
+    """
+    Check sort and order against the whitelist.
+    
+    Raises:
+        InvalidDataError: If either value is not allowed
+    """
+    if sort not in SORT_COLUMNS:
+        raise InvalidDataError(f"Cannot sort by '{sort}'; expected one of: {', '.join(SORT_COLUMNS)}")
+    if order not in SORT_ORDERS:
+        raise InvalidDataError("Sort order must be 'asc' or 'desc'")
+
+def _order_by(sort: str, order: str) -> sql.Composed:
+    """ORDER BY clause for a validated sort, with id as the tie-breaker."""
+    direction = sql.SQL("DESC" if order == 'desc' else "ASC")
+    return sql.SQL("ORDER BY {column} {direction}, id {direction}").format(
+        column=sql.Identifier(sort),
+        direction=direction
+    )
+
+@lru_cache(maxsize=None)
+def _list_sql(has_genre: bool, has_artist: bool, sort: str, order: str) -> sql.Composed:
+    """Offset-paginated list query for one shape (filters in use and validated sort), composed once."""
+    query = sql.SQL("SELECT {} FROM songs").format(_SONG_COLUMNS_SQL)
+    conditions = _filter_conditions(has_genre, has_artist)
+    
+    if conditions:
+        query = sql.SQL("{} WHERE {}").format(
+            query,
+            sql.SQL(" AND ").join(conditions)
+        )
+    
+    return sql.SQL("{} {} LIMIT %s OFFSET %s").format(query, _order_by(sort, order))
+
+def _list_query(limit, offset, genre, artist, sort, order) -> Tuple[tuple, sql.Composed, list]:
+    """Build the offset-paginated list query and its parameters, with the query's shape key."""
+    shape = ('list_songs', bool(genre), bool(artist), sort, order)
+    params = _filter_params(genre, artist)
+    params.extend([limit, offset])
+    return shape, _list_sql(*shape[1:]), params
 
 def list_songs(
     limit: int = 100,
     offset: int = 0,
     genre: Optional[str] = None,
-    artist: Optional[str] = None
+    artist: Optional[str] = None,
+    sort: str = 'name',
+    order: str = 'asc'
 ) -> List[Song]:
     """
     List songs with optional filtering.
     
+    Offset pagination is kept for backward compatibility; deep pages get
+    slower linearly, so new callers should use list_songs_page instead.
+    
     Args:
         limit: Maximum number of songs to return
         offset: Number of songs to skip
         genre: Filter by genre
         artist: Filter by artist
+        sort: Column to sort by (one of SORT_COLUMNS)
+        order: 'asc' or 'desc'
         
     Returns:
         List of Song objects
         
     Raises:
+        InvalidDataError: If the sort or order is not allowed
+        DatabaseError: If database operation fails
+    """
+    _validate_sort(sort, order)
+    
+    cache = get_list_cache()
+    version = cache.version('songs')
+    if version is not None:
+        key = _list_key(version, 'offset', genre, artist, sort, order, limit, offset)
+        songs = _cached(cache, key)
+        if songs is not None:
+            return songs
+    
+    try:
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                shape, query, params = _list_query(limit, offset, genre, artist, sort, order)
+                statements.execute(cur, shape, query, params)
+                results = cur.fetchall()
+                songs = _songs_from_rows(results)
+    except Exception as e:
+        raise DatabaseError(f"Failed to list songs: {str(e)}")
+    
+    if version is not None and _may_fill(cache):
+        cache.set(key, songs)
+    return songs
+
+@dataclass
+class SongPage:
+    """One page of songs plus the token for fetching the next page."""
+    songs: List[Song]
+    next_cursor: Optional[str] = None
+
+def _encode_token(values: list) -> str:
+    """Encode a keyset position as an opaque URL-safe token."""
+    payload = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_token(token: str, types: tuple) -> list:
+    """
+    Decode a token from _encode_token, checking each value's type.
+    
+    Raises:
+        InvalidDataError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if len(values) != len(types) or not all(isinstance(v, t) for v, t in zip(values, types)):
+            raise ValueError("unexpected cursor contents")
+        return values
+    except Exception:
+        raise InvalidDataError("Invalid pagination cursor")
+
+def encode_cursor(song: Song, sort: str = 'name', order: str = 'asc') -> str:
+    """Encode the (sort value, id) position of a song as an opaque continuation token."""
+    value = getattr(song, sort)
+    if isinstance(value, date):
+        value = value.isoformat()
+    return _encode_token([sort, order, value, song.id])
+
+def decode_cursor(cursor: str, sort: str = 'name', order: str = 'asc') -> Tuple[Union[str, date], str]:
+    """
+    Decode a continuation token produced by encode_cursor.
+    
+    Returns:
+        Tuple of (sort column value, song id)
+    
+    Raises:
+        InvalidDataError: If the token is malformed or was issued for a different sort
+    """
+    token_sort, token_order, value, song_id = _decode_token(cursor, (str, str, str, str))
+    if (token_sort, token_order) != (sort, order):
+        raise InvalidDataError("Pagination cursor does not match the requested sort")
+    if sort == 'release_date':
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            raise InvalidDataError("Invalid pagination cursor")
+    return value, song_id
+
+@lru_cache(maxsize=None)
+def _page_sql(has_genre: bool, has_artist: bool, sort: str, order: str, seek: bool) -> sql.Composed:
+    """Keyset-paginated list query for one shape, composed once; seek adds the position condition."""
+    conditions = _filter_conditions(has_genre, has_artist)
+    
+    if seek:
+        # Row comparison matches the index order in both directions
+        conditions.append(sql.SQL("({}, id) {} (%s, %s)").format(
+            sql.Identifier(sort),
+            sql.SQL("<" if order == 'desc' else ">")
+        ))
+    
+    query = sql.SQL("SELECT {} FROM songs").format(_SONG_COLUMNS_SQL)
+    if conditions:
+        query = sql.SQL("{} WHERE {}").format(
+            query,
+            sql.SQL(" AND ").join(conditions)
+        )
+    
+    return sql.SQL("{} {} LIMIT %s").format(query, _order_by(sort, order))
+
+def _page_query(limit, position, genre, artist, sort, order) -> Tuple[tuple, sql.Composed, list]:
+    """Build the keyset-paginated list query (one row past limit) and its parameters, with its shape key."""
+    shape = ('list_songs_page', bool(genre), bool(artist), sort, order, bool(position))
+    params = _filter_params(genre, artist)
+    if position:
+        params.extend(position)
+    # Fetch one extra row to learn whether another page exists
+    params.append(limit + 1)
+    return shape, _page_sql(*shape[1:]), params
+
+def _song_page(results, limit: int, sort: str, order: str) -> SongPage:
+    """Build a SongPage from the rows of a _page_query."""
+    songs = _songs_from_rows(results[:limit])
+    next_cursor = encode_cursor(songs[-1], sort, order) if len(results) > limit else None
+    return SongPage(songs=songs, next_cursor=next_cursor)
+
+def list_songs_page(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    sort: str = 'name',
+    order: str = 'asc'
+) -> SongPage:
+    """
+    List songs with keyset pagination.
+    
+    Seeks directly to the position after the cursor on the (sort column, id)
+    index, so every page costs the same regardless of how deep it is.
+    
+    Args:
+        limit: Maximum number of songs to return
+        cursor: Continuation token from a previous page, or None for the first page
+        genre: Filter by genre
+        artist: Filter by artist
+        sort: Column to sort by (one of SORT_COLUMNS)
+        order: 'asc' or 'desc'
+        
+    Returns:
+        SongPage with the songs and the token for the next page
+        (None when there are no more songs)
+        
+    Raises:
+        InvalidDataError: If the cursor, limit, sort or order is invalid
+        DatabaseError: If database operation fails
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise InvalidDataError("Limit must be a positive integer")
+    _validate_sort(sort, order)
+    
+    position = decode_cursor(cursor, sort, order) if cursor else None
+    
+    cache = get_list_cache()
+    version = cache.version('songs')
+    if version is not None:
+        key = _list_key(version, 'keyset', genre, artist, sort, order, limit, cursor)
+        page = _cached(cache, key)
+        if page is not None:
+            return page
+    
+    try:
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                shape, query, params = _page_query(limit, position, genre, artist, sort, order)
+                statements.execute(cur, shape, query, params)
+                page = _song_page(cur.fetchall(), limit, sort, order)
+    except Exception as e:
+        raise DatabaseError(f"Failed to list songs: {str(e)}")
+    
+    if version is not None and _may_fill(cache):
+        cache.set(key, page)
+    return page
+
+# Rows fetched per round trip by export_songs
+EXPORT_BATCH_SIZE = 1000
+
+@lru_cache(maxsize=None)
+def _export_sql(has_genre: bool, has_artist: bool, sort: str, order: str) -> sql.Composed:
+    """Unpaginated list query for export_songs, composed once per shape."""
+    query = sql.SQL("SELECT {} FROM songs").format(_SONG_COLUMNS_SQL)
+    conditions = _filter_conditions(has_genre, has_artist)
+    
+    if conditions:
+        query = sql.SQL("{} WHERE {}").format(
+            query,
+            sql.SQL(" AND ").join(conditions)
+        )
+    
+    return sql.SQL("{} {}").format(query, _order_by(sort, order))
+
+def export_songs(
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    sort: str = 'name',
+    order: str = 'asc',
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Song]:
+    """
+    Stream every song matching the filters, in sort order.
+    
+    Rows are read through a named (server-side) cursor, batch_size at a
+    time, so memory stays constant however large the catalog is and the
+    whole export costs one query instead of a query per page. The iterator
+    holds a pooled connection (the replica's, when configured) until it is
+    exhausted or closed. The caches are not used.
+    
+    Args:
+        genre: Filter by genre
+        artist: Filter by artist
+        sort: Column to sort by (one of SORT_COLUMNS)
+        order: 'asc' or 'desc'
+        batch_size: Rows fetched per round trip
+        
+    Returns:
+        Iterator of Song objects
+        
+    Raises:
+        InvalidDataError: If the sort, order or batch size is invalid (raised
+            immediately)
+        DatabaseError: If database operation fails (raised while iterating)
+    """
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise InvalidDataError("Batch size must be a positive integer")
+    _validate_sort(sort, order)
+    
+    query = _export_sql(bool(genre), bool(artist), sort, order)
+    return _export_rows(query, _filter_params(genre, artist), batch_size)
+
+def _export_rows(query: sql.Composed, params: list, batch_size: int) -> Iterator[Song]:
+    try:
+        with _read_connection() as conn:
+            # Server-side cursors only live inside the transaction, which ends with the export
+            with conn.cursor(name='export_songs') as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from _songs_from_rows(rows)
+    except Exception as e:
+        raise DatabaseError(f"Failed to export songs: {str(e)}")
+
+# Whether pg_trgm is installed; looked up once per process
+_trigram_support: Optional[bool] = None
+
+def _has_trigram_support(cur) -> bool:
+    global _trigram_support
+    if _trigram_support is None:
+        cur.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        _trigram_support = bool(cur.fetchone()[0])
+    return _trigram_support
+
+@lru_cache(maxsize=None)
+def _search_sql(trigram: bool, seek: bool) -> sql.Composed:
+    """Ranked search query, composed once per shape (pg_trgm matching, seeking past a position)."""
+    if trigram:
+        score = sql.SQL("""
+            ts_rank(search_vector, query) + greatest(
+                word_similarity(%(text)s, name),
+                word_similarity(%(text)s, artist),
+                word_similarity(%(text)s, album)
+            )
+        """)
+        match = sql.SQL("""
+            search_vector @@ query
+            OR %(text)s <%% name OR %(text)s <%% artist OR %(text)s <%% album
+        """)
+    else:
+        score = sql.SQL("ts_rank(search_vector, query)")
+        match = sql.SQL("search_vector @@ query")
+    
+    seek_clause = sql.SQL("")
+    if seek:
+        seek_clause = sql.SQL("WHERE score < %(score)s OR (score = %(score)s AND id > %(id)s)")
+    
+    return sql.SQL("""
+        SELECT * FROM (
+            SELECT {columns}, ({score})::float8 AS score
+            FROM songs, to_tsquery('simple', %(tsquery)s) AS query
+            WHERE {match}
+        ) ranked
+        {seek}
+        ORDER BY score DESC, id
+        LIMIT %(limit)s
+    """).format(columns=_SONG_COLUMNS_SQL, score=score, match=match, seek=seek_clause)
+
+def _prefix_tsquery(text: str) -> str:
+    """Turn free text into a tsquery matching every word as a prefix."""
+    return ' & '.join(f"{term}:*" for term in re.findall(r'\w+', text.lower()))
+
+def search_songs(
+    query: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> SongPage:
+    """
+    Search songs by name, artist, album and genre.
+    
+    Matches every word of the query as a prefix against the search_vector
+    full-text index. Where pg_trgm is installed, songs whose name, artist
+    or album loosely resemble the query (typos, partial words) match too.
+    Results are ranked best first and paged with a keyset on (score, id).
+    
+    Args:
+        query: Free-text search terms
+        limit: Maximum number of songs to return
+        cursor: Continuation token from a previous page of the same search
+        
+    Returns:
+        SongPage with the ranked songs and the token for the next page
+        
+    Raises:
+        InvalidDataError: If the query, cursor or limit is invalid
+        DatabaseError: If database operation fails
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise InvalidDataError("Limit must be a positive integer")
+    text = (query or '').strip()
+    tsquery = _prefix_tsquery(text)
+    if not tsquery:
+        raise InvalidDataError("Search query must contain at least one word")
+    
+    position = _decode_token(cursor, ((int, float), str)) if cursor else None
+    
+    cache = get_list_cache()
+    version = cache.version('songs')
+    if version is not None:
+        key = _list_key(version, 'search', text, limit, cursor)
+        page = _cached(cache, key)
+        if page is not None:
+            return page
+    
+    try:
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                params = {'tsquery': tsquery, 'text': text, 'limit': limit + 1}
+                if position:
+                    params['score'], params['id'] = position
+                shape = ('search_songs', _has_trigram_support(cur), bool(position))
+                statements.execute(cur, shape, _search_sql(*shape[1:]), params)
+                results = cur.fetchall()
+                # Rows are SONG_COLUMNS followed by the score
+                songs = _songs_from_rows(row[:-1] for row in results[:limit])
+                next_cursor = None
+                if len(results) > limit:
+                    last = results[limit - 1]
+                    next_cursor = _encode_token([last[-1], last[0]])
+                page = SongPage(songs=songs, next_cursor=next_cursor)
+    except Exception as e:
+        raise DatabaseError(f"Failed to search songs: {str(e)}")
+    
+    if version is not None and _may_fill(cache):
+        cache.set(key, page)
+    return page
+
+# Dimensions maintained in the song_stats rollup
+STATS_DIMENSIONS = ('genre', 'artist', 'release_year')
+
+@dataclass
+class StatsBucket:
+    """Song count and duration aggregates for one value of a dimension."""
+    value: Optional[Union[str, int]]
+    song_count: int
+    total_duration: int
+    average_duration: float
+
+@dataclass
+class CatalogStats:
+    """Catalog totals plus per-genre, per-artist and per-release-year buckets."""
+    total: StatsBucket
+    by_genre: List[StatsBucket]
+    by_artist: List[StatsBucket]
+    by_release_year: List[StatsBucket]
+
+def _stats_bucket(value, song_count: int, total_duration: int) -> StatsBucket:
+    average = round(total_duration / song_count, 2) if song_count else 0.0
+    return StatsBucket(value, song_count, total_duration, average)
+
+# The rollup has no catalog-wide row (every write would contend on it); the
+# totals are the sum of the genre buckets, a handful of rows
+_SELECT_STATS = """
+    SELECT 'all', '', coalesce(sum(song_count), 0)::bigint, coalesce(sum(total_duration), 0)::bigint
+    FROM song_stats
+    WHERE dimension = 'genre'
+    UNION ALL
+    SELECT dimension, value, song_count, total_duration
+    FROM song_stats
+    WHERE dimension = ANY(%s)
+    ORDER BY 1, 3 DESC, 2
+"""
+
+def get_stats(dimension: Optional[str] = None) -> CatalogStats:
+    """
+    Return catalog statistics from the song_stats rollup.
+
+    The rollup is maintained by triggers on songs, so this reads a few rows
+    per bucket instead of aggregating the songs table. Buckets are ordered
+    by song count (descending), then value.
+
+    Args:
+        dimension: Only return buckets for this dimension (one of STATS_DIMENSIONS);
+            the other lists are left empty
+
+    Returns:
+        CatalogStats: Totals and per-dimension buckets
+
+    Raises:
+        InvalidDataError: If the dimension is not supported
         DatabaseError: If database operation fails
     """
+    if dimension is not None and dimension not in STATS_DIMENSIONS:
+        raise InvalidDataError(
+            f"Unsupported stats dimension '{dimension}'; expected one of: {', '.join(STATS_DIMENSIONS)}"
+        )
+
+    cache = get_list_cache()
+    version = cache.version('songs')
+    if version is not None:
+        key = _list_key(version, 'stats', dimension)
+        stats = _cached(cache, key)
+        if stats is not None:
+            return stats
+
+    dimensions = [dimension] if dimension else list(STATS_DIMENSIONS)
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                query = sql.SQL("SELECT * FROM songs")
-                conditions = []
-                params = []
+        with _read_connection() as conn:
+            with conn.cursor() as cur:
+                statements.execute(cur, 'select_stats', _SELECT_STATS, (dimensions,))
+                rows = cur.fetchall()
+    except Exception as e:
+        raise DatabaseError(f"Failed to retrieve stats: {str(e)}")
+
+    buckets = {name: [] for name in STATS_DIMENSIONS}
+    total = _stats_bucket(None, 0, 0)
+    for name, value, song_count, total_duration in rows:
+        if name == 'all':
+            total = _stats_bucket(None, song_count, total_duration)
+        else:
+            buckets[name].append(
+                _stats_bucket(int(value) if name == 'release_year' else value, song_count, total_duration)
+            )
+    stats = CatalogStats(
+        total=total,
+        by_genre=buckets['genre'],
+        by_artist=buckets['artist'],
+        by_release_year=buckets['release_year']
+    )
+
+    if version is not None and _may_fill(cache):
+        cache.set(key, stats)
+    return stats
+
+# Column order used by the bulk COPY path; matches the songs table
+_BULK_COLUMNS = ('id', 'name', 'artist', 'album', 'release_date', 'genre', 'duration_in_seconds')
+
+# VARCHAR limits from infrastructure/schema.sql
+_MAX_LENGTHS = {'id': 50, 'name': 255, 'artist': 255, 'album': 255, 'genre': 50}
+
+@dataclass
+class RowError:
+    """A row rejected by bulk_upsert_songs."""
+    index: int
+    id: Optional[str]
+    error: str
+
+@dataclass
+class BulkUpsertResult:
+    """Outcome of a bulk_upsert_songs call."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: List[RowError] = None
+
+    def __post_init__(self):
+        if self.errors is None:
+            self.errors = []
+
+def _validate_bulk_row(row) -> tuple:
+    """
+    Validate one bulk row and return its values in _BULK_COLUMNS order.
+    
+    Checks everything the database would otherwise reject, so one bad row
+    cannot abort the COPY for the whole batch.
+    
+    Raises:
+        InvalidDataError: If the row is invalid
+    """
+    if not isinstance(row, dict):
+        raise InvalidDataError("Row must be an object")
+    
+    missing_fields = [field for field in _BULK_COLUMNS if row.get(field) is None]
+    if missing_fields:
+        raise InvalidDataError(f"Missing required fields: {', '.join(missing_fields)}")
+    
+    for field, max_length in _MAX_LENGTHS.items():
+        value = row[field]
+        if not isinstance(value, str):
+            raise InvalidDataError(f"Field '{field}' must be a string")
+        if len(value) > max_length:
+            raise InvalidDataError(f"Field '{field}' exceeds {max_length} characters")
+    
+    for field in ('id', 'name', 'artist'):
+        if not row[field].strip():
+            raise InvalidDataError(f"Field '{field}' cannot be empty")
+    
+    duration = row['duration_in_seconds']
+    if not isinstance(duration, int) or isinstance(duration, bool) or duration <= 0:
+        raise InvalidDataError("Duration must be a positive integer")
+    
+    release_date = row['release_date']
+    if isinstance(release_date, datetime):
+        release_date = release_date.date()
+    elif isinstance(release_date, str):
+        try:
+            release_date = date.fromisoformat(release_date)
+        except ValueError:
+            raise InvalidDataError("Release date must be in YYYY-MM-DD format")
+    elif not isinstance(release_date, date):
+        raise InvalidDataError("Release date must be a date")
+    
+    return (
+        row['id'],
+        row['name'],
+        row['artist'],
+        row['album'],
+        release_date.isoformat(),
+        row['genre'],
+        duration
+    )
+
+def bulk_upsert_songs(songs: Iterable[Dict], chunk_size: int = 10000) -> BulkUpsertResult:
+    """
+    Insert or update many songs in a single transaction.
+    
+    Rows are validated in one pass and streamed into a temporary staging
+    table with COPY in chunks of chunk_size rows, then merged into songs
+    with one INSERT ... ON CONFLICT statement. Invalid rows are skipped and
+    reported; rows identical to what is already stored are left untouched.
+    When the same id appears more than once, the last row wins.
+    
+    Args:
+        songs: Iterable of song dictionaries (same fields as create_song)
+        chunk_size: Number of rows buffered in memory per COPY; besides
+            that, only the ids of updated songs are held (to invalidate
+            their cache entries)
+        
+    Returns:
+        BulkUpsertResult with insert/update counts and per-row errors
+        
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    result = BulkUpsertResult()
+    columns = sql.SQL(', ').join(sql.Identifier(column) for column in _BULK_COLUMNS)
+    
+    try:
+        with _connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE songs_staging (
+                        seq INTEGER NOT NULL,
+                        id VARCHAR(50) NOT NULL,
+                        name VARCHAR(255) NOT NULL,
+                        artist VARCHAR(255) NOT NULL,
+                        album VARCHAR(255) NOT NULL,
+                        release_date DATE NOT NULL,
+                        genre VARCHAR(50) NOT NULL,
+                        duration_in_seconds INTEGER NOT NULL
+                    ) ON COMMIT DROP
+                """)
+                copy_statement = sql.SQL(
+                    "COPY songs_staging (seq, {}) FROM STDIN WITH (FORMAT csv)"
+                ).format(columns).as_string(conn)
                 
-                if genre:
-                    conditions.append(sql.SQL("genre = %s"))
-                    params.append(genre)
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                staged = 0
+                buffered = 0
                 
-                if artist:
-                    conditions.append(sql.SQL("artist = %s"))
-                    params.append(artist)
+                for index, row in enumerate(songs):
+                    try:
+                        values = _validate_bulk_row(row)
+                    except InvalidDataError as e:
+                        song_id = row.get('id') if isinstance(row, dict) else None
+                        result.errors.append(RowError(index=index, id=song_id, error=str(e)))
+                        continue
+                    
+                    writer.writerow((index,) + values)
+                    buffered += 1
+                    if buffered >= chunk_size:
+                        buffer.seek(0)
+                        cur.copy_expert(copy_statement, buffer)
+                        staged += buffered
+                        buffered = 0
+                        buffer.seek(0)
+                        buffer.truncate()
                 
-                if conditions:
-                    query = sql.SQL("{} WHERE {}").format(
-                        query,
-                        sql.SQL(" AND ").join(conditions)
-                    )
+                if buffered:
+                    buffer.seek(0)
+                    cur.copy_expert(copy_statement, buffer)
+                    staged += buffered
                 
-                query = sql.SQL("{} ORDER BY name LIMIT %s OFFSET %s").format(query)
-                params.extend([limit, offset])
+                if not staged:
+                    return result
                 
-                cur.execute(query, params)
-                results = cur.fetchall()
-                return [Song.from_db_row(result) for result in results]
+                cur.execute(sql.SQL("""
+                    WITH merged AS (
+                        INSERT INTO songs ({columns})
+                        SELECT DISTINCT ON (id) {columns}
+                        FROM songs_staging
+                        ORDER BY id, seq DESC
+                        ON CONFLICT (id) DO UPDATE SET
+                            name = EXCLUDED.name,
+                            artist = EXCLUDED.artist,
+                            album = EXCLUDED.album,
+                            release_date = EXCLUDED.release_date,
+                            genre = EXCLUDED.genre,
+                            duration_in_seconds = EXCLUDED.duration_in_seconds
+                        WHERE (songs.name, songs.artist, songs.album, songs.release_date,
+                               songs.genre, songs.duration_in_seconds)
+                            IS DISTINCT FROM
+                              (EXCLUDED.name, EXCLUDED.artist, EXCLUDED.album, EXCLUDED.release_date,
+                               EXCLUDED.genre, EXCLUDED.duration_in_seconds)
+                        RETURNING id, (xmax = 0) AS inserted
+                    )
+                    SELECT
+                        count(*) FILTER (WHERE inserted),
+                        count(*) FILTER (WHERE NOT inserted),
+                        (SELECT count(DISTINCT id) FROM songs_staging),
+                        coalesce(array_agg(id) FILTER (WHERE NOT inserted), '{{}}')
+                    FROM merged
+                """).format(columns=columns))
+                inserted, updated, distinct, updated_ids = cur.fetchone()
+                
+                result.inserted = inserted
+                result.updated = updated
+                result.unchanged = distinct - inserted - updated
     except Exception as e:
-        raise DatabaseError(f"Failed to list songs: {str(e)}") 
\ No newline at end of file
+        raise DatabaseError(f"Failed to bulk upsert songs: {str(e)}")
+    
+    if updated_ids:
+        # Only changed rows can be cached with stale values
+        _evict_songs(updated_ids)
+    if result.inserted or result.updated:
+        _songs_changed()
+    return result
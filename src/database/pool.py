@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Connection pool for the OurChants database layer.
+Keeps PostgreSQL connections open between operations (and between warm
+Lambda invocations) instead of paying a fresh handshake for every call.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolError(Exception):
+    """Base exception for connection pool failures."""
+    pass
+
+
+class PoolExhaustedError(PoolError):
+    """Raised when no connection becomes available within the checkout timeout."""
+    pass
+
+
+class PoolClosedError(PoolError):
+    """Raised when a connection is requested from a closed pool."""
+    pass
+
+
+class _PooledConnection:
+    """Bookkeeping for a single connection owned by the pool."""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Connections are handed out LIFO so a quiet process keeps reusing the same
+    warm connection while the rest age out. There is no background thread
+    (a frozen Lambda container could not run one anyway); expired and idle
+    connections are reaped whenever a connection is checked out or returned.
+
+    Args:
+        connect: Callable returning a new psycopg2 connection
+        min_size: Number of idle connections kept open by the reaper
+        max_size: Maximum number of connections open at once
+        max_age: Seconds after which a connection is closed instead of reused
+        max_idle: Seconds a connection may sit idle before it is reaped
+        health_check_after: Idle seconds after which a checkout pings the
+            server before handing the connection out
+        checkout_timeout: Seconds to wait for a free connection when the
+            pool is at max_size
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], 'extensions.connection'],
+        min_size: int = 0,
+        max_size: int = 10,
+        max_age: Optional[float] = 3600.0,
+        max_idle: Optional[float] = 600.0,
+        health_check_after: float = 30.0,
+        checkout_timeout: float = 10.0
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+    @property
+    def size(self) -> int:
+        """Number of connections currently owned by the pool."""
+        with self._cond:
+            return len(self._idle) + len(self._in_use) + self._opening
+
+    @property
+    def idle_count(self) -> int:
+        """Number of connections waiting in the pool."""
+        with self._cond:
+            return len(self._idle)
+
+    def fill(self, count: Optional[int] = None) -> None:
+        """
+        Open connections until count (default min_size) connections are idle.
+
+        Stops early at max_size. Connections beyond min_size stay idle until
+        max_idle reaps them.
+        """
+        target = self.min_size if count is None else count
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= target:
+                    return
+                if len(self._idle) + len(self._in_use) + self._opening >= self.max_size:
+                    return
+                self._opening += 1
+            try:
+                entry = _PooledConnection(self._connect())
+            except BaseException:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._opening -= 1
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def getconn(self):
+        """
+        Check a connection out of the pool.
+
+        Returns:
+            An open psycopg2 connection in idle transaction state
+
+        Raises:
+            PoolExhaustedError: If max_size connections stay busy for longer
+                than checkout_timeout
+            PoolClosedError: If the pool has been closed
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            stale = []
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed")
+                    stale.extend(self._collect_expired())
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if len(self._in_use) + self._opening < self.max_size:
+                        self._opening += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No database connection available after {self.checkout_timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+
+            for old in stale:
+                self._close_quietly(old.conn)
+
+            if entry is None:
+                try:
+                    entry = _PooledConnection(self._connect())
+                except BaseException:
+                    # The slot is free again; wake a checkout waiting at max_size
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._opening -= 1
+                    self._in_use[id(entry.conn)] = entry
+                return entry.conn
+
+            if self._is_healthy(entry):
+                with self._cond:
+                    self._in_use[id(entry.conn)] = entry
+                return entry.conn
+
+            # Broken connection: drop it and try again with the next one
+            self._close_quietly(entry.conn)
+            with self._cond:
+                self._cond.notify()
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back first. Connections that are
+        closed, broken, past max_age, or explicitly discarded are closed
+        instead of being kept.
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            raise PoolError("Connection does not belong to this pool")
+
+        now = time.monotonic()
+        keep = not discard and not conn.closed and not self._closed
+        if keep and self.max_age is not None and now - entry.created_at >= self.max_age:
+            keep = False
+        if keep and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                keep = False
+
+        stale = []
+        with self._cond:
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+            stale.extend(self._collect_expired())
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+        for old in stale:
+            self._close_quietly(old.conn)
+
+    @contextmanager
+    def connection(self, conn=None):
+        """
+        Context manager yielding a pooled connection.
+
+        Commits on success, rolls back on error and always hands the
+        connection back to the pool. Connections that fail at the driver
+        level are discarded rather than reused.
+
+        Args:
+            conn: A connection already checked out with getconn(), for
+                callers that need to handle checkout failures separately
+        """
+        if conn is None:
+            conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+            if not conn.closed:
+                conn.commit()
+        except BaseException as e:
+            discard = conn.closed or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def reap(self) -> int:
+        """
+        Close idle connections past max_idle or max_age.
+
+        Returns:
+            Number of connections closed
+        """
+        with self._cond:
+            stale = self._collect_expired()
+        for old in stale:
+            self._close_quietly(old.conn)
+        return len(stale)
+
+    def close(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+    def _collect_expired(self) -> List[_PooledConnection]:
+        """Remove expired idle entries (caller holds the lock) and return them."""
+        now = time.monotonic()
+        keep, stale = [], []
+        # The oldest idle connections sit at the front of the list
+        spare = len(self._idle) - self.min_size
+        for entry in self._idle:
+            if self.max_age is not None and now - entry.created_at >= self.max_age:
+                stale.append(entry)
+            elif spare > 0 and self.max_idle is not None and now - entry.last_used >= self.max_idle:
+                stale.append(entry)
+                spare -= 1
+            else:
+                keep.append(entry)
+        if stale:
+            self._idle = keep
+        return stale
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        """Check a connection before handing it out."""
+        conn = entry.conn
+        if conn.closed:
+            return False
+        if self.max_age is not None and time.monotonic() - entry.created_at >= self.max_age:
+            return False
+        if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - entry.last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Slow-query log for the OurChants database layer.
+Statements executed through pooled connections that take longer than
+DB_SLOW_QUERY_MS are logged as one JSON line with the composed SQL (values
+stay as placeholders), the shape of its parameters and its duration. A
+sample of them (DB_SLOW_QUERY_EXPLAIN_RATE) also records the plan from
+EXPLAIN (ANALYZE, BUFFERS), run inside a savepoint that is rolled back so
+writes are not applied twice; plans show the sampled call's values in their
+filters. Prepared statements (src/database/statements.py) are logged with
+the SQL they were prepared from and explained through EXECUTE.
+scripts/slow_query_report.py summarizes the log.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+from typing import Any, Optional
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import cursor as _BaseCursor
+
+from src.database import statements
+
+logger = logging.getLogger(__name__)
+
+def _threshold(value: Optional[str]) -> Optional[float]:
+    """Seconds from a DB_SLOW_QUERY_MS value; None (disabled) when unset or negative."""
+    if value is None or value.strip() == '':
+        return None
+    milliseconds = float(value)
+    return None if milliseconds < 0 else milliseconds / 1000
+
+# Read once per process; None disables the log
+THRESHOLD = _threshold(os.getenv('DB_SLOW_QUERY_MS'))
+EXPLAIN_RATE = float(os.getenv('DB_SLOW_QUERY_EXPLAIN_RATE', '0.1'))
+
+# Statements worth explaining; COPY, DDL and utility commands are not
+_EXPLAINABLE = re.compile(r'^\s*(WITH|SELECT|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+
+def normalize(statement: str) -> str:
+    """Collapse whitespace so the same statement always logs the same text."""
+    return ' '.join(statement.split())
+
+def param_shape(params: Any) -> Any:
+    """
+    Describe parameters by type (and length for sequences) without their values.
+
+    Logs stay free of user data while still telling apart, say, a 5-id and a
+    500-id batch.
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: param_shape(value) for name, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_value_shape(value) for value in params]
+    return _value_shape(params)
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+def _statement_text(cur, query) -> str:
+    if isinstance(query, sql.Composable):
+        return query.as_string(cur.connection)
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    return query
+
+def _explain_once(explain_cur, options: str, query, params) -> Any:
+    statement = sql.SQL(f"EXPLAIN ({options}, FORMAT JSON) ") + (
+        query if isinstance(query, sql.Composable) else sql.SQL(query)
+    )
+    explain_cur.execute("SAVEPOINT slow_query_explain")
+    try:
+        explain_cur.execute(statement, params)
+        plan = explain_cur.fetchone()[0]
+    finally:
+        explain_cur.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+        explain_cur.execute("RELEASE SAVEPOINT slow_query_explain")
+    return plan[0] if isinstance(plan, list) and plan else plan
+
+def _explain(cur, query, params) -> Any:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) a statement on its connection and undo its effects.
+
+    Runs on a separate cursor so the caller's pending result is untouched.
+    Statements that cannot run a second time in the same transaction (an
+    INSERT of the row just inserted) fall back to the estimated plan.
+    """
+    # Plain cursor: the instrumented ones would time (and log) the EXPLAIN itself
+    with cur.connection.cursor(cursor_factory=_BaseCursor) as explain_cur:
+        try:
+            return _explain_once(explain_cur, 'ANALYZE, BUFFERS', query, params)
+        except psycopg2.Error:
+            return _explain_once(explain_cur, 'COSTS', query, params)
+
+def record(cur, query, params, duration: float) -> None:
+    """
+    Log a statement that took longer than THRESHOLD.
+
+    Called by the instrumented cursors after a successful execute. Failures
+    while explaining are logged in the record rather than raised.
+    """
+    prepared = statements.lookup(query)
+    if prepared is not None:
+        statement = prepared.text
+        logged_params = prepared.named(params)
+        # Prepared by now, so the plan comes from EXECUTE of the same statement
+        query = prepared.execute
+    else:
+        statement = _statement_text(cur, query)
+        logged_params = params
+    entry = {
+        'event': 'slow_query',
+        'statement': normalize(statement),
+        'params': param_shape(logged_params),
+        'duration_ms': round(duration * 1000, 3),
+        'rows': cur.rowcount,
+    }
+    connection = cur.connection
+    if (
+        EXPLAIN_RATE > 0
+        and random.random() < EXPLAIN_RATE
+        and not connection.autocommit
+        and _EXPLAINABLE.match(statement)
+    ):
+        try:
+            entry['plan'] = _explain(cur, query, params)
+        except Exception as e:
+            entry['plan_error'] = str(e)
+    logger.warning(json.dumps(entry, default=str, separators=(',', ':')))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Statement cache for the OurChants database layer.
+Composed SQL is rendered once per statement shape (the filters, sort or
+update columns it was built for) instead of on every call, and on pooled
+connections it runs as a server-side prepared statement, so PostgreSQL
+parses and plans each shape once per connection rather than per query.
+
+Prepared statements live in the server session. Connections made with
+PreparedConnection remember which ones they have prepared; the first use on
+a connection sends PREPARE and EXECUTE in the same round trip. Set
+DB_PREPARED_STATEMENTS=false behind a pooler that does not keep sessions
+(PgBouncer in transaction mode); statements then run as plain text.
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Set, Union
+
+import psycopg2
+from psycopg2 import extensions, sql
+
+ENABLED = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+# SQLSTATEs meaning the session's prepared statements no longer match what
+# the connection remembers: not found (the session was reset), already
+# exists (an earlier PREPARE succeeded but its EXECUTE failed), and a cached
+# plan whose result type changed after a schema change
+_STALE_STATEMENT_CODES = ('26000', '42P05', '0A000')
+
+_PLACEHOLDER = re.compile(r'%\((\w+)\)s|%s|%%')
+
+class PreparedConnection(extensions.connection):
+    """psycopg2 connection that tracks the statements prepared in its session."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: Set[str] = set()
+
+class Statement:
+    """
+    A rendered statement and its prepared form.
+
+    Attributes:
+        name: Server-side statement name
+        text: SQL with psycopg2 placeholders, as rendered from the composition
+        prepare: PREPARE followed by EXECUTE, for the first use on a connection
+        execute: EXECUTE with one placeholder per parameter
+        param_names: Parameter names in $n order for statements using
+            %(name)s placeholders, None for positional ones
+    """
+
+    __slots__ = ('name', 'text', 'prepare', 'execute', 'param_names')
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+
+        names: List[str] = []
+        positions = 0
+
+        def numbered(match) -> str:
+            nonlocal positions
+            if match.group(0) == '%%':
+                # Kept escaped: the PREPARE text is sent with parameters
+                return '%%'
+            if match.group(1) is None:
+                positions += 1
+                return f"${positions}"
+            if match.group(1) not in names:
+                names.append(match.group(1))
+            return f"${names.index(match.group(1)) + 1}"
+
+        body = _PLACEHOLDER.sub(numbered, text)
+        self.param_names = names if names else None
+        arity = len(names) if names else positions
+        self.execute = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * arity)})" if arity else '')
+        self.prepare = f"PREPARE {name} AS {body}; {self.execute}"
+
+    def args(self, params: Union[None, list, tuple, Dict[str, Any]]) -> list:
+        """EXECUTE arguments for the parameters the statement text was written for."""
+        if self.param_names is not None:
+            return [params[name] for name in self.param_names]
+        return list(params or ())
+
+    def named(self, args: list) -> Union[list, Dict[str, Any]]:
+        """Map EXECUTE arguments back to the parameters of the statement text."""
+        if self.param_names is not None:
+            return dict(zip(self.param_names, args))
+        return args
+
+# Statements by shape key and by server-side name; both only grow, and are
+# bounded by the whitelisted sorts, filters and columns the keys are built from
+_statements: Dict[Hashable, Statement] = {}
+_by_name: Dict[str, Statement] = {}
+_lock = threading.Lock()
+
+def statement(key: Hashable, query: Union[str, sql.Composable], context) -> Statement:
+    """
+    Return the statement for a shape, rendering query on first use.
+
+    Args:
+        key: Identifies the statement's shape; every query passed with the
+            same key must render to the same SQL
+        query: The composed (or plain) SQL
+        context: Connection or cursor used to render identifiers
+    """
+    found = _statements.get(key)
+    if found is not None:
+        return found
+    text = query.as_string(context) if isinstance(query, sql.Composable) else query
+    with _lock:
+        found = _statements.get(key)
+        if found is None:
+            found = Statement(f"ourchants_{len(_statements) + 1}", text)
+            _by_name[found.name] = found
+            _statements[key] = found
+    return found
+
+def lookup(query) -> Optional[Statement]:
+    """The statement a query sent by execute() runs, or None for other SQL."""
+    if not isinstance(query, str) or not query.startswith(('EXECUTE ', 'PREPARE ')):
+        return None
+    return _by_name.get(query.split(None, 2)[1])
+
+def _send(cur, found: Statement, args: list) -> None:
+    prepared = cur.connection.prepared
+    if found.name in prepared:
+        cur.execute(found.execute, args)
+        return
+    cur.execute(found.prepare, args)
+    prepared.add(found.name)
+
+def execute(cur, key: Hashable, query: Union[str, sql.Composable], params=None) -> None:
+    """
+    Execute a statement on cur, prepared server-side where the connection allows.
+
+    When the session has lost track of its statements (a reset session,
+    a failed first EXECUTE, a schema change) the statement is prepared again
+    and retried once, provided nothing else ran in the transaction yet;
+    otherwise the error is raised and the next operation starts clean.
+
+    Args:
+        cur: Cursor to execute on; results are fetched from it as usual
+        key: Shape key, see statement()
+        query: The composed (or plain) SQL for that shape
+        params: Parameters for the SQL's placeholders
+    """
+    conn = cur.connection
+    found = statement(key, query, conn)
+    if not ENABLED or not isinstance(conn, PreparedConnection):
+        cur.execute(found.text, params)
+        return
+
+    args = found.args(params)
+    idle = conn.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+    try:
+        _send(cur, found, args)
+    except psycopg2.Error as e:
+        if e.pgcode not in _STALE_STATEMENT_CODES:
+            raise
+        conn.prepared.clear()
+        if not idle:
+            raise
+        conn.rollback()
+        cur.execute("DEALLOCATE ALL")
+        _send(cur, found, args)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test suite for API endpoints exercised through the Lambda handler.
+"""
+
+import base64
+import gzip
+import json
+import time
+from datetime import date
+import pytest
+from dotenv import load_dotenv
+from src.api import api, compression
+from src.api.api import handler
+from src.database.operations import create_song, delete_song, get_pool
+
+@pytest.fixture
+def songs():
+    """Fixture providing a few songs stored in the database."""
+    load_dotenv()
+    songs = [
+        create_song({
+            'id': f'test-api-{i}',
+            'name': f'API Song {i}',
+            'artist': 'API Artist',
+            'album': 'API Album',
+            'release_date': date(2023, 1, 1),
+            'genre': 'API Genre',
+            'duration_in_seconds': 180 + i
+        })
+        for i in range(3)
+    ]
+    yield songs
+    for song in songs:
+        delete_song(song.id)
+
+def test_get_songs_by_ids(songs):
+    """Test GET /songs?ids= returns songs in request order and reports missing ids."""
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs',
+        'queryStringParameters': {'ids': 'test-api-2,test-api-missing,test-api-0'}
+    }, None)
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert [song['id'] for song in body['songs']] == ['test-api-2', 'test-api-0']
+    assert body['missing'] == ['test-api-missing']
+
+def test_post_batch_get(songs):
+    """Test POST /songs:batchGet with both accepted body shapes."""
+    for body in ({'ids': ['test-api-1', 'test-api-0']}, ['test-api-1', 'test-api-0']):
+        response = handler({
+            'httpMethod': 'POST',
+            'path': '/songs:batchGet',
+            'body': json.dumps(body)
+        }, None)
+        assert response['statusCode'] == 200
+        assert [song['id'] for song in json.loads(response['body'])['songs']] == ['test-api-1', 'test-api-0']
+
+    response = handler({
+        'httpMethod': 'POST',
+        'path': '/songs:batchGet',
+        'body': json.dumps({'ids': 'test-api-1'})
+    }, None)
+    assert response['statusCode'] == 400
+
+def test_get_stats(songs):
+    """Test GET /stats returns totals and per-dimension buckets."""
+    response = handler({'httpMethod': 'GET', 'path': '/stats'}, None)
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['total']['song_count'] >= 3
+    genre = next(bucket for bucket in body['by_genre'] if bucket['value'] == 'API Genre')
+    assert genre == {'value': 'API Genre', 'song_count': 3, 'total_duration': 543, 'average_duration': 181.0}
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/stats',
+        'queryStringParameters': {'dimension': 'decade'}
+    }, None)
+    assert response['statusCode'] == 400
+
+def test_writes_return_consistency_token(songs, monkeypatch):
+    """Test that a fresh token from a write pins the client's reads to the primary."""
+    response = handler({
+        'httpMethod': 'PUT',
+        'path': '/songs/test-api-0',
+        'body': json.dumps({'name': 'Renamed'})
+    }, None)
+    token = response['headers']['X-Consistency-Token']
+    assert api._needs_primary({'headers': {'x-consistency-token': token}})
+    
+    stale = str(int((time.time() - api.REPLICA_MAX_LAG - 1) * 1000))
+    assert not api._needs_primary({'headers': {'X-Consistency-Token': stale}})
+    assert not api._needs_primary({'headers': {'X-Consistency-Token': 'garbage'}})
+    assert not api._needs_primary({'headers': {}})
+    
+    pinned = []
+    monkeypatch.setattr(api, 'use_primary', lambda: _Recorder(pinned))
+    handler({
+        'httpMethod': 'GET',
+        'path': '/songs/test-api-0',
+        'headers': {'X-Consistency-Token': token}
+    }, None)
+    assert pinned == [True]
+
+class _Recorder:
+    """Context manager standing in for use_primary() that records its use."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __enter__(self):
+        self.calls.append(True)
+
+    def __exit__(self, *exc):
+        return False
+
+def test_export_songs(songs):
+    """Test GET /songs/export in both formats, with filters, through the Lambda handler."""
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs/export',
+        'queryStringParameters': {'genre': 'API Genre', 'order': 'desc'}
+    }, None)
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response['body'].splitlines()]
+    assert [song['id'] for song in lines] == ['test-api-2', 'test-api-1', 'test-api-0']
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs/export',
+        'queryStringParameters': {'format': 'csv', 'artist': 'API Artist'}
+    }, None)
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Disposition'] == 'attachment; filename="songs.csv"'
+    header, *rows = response['body'].splitlines()
+    assert header.startswith('id,name,artist')
+    assert [row.split(',')[0] for row in rows] == ['test-api-0', 'test-api-1', 'test-api-2']
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs/export',
+        'queryStringParameters': {'format': 'xml'}
+    }, None)
+    assert response['statusCode'] == 400
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs/export',
+        'queryStringParameters': {'genre': 'No Such Genre'}
+    }, None)
+    assert response['statusCode'] == 200
+    assert response['body'] == ''
+
+def test_export_songs_through_lambda_is_capped(songs, monkeypatch):
+    """Test that a joined export is compressed, and answered with 413 past the size cap."""
+    event = {
+        'httpMethod': 'GET',
+        'path': '/songs/export',
+        'headers': {'Accept-Encoding': 'gzip'},
+        'queryStringParameters': {'genre': 'API Genre'}
+    }
+    monkeypatch.setattr(compression, 'MIN_SIZE', 1)
+    response = handler(event, None)
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(base64.b64decode(response['body'])).decode('utf-8').splitlines()
+    assert len(lines) == 3
+
+    monkeypatch.setattr(api, 'LAMBDA_MAX_BODY_BYTES', 100)
+    response = handler(dict(event, headers={}), None)
+    assert response['statusCode'] == 413
+    assert 'streaming server' in json.loads(response['body'])['error']
+    # The abandoned export gave its pooled connection back
+    pool = get_pool()
+    assert pool.idle_count == pool.size
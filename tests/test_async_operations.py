@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test suite for the asyncio song operations and async connection pool.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date
+import psycopg2
+import pytest
+from dotenv import load_dotenv
+from src.database import async_operations as aops
+from src.database import async_pool
+from src.database import operations
+from src.database.async_pool import AsyncConnectionPool
+from src.database.cache import LocalKeyValueStore, SharedCache
+from src.database.operations import (
+    InvalidDataError,
+    Song,
+    SongNotFoundError,
+    delete_song,
+    list_songs_page
+)
+from src.database.pool import PoolExhaustedError
+
+@pytest.fixture
+def sample_song_data():
+    """Fixture providing sample song data for tests."""
+    load_dotenv()
+    return {
+        'id': 'test-async-1',
+        'name': 'Async Song',
+        'artist': 'Async Artist',
+        'album': 'Async Album',
+        'release_date': date(2023, 1, 1),
+        'genre': 'Async Genre',
+        'duration_in_seconds': 180
+    }
+
+def _run(coro):
+    """Run a coroutine on a fresh loop, closing the loop's pool afterwards."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aops.close_pool()
+    return asyncio.run(main())
+
+def test_crud(sample_song_data):
+    """Test create, get, update and delete through the async layer."""
+    async def scenario():
+        created = await aops.create_song(sample_song_data)
+        assert isinstance(created, Song)
+        assert (await aops.get_song(created.id)).name == 'Async Song'
+        updated = await aops.update_song(created.id, {'name': 'Renamed'})
+        assert updated.name == 'Renamed'
+        batch = await aops.get_songs([created.id, 'test-async-missing'])
+        assert [song.id for song in batch.songs] == [created.id]
+        assert batch.missing == ['test-async-missing']
+        assert await aops.delete_song(created.id)
+        assert not await aops.delete_song(created.id)
+        with pytest.raises(SongNotFoundError):
+            await aops.get_song(created.id)
+        with pytest.raises(SongNotFoundError):
+            await aops.update_song(created.id, {'name': 'Gone'})
+
+    try:
+        _run(scenario())
+    finally:
+        delete_song(sample_song_data['id'])
+
+def test_errors_match_sync_layer(sample_song_data):
+    """Test that validation and integrity errors raise the shared exception types."""
+    async def scenario():
+        invalid = dict(sample_song_data, duration_in_seconds=-1)
+        with pytest.raises(InvalidDataError):
+            await aops.create_song(invalid)
+        await aops.create_song(sample_song_data)
+        with pytest.raises(InvalidDataError):
+            await aops.create_song(sample_song_data)
+        # The pool keeps working after a failed statement
+        assert (await aops.get_song(sample_song_data['id'])).id == sample_song_data['id']
+
+    try:
+        _run(scenario())
+    finally:
+        delete_song(sample_song_data['id'])
+
+def test_list_songs_page_matches_sync():
+    """Test that async keyset pages and cursors agree with the synchronous layer."""
+    first = list_songs_page(limit=3)
+
+    async def scenario():
+        page = await aops.list_songs_page(limit=3)
+        following = await aops.list_songs_page(limit=3, cursor=page.next_cursor)
+        listed = await aops.list_songs(limit=3, offset=3)
+        return page, following, listed
+
+    page, following, listed = _run(scenario())
+    assert [song.id for song in page.songs] == [song.id for song in first.songs]
+    assert [song.id for song in following.songs] == [song.id for song in list_songs_page(limit=3, cursor=first.next_cursor).songs]
+    assert [song.id for song in listed] == [song.id for song in following.songs]
+
+def test_queries_run_concurrently():
+    """Test that queries on one event loop overlap instead of running back to back."""
+    async def scenario():
+        pool = AsyncConnectionPool(aops.get_db_connection, max_size=5)
+
+        async def sleep():
+            async with pool.connection() as conn:
+                cur = conn.cursor()
+                await async_pool.execute(cur, "SELECT pg_sleep(0.3)")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(sleep() for _ in range(5)))
+        elapsed = time.perf_counter() - started
+        assert pool.size == 5
+        await pool.close()
+        return elapsed
+
+    assert _run(scenario()) < 1.0
+
+def test_pool_reuses_and_discards():
+    """Test connection reuse, discard on driver errors and the checkout timeout."""
+    async def scenario():
+        pool = AsyncConnectionPool(aops.get_db_connection, max_size=1, checkout_timeout=0.1)
+        async with pool.connection() as conn:
+            first = conn
+            with pytest.raises(PoolExhaustedError):
+                await pool.getconn()
+        async with pool.connection() as conn:
+            assert conn is first
+
+        with pytest.raises(psycopg2.OperationalError):
+            async with pool.connection() as conn:
+                raise psycopg2.OperationalError("connection lost")
+        assert first.closed
+        assert pool.size == 0
+
+        # A query cancelled mid-flight leaves a busy connection, which is not reused
+        async def slow():
+            async with pool.connection() as conn:
+                await async_pool.execute(conn.cursor(), "SELECT pg_sleep(5)")
+        task = asyncio.ensure_future(slow())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert pool.size == 0
+        await pool.close()
+
+    _run(scenario())
+
+def test_pool_of_closed_loop_is_closed():
+    """Test that a pool left behind by a finished loop is closed when a new loop starts one."""
+    async def checkout():
+        pool = aops.get_pool()
+        await aops.get_song('SONG001')
+        return pool
+
+    # Without close_pool, the first loop's pool keeps an idle connection
+    old = asyncio.run(checkout())
+    idle = old._idle[0].conn
+    pool = _run(checkout())
+    assert pool is not old
+    assert idle.closed
+    assert old.size == 0
+
+def test_shared_cache_calls_leave_the_loop(sample_song_data, monkeypatch):
+    """Test that shared cache backends are called off the event loop thread."""
+    threads = set()
+
+    class RecordingStore(LocalKeyValueStore):
+        def get(self, key):
+            threads.add(threading.get_ident())
+            return super().get(key)
+
+    monkeypatch.setattr(operations, '_song_cache', SharedCache(RecordingStore()))
+    monkeypatch.setattr(operations, '_list_cache', SharedCache(RecordingStore()))
+
+    async def scenario():
+        await aops.create_song(sample_song_data)
+        assert (await aops.get_song(sample_song_data['id'])).name == 'Async Song'
+        assert (await aops.get_song(sample_song_data['id'])).name == 'Async Song'
+        await aops.list_songs(limit=1)
+        return threading.get_ident()
+
+    try:
+        loop_thread = _run(scenario())
+    finally:
+        delete_song(sample_song_data['id'])
+    assert threads and loop_thread not in threads
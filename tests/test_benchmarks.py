@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test suite for the benchmark harness helpers (no database needed).
+"""
+
+from itertools import islice
+from benchmarks import catalog
+from benchmarks.compare import compare
+from benchmarks.decoding import VARIANTS, measure
+from benchmarks.suite import percentile, run_benchmark, summarize
+
+def test_generate_songs_is_deterministic():
+    """Test that catalogs are repeatable and use benchmark ids."""
+    first = list(catalog.generate_songs(100, seed=7))
+    assert first == list(catalog.generate_songs(100, seed=7))
+    assert first[0]['id'] == 'bench-00000000'
+    assert all(song['id'].startswith(catalog.ID_PREFIX) for song in first)
+    assert all(60 <= song['duration_in_seconds'] <= 600 for song in first)
+    # Large catalogs are generated lazily
+    assert len(list(islice(catalog.generate_songs(10_000_000), 3))) == 3
+
+def test_percentiles():
+    """Test nearest-rank percentiles and the summary fields."""
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+    summary = summarize(values, elapsed=2.0, errors=1)
+    assert summary['count'] == 100
+    assert summary['throughput'] == 50.0
+    assert summary['p95_ms'] == 95.0
+    assert summary['errors'] == 1
+
+def test_run_benchmark_counts_errors():
+    """Test that failing calls are counted and excluded from latencies."""
+    calls = []
+
+    def call(rng):
+        calls.append(rng.random())
+        if len(calls) % 4 == 0:
+            raise RuntimeError("boom")
+
+    result = run_benchmark(call, iterations=40, concurrency=2, warmup=0)
+    assert result['count'] + result['errors'] == 40
+    assert result['errors'] == 10
+
+def test_compare_flags_regressions():
+    """Test that slower latency or lower throughput beyond the threshold is a regression."""
+    base = {'results': {'a': {'p95_ms': 10.0, 'throughput': 100.0}, 'b': {'p95_ms': 10.0, 'throughput': 100.0}}}
+    head = {'results': {'a': {'p95_ms': 10.5, 'throughput': 80.0}, 'b': {'p95_ms': 12.0, 'throughput': 100.0}}}
+    assert [row[4] for row in compare(base, head, 'p95_ms', 0.1)] == [False, True]
+    assert [row[4] for row in compare(base, head, 'throughput', 0.1)] == [True, False]
+
+def test_slotted_songs_decode_smaller():
+    """Test that the decoding benchmark reports per-row costs and that slotted songs keep less memory."""
+    rows = [
+        tuple(song[column] for column in ('id', 'name', 'artist', 'album', 'release_date', 'genre', 'duration_in_seconds'))
+        + (None, None)
+        for song in catalog.generate_songs(2000)
+    ]
+    _, plain = VARIANTS['tuple rows, dataclass']
+    _, slotted = VARIANTS['tuple rows, slotted Song']
+    plain_result = measure(lambda: list(rows), plain, repeat=1)
+    slotted_result = measure(lambda: list(rows), slotted, repeat=1)
+    assert slotted_result['rows'] == 2000
+    assert slotted_result['decode_us'] > 0
+    assert slotted_result['retained_bytes'] < plain_result['retained_bytes']
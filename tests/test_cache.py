@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test suite for the cache backends used by the database layer.
+"""
+
+import pytest
+from src.database.cache import (
+    LocalKeyValueStore,
+    LRUCache,
+    NullCache,
+    SharedCache,
+    cache_from_env,
+)
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_get_set_delete():
+    """Test basic storage and invalidation."""
+    cache = LRUCache(maxsize=4)
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    cache.delete('a')
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_lru_evicts_least_recently_used():
+    """Test that reads refresh recency and the oldest entry is evicted."""
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_lru_ttl_expiry():
+    """Test default and per-entry TTLs."""
+    clock = FakeClock()
+    cache = LRUCache(maxsize=4, ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=30)
+    clock.now = 10
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert len(cache) == 1
+
+def test_lru_delete_many_and_clear():
+    """Test bulk invalidation."""
+    cache = LRUCache()
+    for key in 'abc':
+        cache.set(key, key)
+    cache.delete_many(['a', 'b', 'missing'])
+    assert cache.get('c') == 'c'
+    cache.clear()
+    assert len(cache) == 0
+
+def test_shared_cache_round_trip():
+    """Test that the shared backend serializes values through the client."""
+    clock = FakeClock()
+    store = LocalKeyValueStore(clock=clock)
+    cache = SharedCache(store, prefix='test:', ttl=5)
+    cache.set('a', {'name': 'Song'})
+
+    value = cache.get('a')
+    assert value == {'name': 'Song'}
+    assert store.get('test:a') is not None
+
+    clock.now = 5
+    assert cache.get('a') is None
+
+def test_get_many():
+    """Test multi-key reads on both backends."""
+    for cache in (LRUCache(), SharedCache(LocalKeyValueStore())):
+        cache.set('a', 1)
+        cache.set('c', 3)
+        assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+        assert cache.get_many([]) == {}
+    assert NullCache().get_many(['a']) == {}
+
+def test_shared_cache_delete_many():
+    """Test chunked invalidation on the shared backend."""
+    cache = SharedCache(LocalKeyValueStore())
+    for i in range(5):
+        cache.set(str(i), i)
+    cache.delete_many((str(i) for i in range(4)), chunk_size=2)
+    assert [cache.get(str(i)) for i in range(5)] == [None, None, None, None, 4]
+
+def test_shared_cache_degrades_on_backend_errors():
+    """Test that an unavailable backend behaves like an empty cache."""
+    class BrokenClient:
+        def get(self, key):
+            raise ConnectionError("down")
+        set = delete = get
+
+    cache = SharedCache(BrokenClient())
+    cache.set('a', 1)
+    cache.delete('a')
+    assert cache.get('a') is None
+
+def test_version_counters():
+    """Test that version counters survive eviction and clear()."""
+    cache = LRUCache(maxsize=1)
+    assert cache.version('songs') == 0
+    cache.bump('songs')
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.clear()
+    assert cache.version('songs') == 1
+
+    shared = SharedCache(LocalKeyValueStore())
+    assert shared.version('songs') == 0
+    shared.bump('songs')
+    shared.bump('songs')
+    assert shared.version('songs') == 2
+
+    assert NullCache().version('songs') is None
+
+def test_set_if_version():
+    """Test that a conditional set is refused once the version counter has moved."""
+    clock = FakeClock()
+    for cache in (LRUCache(clock=clock), SharedCache(LocalKeyValueStore(clock=clock), ttl=10)):
+        version = cache.version('songs')
+        assert cache.set_if_version('a', 1, 'songs', version)
+        assert cache.get('a') == 1
+        cache.bump('songs')
+        assert not cache.set_if_version('b', 2, 'songs', version)
+        assert cache.get('b') is None
+        assert cache.set_if_version('b', 2, 'songs', version + 1)
+        clock.now += 61
+        assert cache.get('b') is None
+
+    assert not NullCache().set_if_version('a', 1, 'songs', 0)
+
+def test_cache_from_env(monkeypatch):
+    """Test backend selection from environment settings."""
+    monkeypatch.setenv('SONG_CACHE_BACKEND', 'memory')
+    monkeypatch.setenv('SONG_CACHE_SIZE', '7')
+    cache = cache_from_env('song')
+    assert isinstance(cache, LRUCache) and cache.maxsize == 7
+
+    monkeypatch.setenv('SONG_CACHE_BACKEND', 'local')
+    assert isinstance(cache_from_env('song'), SharedCache)
+
+    monkeypatch.setenv('SONG_CACHE_BACKEND', 'none')
+    assert isinstance(cache_from_env('song'), NullCache)
+
+    monkeypatch.setenv('SONG_CACHE_BACKEND', 'redis')
+    monkeypatch.delenv('SONG_CACHE_REDIS_URL', raising=False)
+    with pytest.raises(ValueError):
+        cache_from_env('song')
+
+    monkeypatch.setenv('SONG_CACHE_BACKEND', 'bogus')
+    with pytest.raises(ValueError):
+        cache_from_env('song')
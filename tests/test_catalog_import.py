@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test suite for the streaming catalog importer.
+Covers the incremental readers, record validation and resumable imports.
+"""
+
+import io
+import json
+import pytest
+from dotenv import load_dotenv
+from scripts import import_catalog
+from scripts.import_catalog import (
+    CatalogFormatError,
+    import_catalog as run_import,
+    iter_csv_records,
+    iter_json_records,
+    iter_ndjson_records,
+    validate_record,
+)
+from src.database.operations import SongNotFoundError, delete_song, get_song
+
+@pytest.fixture
+def sample_songs():
+    """Fixture providing the songs from the sample data file."""
+    with open('data/sample_songs.json', 'r') as f:
+        return json.load(f)['songs']
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Fixture forcing tiny reads so records straddle chunk boundaries."""
+    monkeypatch.setattr(import_catalog, 'READ_CHUNK_SIZE', 7)
+
+def test_json_reader_matches_json_load(sample_songs, small_chunks):
+    """Test that the incremental reader yields the same records as json.load."""
+    with open('data/sample_songs.json', 'r') as f:
+        assert list(iter_json_records(f)) == sample_songs
+
+def test_json_reader_top_level_list(sample_songs, small_chunks):
+    """Test reading a top-level JSON list with extra keys skipped."""
+    assert list(iter_json_records(io.StringIO(json.dumps(sample_songs)))) == sample_songs
+
+    document = json.dumps({'version': [1, 2], 'songs': sample_songs[:2]})
+    assert list(iter_json_records(io.StringIO(document))) == sample_songs[:2]
+
+def test_json_reader_errors(small_chunks):
+    """Test that malformed JSON raises CatalogFormatError."""
+    with pytest.raises(CatalogFormatError):
+        list(iter_json_records(io.StringIO('{"songs": [{"id": 1} {"id": 2}]}')))
+    with pytest.raises(CatalogFormatError):
+        list(iter_json_records(io.StringIO('{"other": []}')))
+    with pytest.raises(CatalogFormatError):
+        list(iter_json_records(io.StringIO('[{"id": "unterminated')))
+
+def test_ndjson_reader(sample_songs):
+    """Test reading newline-delimited JSON with blank lines."""
+    text = '\n'.join(json.dumps(song) for song in sample_songs) + '\n\n'
+    assert list(iter_ndjson_records(io.StringIO(text))) == sample_songs
+
+def test_csv_reader(sample_songs):
+    """Test reading CSV and converting durations to integers."""
+    fields = list(sample_songs[0].keys())
+    text = io.StringIO()
+    text.write(','.join(fields) + '\n')
+    for song in sample_songs:
+        text.write(','.join(f'"{song[field]}"' for field in fields) + '\n')
+    text.seek(0)
+    assert list(iter_csv_records(text)) == sample_songs
+
+def test_validate_record(sample_songs):
+    """Test that records are checked against the Song model rules."""
+    assert validate_record(dict(sample_songs[0], extra='ignored')) == sample_songs[0]
+
+    for bad in (
+        dict(sample_songs[0], duration_in_seconds=-5),
+        dict(sample_songs[0], name='   '),
+        dict(sample_songs[0], release_date='2023/03/15'),
+        dict(sample_songs[0], duration_in_seconds='245'),
+        {'id': 'missing-fields'},
+        ['not', 'a', 'record'],
+    ):
+        with pytest.raises(ValueError):
+            validate_record(bad)
+
+def test_import_resumes_from_checkpoint(tmp_path, sample_songs):
+    """Test a batched NDJSON import that resumes from its checkpoint."""
+    load_dotenv()
+    songs = []
+    for i, song in enumerate(sample_songs[:4]):
+        songs.append(dict(song, id=f'test-import-{i}'))
+    source = tmp_path / 'catalog.ndjson'
+    source.write_text(
+        '\n'.join(json.dumps(song) for song in songs[:2])
+        + '\n' + json.dumps(dict(songs[2], duration_in_seconds=0))
+        + '\n' + json.dumps(songs[3]) + '\n'
+    )
+    checkpoint = tmp_path / 'catalog.checkpoint'
+    errors = io.StringIO()
+
+    try:
+        # Pretend a previous run stopped after the first batch of two
+        checkpoint.write_text(json.dumps(
+            {'records': 2, 'inserted': 2, 'updated': 0, 'unchanged': 0, 'rejected': 0}
+        ))
+        result = run_import(
+            str(source), batch_size=2, checkpoint_path=str(checkpoint),
+            resume=True, errors=errors, progress=None
+        )
+
+        assert result['records'] == 4
+        assert result['inserted'] == 3
+        assert result['rejected'] == 1
+        assert json.loads(checkpoint.read_text()) == result
+        assert json.loads(errors.getvalue())['id'] == 'test-import-2'
+
+        get_song('test-import-3')
+        with pytest.raises(SongNotFoundError):
+            get_song('test-import-0')
+    finally:
+        for song in songs:
+            delete_song(song['id'])
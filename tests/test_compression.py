@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test suite for API response compression.
+"""
+
+import base64
+import gzip
+import json
+from src.api import compression
+from src.api.api import handler
+from src.api.compression import (
+    choose_encoding,
+    compress_response,
+    parse_accept_encoding,
+    request_body,
+)
+
+LARGE_BODY = json.dumps([{'id': f'S{i}', 'name': 'Song'} for i in range(200)])
+
+def _event(accept_encoding=None):
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding is not None else {}
+    return {'headers': headers}
+
+def test_parse_accept_encoding():
+    """Test q-value parsing, including malformed values."""
+    assert parse_accept_encoding('gzip, deflate;q=0.5, br;q=bogus') == {
+        'gzip': 1.0, 'deflate': 0.5, 'br': 0.0
+    }
+    assert parse_accept_encoding(None) == {}
+
+def test_choose_encoding(monkeypatch):
+    """Test negotiation against the supported codings."""
+    monkeypatch.setattr(compression, 'SUPPORTED_ENCODINGS', ('gzip',))
+    assert choose_encoding('gzip, deflate') == 'gzip'
+    assert choose_encoding('*') == 'gzip'
+    assert choose_encoding('*, gzip;q=0') is None
+    assert choose_encoding('identity') is None
+    assert choose_encoding(None) is None
+
+    # Client preference wins; server order breaks ties
+    monkeypatch.setattr(compression, 'SUPPORTED_ENCODINGS', ('br', 'gzip'))
+    assert choose_encoding('gzip, br;q=0.5') == 'gzip'
+    assert choose_encoding('gzip, br') == 'br'
+
+def test_compress_response_gzip():
+    """Test that large bodies are compressed and base64 encoded."""
+    response = compress_response(
+        _event('gzip'), {'statusCode': 200, 'headers': {'ETag': 'W/"x"'}, 'body': LARGE_BODY}
+    )
+    assert response['isBase64Encoded'] is True
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    assert response['headers']['Vary'] == 'Accept-Encoding'
+    assert response['headers']['ETag'] == 'W/"x"'
+    assert gzip.decompress(base64.b64decode(response['body'])).decode('utf-8') == LARGE_BODY
+
+def test_compress_response_threshold():
+    """Test that small bodies and non-accepting clients are left alone."""
+    small = {'statusCode': 200, 'body': '{"id": "S1"}'}
+    assert compress_response(_event('gzip'), small) is small
+
+    response = compress_response(_event(), {'statusCode': 200, 'body': LARGE_BODY})
+    assert response['body'] == LARGE_BODY
+    assert 'isBase64Encoded' not in response
+    assert response['headers'] == {'Vary': 'Accept-Encoding'}
+
+    response = compress_response(_event('gzip'), {'statusCode': 200, 'body': LARGE_BODY}, min_size=10**6)
+    assert response['body'] == LARGE_BODY
+
+def test_request_body_decodes_base64():
+    """Test that base64 encoded request bodies are decoded."""
+    encoded = base64.b64encode('{"name": "Ça"}'.encode('utf-8')).decode('ascii')
+    assert request_body({'body': encoded, 'isBase64Encoded': True}) == '{"name": "Ça"}'
+    assert request_body({'body': '{}'}) == '{}'
+
+def test_handler_compresses_list_pages():
+    """Test that the handler compresses a large list page on request."""
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs',
+        'queryStringParameters': {'limit': '100'},
+        'headers': {'accept-encoding': 'gzip'}
+    }, None)
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    songs = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+    assert len(songs) >= 10
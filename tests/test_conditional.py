@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test suite for conditional GET support (ETag / Last-Modified).
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from dotenv import load_dotenv
+from src.api.api import handler
+from src.api.conditional import (
+    get_header,
+    http_date,
+    is_not_modified,
+    list_etag,
+    song_etag,
+)
+from src.database.operations import create_song, delete_song, get_song_version
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+def _event(**headers):
+    return {'headers': headers}
+
+def test_get_header_is_case_insensitive():
+    """Test header lookup regardless of the casing API Gateway delivers."""
+    assert get_header({'headers': {'if-none-match': '"a"'}}, 'If-None-Match') == '"a"'
+    assert get_header({'headers': None}, 'If-None-Match') is None
+
+def test_song_etag_changes_with_updated_at():
+    """Test that a new updated_at produces a new tag."""
+    etag = song_etag('SONG001', UPDATED_AT)
+    assert etag.startswith('W/"')
+    assert etag == song_etag('SONG001', UPDATED_AT)
+    assert etag != song_etag('SONG001', UPDATED_AT + timedelta(microseconds=1))
+
+def test_list_etag_tracks_membership():
+    """Test that adding or removing a song changes a list tag."""
+    songs = [SimpleNamespace(id=f'S{i}', updated_at=UPDATED_AT) for i in range(3)]
+    etag = list_etag(songs)
+    assert etag == list_etag(list(songs))
+    assert etag != list_etag(songs[:2])
+    assert etag != list_etag(songs, extra='next-cursor')
+
+def test_if_none_match():
+    """Test weak comparison, lists of tags and the wildcard."""
+    etag = song_etag('SONG001', UPDATED_AT)
+    opaque = etag[2:]
+    assert is_not_modified(_event(**{'If-None-Match': etag}), etag, UPDATED_AT)
+    assert is_not_modified(_event(**{'If-None-Match': opaque}), etag, UPDATED_AT)
+    assert is_not_modified(_event(**{'If-None-Match': f'"other", {etag}'}), etag, UPDATED_AT)
+    assert is_not_modified(_event(**{'If-None-Match': '*'}), etag, UPDATED_AT)
+    assert not is_not_modified(_event(**{'If-None-Match': '"other"'}), etag, UPDATED_AT)
+
+def test_if_modified_since():
+    """Test date validation at second precision."""
+    etag = song_etag('SONG001', UPDATED_AT)
+    assert http_date(UPDATED_AT) == 'Wed, 01 May 2024 12:30:15 GMT'
+    assert is_not_modified(_event(**{'If-Modified-Since': http_date(UPDATED_AT)}), etag, UPDATED_AT)
+
+    earlier = http_date(UPDATED_AT - timedelta(seconds=1))
+    assert not is_not_modified(_event(**{'If-Modified-Since': earlier}), etag, UPDATED_AT)
+    assert not is_not_modified(_event(**{'If-Modified-Since': 'garbage'}), etag, UPDATED_AT)
+
+    # Dates are ignored when the caller cannot rely on them, or when tags are present
+    current = http_date(UPDATED_AT)
+    assert not is_not_modified(_event(**{'If-Modified-Since': current}), etag, UPDATED_AT, use_date=False)
+    assert not is_not_modified(
+        _event(**{'If-Modified-Since': current, 'If-None-Match': '"other"'}), etag, UPDATED_AT
+    )
+
+@pytest.fixture
+def song():
+    """Fixture providing a song stored in the database."""
+    load_dotenv()
+    song = create_song({
+        'id': 'test-conditional-1',
+        'name': 'Conditional Song',
+        'artist': 'Test Artist',
+        'album': 'Test Album',
+        'release_date': date(2023, 1, 1),
+        'genre': 'Test Genre',
+        'duration_in_seconds': 180
+    })
+    yield song
+    delete_song(song.id)
+
+def test_handler_returns_304_for_current_etag(song):
+    """Test that a matching If-None-Match is answered without a body."""
+    assert get_song_version(song.id) == song.updated_at
+    etag = song_etag(song.id, song.updated_at)
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': f'/songs/{song.id}',
+        'headers': {'if-none-match': etag}
+    }, None)
+    assert response['statusCode'] == 304
+    assert response['body'] == ''
+    assert response['headers']['ETag'] == etag
+    assert response['headers']['Last-Modified'] == http_date(song.updated_at)
+
+def test_handler_conditional_get_missing_song(song):
+    """Test that conditional requests for unknown songs still 404."""
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs/test-conditional-missing',
+        'headers': {'If-None-Match': '"x"'}
+    }, None)
+    assert response['statusCode'] == 404
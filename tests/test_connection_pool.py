@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test suite for the database connection pool.
+Uses in-memory stand-ins for psycopg2 connections so no database is needed.
+"""
+
+import threading
+import time
+import pytest
+import psycopg2
+from psycopg2 import extensions
+from src.database.pool import (
+    ConnectionPool,
+    PoolClosedError,
+    PoolExhaustedError,
+)
+
+class FakeCursor:
+    """Minimal cursor that can be told to fail."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection tracking its own lifecycle."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def commit(self):
+        self.commits += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+@pytest.fixture
+def opened():
+    """Fixture collecting every connection the pool opens."""
+    return []
+
+@pytest.fixture
+def connect(opened):
+    """Fixture providing a connect callable backed by FakeConnection."""
+    def _connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+    return _connect
+
+def test_connection_is_reused(connect, opened):
+    """Test that sequential checkouts reuse the same connection."""
+    pool = ConnectionPool(connect, max_size=2)
+    for _ in range(5):
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    assert len(opened) == 1
+    assert opened[0].commits == 5
+    assert pool.size == 1
+
+def test_rollback_on_error(connect, opened):
+    """Test that a failing block rolls back and keeps the connection."""
+    pool = ConnectionPool(connect)
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            raise ValueError("boom")
+    assert opened[0].rollbacks == 1
+    assert pool.idle_count == 1
+
+def test_operational_error_discards_connection(connect, opened):
+    """Test that driver-level failures drop the connection from the pool."""
+    pool = ConnectionPool(connect)
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection() as conn:
+            conn.broken = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    assert opened[0].closed
+    assert pool.size == 0
+
+def test_health_check_on_checkout(connect, opened):
+    """Test that a dead idle connection is replaced on checkout."""
+    pool = ConnectionPool(connect, health_check_after=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.broken = True
+
+    replacement = pool.getconn()
+    assert replacement is not conn
+    assert conn.closed
+    pool.putconn(replacement)
+
+def test_closed_connection_not_reused(connect, opened):
+    """Test that connections closed while idle are not handed out."""
+    pool = ConnectionPool(connect)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.close()
+    assert pool.getconn() is not conn
+
+def test_max_age_recycles_connection(connect, opened):
+    """Test that connections older than max_age are closed."""
+    pool = ConnectionPool(connect, max_age=0.01)
+    conn = pool.getconn()
+    time.sleep(0.02)
+    pool.putconn(conn)
+    assert conn.closed
+    assert pool.size == 0
+
+def test_idle_reaping_respects_min_size(connect, opened):
+    """Test that reaping closes idle connections above min_size only."""
+    pool = ConnectionPool(connect, min_size=1, max_size=3, max_idle=0.01)
+    conns = [pool.getconn() for _ in range(3)]
+    for conn in conns:
+        pool.putconn(conn)
+    time.sleep(0.02)
+
+    assert pool.reap() == 2
+    assert pool.idle_count == 1
+
+def test_fill_opens_min_size(connect, opened):
+    """Test that fill pre-opens min_size connections."""
+    pool = ConnectionPool(connect, min_size=2, max_size=4)
+    pool.fill()
+    assert len(opened) == 2
+    assert pool.idle_count == 2
+
+def test_checkout_timeout(connect):
+    """Test that checkout fails once max_size connections are busy."""
+    pool = ConnectionPool(connect, max_size=1, checkout_timeout=0.05)
+    pool.getconn()
+    with pytest.raises(PoolExhaustedError):
+        pool.getconn()
+
+def test_waiting_checkout_gets_returned_connection(connect, opened):
+    """Test that a blocked checkout wakes up when a connection is returned."""
+    pool = ConnectionPool(connect, max_size=1, checkout_timeout=2)
+    conn = pool.getconn()
+    received = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.putconn(conn)
+    waiter.join(timeout=2)
+
+    assert received == [conn]
+    assert len(opened) == 1
+
+def test_failed_connect_wakes_waiting_checkout(connect, opened):
+    """Test that a connect failure frees its slot for a checkout waiting at max_size."""
+    release = threading.Event()
+    attempts = []
+
+    def flaky_connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(2)
+            raise psycopg2.OperationalError("could not connect")
+        return connect()
+
+    pool = ConnectionPool(flaky_connect, max_size=1, checkout_timeout=5)
+    failing = threading.Thread(target=lambda: pytest.raises(psycopg2.OperationalError, pool.getconn))
+    failing.start()
+    time.sleep(0.05)
+
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    release.set()
+    waiter.join(timeout=5)
+    failing.join(timeout=5)
+
+    assert received == opened
+    assert time.monotonic() - started < 1
+
+def test_closed_pool_rejects_checkout(connect, opened):
+    """Test that a closed pool closes idle connections and refuses checkouts."""
+    pool = ConnectionPool(connect)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    pool.close()
+
+    assert conn.closed
+    with pytest.raises(PoolClosedError):
+        pool.getconn()
+
+def test_invalid_sizes(connect):
+    """Test that inconsistent pool sizes are rejected."""
+    with pytest.raises(ValueError):
+        ConnectionPool(connect, max_size=0)
+    with pytest.raises(ValueError):
+        ConnectionPool(connect, min_size=3, max_size=2)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test suite for database credential providers.
+"""
+
+import json
+import psycopg2
+import pytest
+from src.database import operations
+from src.database.credentials import (
+    CredentialError,
+    Credentials,
+    EnvCredentialProvider,
+    SecretsManagerCredentialProvider,
+    StaticCredentialProvider,
+    get_credential_provider,
+    set_credential_provider,
+)
+from src.database.operations import DatabaseError, get_db_connection
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeSecretsClient:
+    """Stand-in for the Secrets Manager client; the password can be rotated."""
+
+    def __init__(self, password='first'):
+        self.password = password
+        self.calls = 0
+
+    def get_secret_value(self, SecretId):
+        self.calls += 1
+        if SecretId == 'missing':
+            raise RuntimeError("ResourceNotFoundException")
+        return {'SecretString': json.dumps({
+            'username': 'app',
+            'password': self.password,
+            'host': 'db.internal',
+            'port': 5432,
+            'dbname': 'ourchants'
+        })}
+
+@pytest.fixture
+def no_db_env(monkeypatch):
+    for name in ('DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_SECRET_ARN'):
+        monkeypatch.delenv(name, raising=False)
+
+@pytest.fixture
+def restore_provider():
+    yield
+    set_credential_provider(None)
+
+def test_env_provider(monkeypatch, no_db_env):
+    """Test that the environment provider names missing variables."""
+    with pytest.raises(CredentialError, match='DB_HOST'):
+        EnvCredentialProvider().get()
+
+    for name, value in [('DB_HOST', 'h'), ('DB_PORT', '5432'), ('DB_NAME', 'n'),
+                        ('DB_USER', 'u'), ('DB_PASSWORD', 'p')]:
+        monkeypatch.setenv(name, value)
+    assert EnvCredentialProvider().get() == Credentials('h', '5432', 'n', 'u', 'p')
+
+def test_secret_is_cached_until_ttl(no_db_env):
+    """Test that the secret is fetched once per TTL."""
+    client = FakeSecretsClient()
+    clock = FakeClock()
+    provider = SecretsManagerCredentialProvider('arn', ttl=60, client=client, clock=clock)
+
+    first = provider.get()
+    assert first == Credentials('db.internal', '5432', 'ourchants', 'app', 'first')
+    provider.get()
+    assert client.calls == 1
+
+    client.password = 'second'
+    clock.now = 60
+    assert provider.get().password == 'second'
+    assert client.calls == 2
+
+def test_secret_refresh_on_invalidate(no_db_env):
+    """Test that invalidate() forces the next get() to refetch."""
+    client = FakeSecretsClient()
+    provider = SecretsManagerCredentialProvider('arn', client=client)
+    provider.get()
+    client.password = 'rotated'
+    provider.invalidate()
+    assert provider.get().password == 'rotated'
+
+def test_secret_env_overrides_location(monkeypatch, no_db_env):
+    """Test that DB_HOST/DB_PORT/DB_NAME take precedence over the secret."""
+    monkeypatch.setenv('DB_HOST', 'replica.internal')
+    provider = SecretsManagerCredentialProvider('arn', client=FakeSecretsClient())
+    credentials = provider.get()
+    assert credentials.host == 'replica.internal'
+    assert credentials.user == 'app'
+
+def test_secret_fetch_failure(no_db_env):
+    """Test that client errors surface as CredentialError."""
+    provider = SecretsManagerCredentialProvider('missing', client=FakeSecretsClient())
+    with pytest.raises(CredentialError, match='missing'):
+        provider.get()
+
+def test_provider_selection(monkeypatch, no_db_env, restore_provider):
+    """Test that DB_SECRET_ARN selects the Secrets Manager provider."""
+    set_credential_provider(None)
+    assert isinstance(get_credential_provider(), EnvCredentialProvider)
+
+    set_credential_provider(None)
+    monkeypatch.setenv('DB_SECRET_ARN', 'arn:aws:secretsmanager:region:acct:secret:db')
+    monkeypatch.setenv('DB_SECRET_TTL', '30')
+    provider = get_credential_provider()
+    assert isinstance(provider, SecretsManagerCredentialProvider)
+    assert provider.ttl == 30
+
+def test_connect_retries_after_rotation(monkeypatch, no_db_env, restore_provider):
+    """Test that an authentication failure refreshes the secret and retries once."""
+    client = FakeSecretsClient(password='stale')
+    provider = SecretsManagerCredentialProvider('arn', client=client)
+    set_credential_provider(provider)
+    provider.get()
+    # The secret rotates while the stale value is still cached
+    client.password = 'current'
+    attempts = []
+
+    def fake_connect(credentials):
+        attempts.append(credentials.password)
+        if credentials.password == 'stale':
+            raise psycopg2.OperationalError('FATAL:  password authentication failed for user "app"')
+        return 'connection'
+
+    monkeypatch.setattr(operations, '_connect', fake_connect)
+
+    assert get_db_connection() == 'connection'
+    assert attempts == ['stale', 'current']
+
+def test_connect_does_not_retry_static_credentials(monkeypatch, restore_provider):
+    """Test that non-refreshable providers fail without a retry."""
+    set_credential_provider(StaticCredentialProvider(Credentials('h', '1', 'n', 'u', 'p')))
+    attempts = []
+
+    def fake_connect(credentials):
+        attempts.append(credentials)
+        raise psycopg2.OperationalError('FATAL:  password authentication failed')
+
+    monkeypatch.setattr(operations, '_connect', fake_connect)
+    with pytest.raises(DatabaseError, match="Failed to connect to database 'n'"):
+        get_db_connection()
+    assert len(attempts) == 1
+
+def test_connect_reports_credential_errors_unprefixed(no_db_env, restore_provider):
+    """Test that a credential failure keeps its own message when wrapped."""
+    set_credential_provider(EnvCredentialProvider())
+    with pytest.raises(DatabaseError) as excinfo:
+        get_db_connection()
+    assert str(excinfo.value).startswith('Missing required environment variables:')
+    assert isinstance(excinfo.value.__cause__, CredentialError)
@@ -61,7 +61,8 @@ def test_table_exists():
         ('genre', 'character varying', 'NO'),
         ('duration_in_seconds', 'integer', 'NO'),
         ('created_at', 'timestamp with time zone', 'YES'),
-        ('updated_at', 'timestamp with time zone', 'YES')
+        ('updated_at', 'timestamp with time zone', 'YES'),
+        ('search_vector', 'tsvector', 'YES')
     }
     
     assert set(columns) == expected_columns, "Table structure does not match expected schema"
@@ -107,4 +108,32 @@ def test_sample_data_loaded():
     assert song[6] == 245
     
     cur.close()
-    conn.close() 
\ No newline at end of file
+    conn.close() 
+def test_schema_can_be_reapplied():
+    """Test that the schema re-runs on an existing database and replaces the old sort indexes."""
+    load_dotenv()
+    
+    db_params = {
+        'host': os.getenv('DB_HOST'),
+        'database': os.getenv('DB_NAME', 'songs'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'port': os.getenv('DB_PORT', '5432')
+    }
+    
+    with open('infrastructure/schema.sql') as f:
+        schema_sql = f.read()
+    
+    conn = psycopg2.connect(**db_params)
+    cur = conn.cursor()
+    try:
+        # A database from before the (column, id) indexes
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_songs_artist ON songs(artist)")
+        cur.execute(schema_sql)
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'songs'")
+        indexes = {row[0] for row in cur.fetchall()}
+        assert 'idx_songs_artist' not in indexes
+        assert {'idx_songs_artist_id', 'idx_songs_name_id', 'idx_songs_release_date_id'} <= indexes
+    finally:
+        conn.rollback()
+        conn.close()
@@ -4,21 +4,41 @@ Test suite for database operations module.
 Tests CRUD operations and error handling for song data.
 """
 
+import json
 import os
 import pytest
 from datetime import date
 from dotenv import load_dotenv
+from psycopg2 import sql
+from src.database import operations
 from src.database.operations import (
+    SORT_COLUMNS,
+    _list_query,
+    _page_query,
+    _song_key,
     Song,
     create_song,
     get_song,
+    get_songs,
+    MAX_BATCH_GET,
     update_song,
     delete_song,
+    export_songs,
     list_songs,
+    list_songs_page,
+    bulk_upsert_songs,
+    search_songs,
+    get_stats,
     DatabaseError,
     SongNotFoundError,
     InvalidDataError,
-    get_db_connection
+    get_db_connection,
+    get_pool,
+    get_read_pool,
+    close_read_pool,
+    use_primary,
+    get_song_cache,
+    get_list_cache
 )
 
 def pytest_configure():
@@ -149,6 +169,10 @@ def test_update_song_invalid_data(db_connection, sample_song_data):
     with pytest.raises(InvalidDataError):
         update_song(created_song.id, {})
     
+    # Test columns that cannot be updated
+    with pytest.raises(InvalidDataError):
+        update_song(created_song.id, {'search_vector': 'rock'})
+    
     # Clean up
     delete_song(created_song.id)
 
@@ -207,4 +231,578 @@ def test_list_songs(db_connection, sample_song_data):
 def test_list_songs_empty(db_connection):
     """Test listing songs when no songs match the filter."""
     songs = list_songs(genre='Non-existent Genre')
-    assert len(songs) == 0 
\ No newline at end of file
+    assert len(songs) == 0
+
+def test_operations_reuse_pooled_connection(db_connection, sample_song_data):
+    """Test that consecutive operations share one pooled connection."""
+    pool = get_pool()
+    song = create_song(sample_song_data)
+    try:
+        opened = pool.size
+        for _ in range(5):
+            get_song(song.id)
+        list_songs(limit=5)
+        assert pool.size == opened
+        assert pool.idle_count == pool.size
+    finally:
+        delete_song(song.id)
+
+@pytest.fixture
+def read_replica(monkeypatch):
+    """Point the read pool at the test database, standing in for a replica."""
+    close_read_pool()
+    monkeypatch.setenv('DB_READ_HOST', os.environ['DB_HOST'])
+    yield
+    close_read_pool()
+
+def test_reads_use_read_replica(db_connection, sample_song_data, read_replica):
+    """Test that reads go to the replica pool and writes to the primary."""
+    song = create_song(sample_song_data)
+    try:
+        get_song_cache().clear()
+        get_list_cache().clear()
+        get_song(song.id)
+        list_songs(limit=1)
+        replica = get_read_pool()
+        assert replica.size >= 1
+        
+        # Pinned reads use the primary and skip the (now stale) cache
+        with db_connection.cursor() as cur:
+            cur.execute("UPDATE songs SET name = 'Changed Directly' WHERE id = %s", (song.id,))
+        db_connection.commit()
+        opened = replica.size
+        assert get_song(song.id).name == sample_song_data['name']
+        with use_primary():
+            assert get_song(song.id).name == 'Changed Directly'
+        assert replica.size == opened
+    finally:
+        delete_song(song.id)
+
+def test_replica_reads_after_write_skip_caches(db_connection, sample_song_data, read_replica):
+    """Test that reads which may hit a lagging replica just after a write fill no cache."""
+    song = create_song(sample_song_data)
+    try:
+        get_song_cache().clear()
+        get_list_cache().clear()
+        get_song(song.id)
+        assert get_song_cache().get(_song_key(song.id)) is not None
+        
+        # Within DB_REPLICA_MAX_LAG of the write the replica may still have the old row
+        update_song(song.id, {'name': 'Lagged'})
+        get_song(song.id)
+        assert get_song_cache().get(_song_key(song.id)) is None
+        assert list_songs(limit=1) is not list_songs(limit=1)
+        
+        # Reads pinned to the primary are always current
+        with use_primary():
+            get_song(song.id)
+        assert get_song_cache().get(_song_key(song.id)) is not None
+    finally:
+        delete_song(song.id)
+    
+    # A replica that has not applied the delete yet still returns the row;
+    # putting it back behind the module's back stands in for one
+    with db_connection.cursor() as cur:
+        cur.execute(
+            "INSERT INTO songs (id, name, artist, album, release_date, genre, duration_in_seconds) "
+            "VALUES (%(id)s, %(name)s, %(artist)s, %(album)s, %(release_date)s, %(genre)s, "
+            "%(duration_in_seconds)s)", sample_song_data
+        )
+    db_connection.commit()
+    try:
+        assert get_song(song.id).id == song.id
+        assert get_song_cache().get(_song_key(song.id)) is None
+    finally:
+        with db_connection.cursor() as cur:
+            cur.execute("DELETE FROM songs WHERE id = %s", (song.id,))
+        db_connection.commit()
+    
+    # Once the lag has passed, replica reads are cached again
+    get_song_cache().delete(operations._RECENT_WRITE_KEY)
+    get_list_cache().delete(operations._RECENT_WRITE_KEY)
+    get_song('SONG001')
+    assert get_song_cache().get(_song_key('SONG001')) is not None
+    assert list_songs(limit=1) is list_songs(limit=1)
+
+def test_reads_fall_back_to_primary(db_connection, sample_song_data, read_replica, monkeypatch):
+    """Test that an unreachable replica does not fail reads."""
+    monkeypatch.setenv('DB_READ_PORT', '1')
+    song = create_song(sample_song_data)
+    try:
+        get_song_cache().clear()
+        assert get_song(song.id).id == song.id
+        assert get_read_pool().size == 0
+    finally:
+        delete_song(song.id)
+
+def test_list_songs_page(db_connection, sample_song_data):
+    """Test keyset pagination walks every song exactly once."""
+    songs = []
+    for i in range(5):
+        song_data = sample_song_data.copy()
+        song_data['id'] = f'test-page-{i}'
+        # Duplicate names exercise the id tie-breaker
+        song_data['name'] = 'Paged Song' if i < 3 else f'Paged Song {i}'
+        song_data['genre'] = 'Paged Genre'
+        songs.append(create_song(song_data))
+    
+    try:
+        seen = []
+        cursor = None
+        while True:
+            page = list_songs_page(limit=2, cursor=cursor, genre='Paged Genre')
+            assert len(page.songs) <= 2
+            seen.extend(song.id for song in page.songs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        expected = [song.id for song in sorted(songs, key=lambda s: (s.name, s.id))]
+        assert seen == expected
+        
+        # Offset and keyset modes agree on the first page
+        first_page = list_songs_page(limit=3, genre='Paged Genre')
+        assert [s.id for s in first_page.songs] == [s.id for s in list_songs(limit=3, genre='Paged Genre')]
+    finally:
+        for song in songs:
+            delete_song(song.id)
+
+def test_export_songs(db_connection, sample_song_data):
+    """Test that export streams every matching song in batches and releases its connection."""
+    songs = []
+    for i in range(5):
+        song_data = sample_song_data.copy()
+        song_data['id'] = f'test-export-{i}'
+        song_data['name'] = f'Exported Song {4 - i}'
+        song_data['genre'] = 'Export Genre'
+        songs.append(create_song(song_data))
+    
+    try:
+        exported = list(export_songs(genre='Export Genre', batch_size=2))
+        assert [song.id for song in exported] == [f'test-export-{i}' for i in reversed(range(5))]
+        assert exported[0] == get_song('test-export-4')
+        descending = export_songs(genre='Export Genre', sort='name', order='desc', batch_size=2)
+        assert [song.id for song in descending] == [f'test-export-{i}' for i in range(5)]
+        
+        # Stopping early hands the connection back to the pool
+        pool = get_pool()
+        idle = pool.idle_count
+        partial = export_songs(genre='Export Genre', batch_size=2)
+        next(partial)
+        assert pool.idle_count == idle - 1
+        partial.close()
+        assert pool.idle_count == idle
+        
+        with pytest.raises(InvalidDataError):
+            export_songs(sort='search_vector')
+        with pytest.raises(InvalidDataError):
+            export_songs(batch_size=0)
+    finally:
+        for song in songs:
+            delete_song(song.id)
+
+def test_list_songs_page_invalid_cursor(db_connection):
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(InvalidDataError):
+        list_songs_page(cursor='not-a-cursor')
+    
+    with pytest.raises(InvalidDataError):
+        list_songs_page(limit=0)
+
+def test_bulk_upsert_songs(db_connection, sample_song_data):
+    """Test bulk insert, update and per-row error reporting."""
+    rows = []
+    for i in range(3):
+        row = sample_song_data.copy()
+        row['id'] = f'test-bulk-{i}'
+        row['release_date'] = '2023-01-01'
+        rows.append(row)
+    
+    invalid = sample_song_data.copy()
+    invalid['id'] = 'test-bulk-invalid'
+    invalid['duration_in_seconds'] = 0
+    
+    try:
+        result = bulk_upsert_songs(rows + [invalid], chunk_size=2)
+        assert result.inserted == 3
+        assert result.updated == 0
+        assert len(result.errors) == 1
+        assert result.errors[0].index == 3
+        assert result.errors[0].id == 'test-bulk-invalid'
+        
+        # Re-sending one changed row and one identical row
+        get_song('test-bulk-0')
+        get_song('test-bulk-1')
+        changed = rows[0].copy()
+        changed['name'] = 'Bulk Updated'
+        result = bulk_upsert_songs([changed, rows[1]])
+        assert result.inserted == 0
+        assert result.updated == 1
+        assert result.unchanged == 1
+        assert result.errors == []
+        # Only the updated song is evicted from the cache
+        assert get_song_cache().get(_song_key('test-bulk-0')) is None
+        assert get_song_cache().get(_song_key('test-bulk-1')) is not None
+        assert get_song('test-bulk-0').name == 'Bulk Updated'
+        
+        # Duplicate ids within one batch: the last row wins
+        first = rows[2].copy()
+        last = rows[2].copy()
+        last['name'] = 'Last Write'
+        bulk_upsert_songs([first, last])
+        assert get_song('test-bulk-2').name == 'Last Write'
+        
+        with pytest.raises(SongNotFoundError):
+            get_song('test-bulk-invalid')
+    finally:
+        for row in rows:
+            delete_song(row['id'])
+
+def test_bulk_upsert_songs_validation(db_connection, sample_song_data):
+    """Test that rows the database would reject are reported, not loaded."""
+    too_long = sample_song_data.copy()
+    too_long['id'] = 'x' * 51
+    bad_date = sample_song_data.copy()
+    bad_date['release_date'] = '01/02/2023'
+    missing = {'id': 'test-bulk-missing'}
+    
+    result = bulk_upsert_songs([too_long, bad_date, missing, 'not a row'])
+    assert result.inserted == 0
+    assert [error.index for error in result.errors] == [0, 1, 2, 3]
+
+def test_get_song_reads_through_cache(db_connection, sample_song_data):
+    """Test that get_song serves cached songs and writes keep the cache current."""
+    song = create_song(sample_song_data)
+    try:
+        get_song(song.id)
+        
+        # Change the row behind the cache's back: the cached copy is served
+        with db_connection.cursor() as cur:
+            cur.execute("UPDATE songs SET name = 'Changed Directly' WHERE id = %s", (song.id,))
+        db_connection.commit()
+        assert get_song(song.id).name == sample_song_data['name']
+        
+        # Writes through the operations module evict the cached copy
+        update_song(song.id, {'genre': 'Cached Genre'})
+        assert get_song_cache().get(_song_key(song.id)) is None
+        cached = get_song(song.id)
+        assert cached.name == 'Changed Directly'
+        assert cached.genre == 'Cached Genre'
+        
+        get_song_cache().clear()
+        assert get_song(song.id).genre == 'Cached Genre'
+    finally:
+        delete_song(song.id)
+    
+    with pytest.raises(SongNotFoundError):
+        get_song(song.id)
+
+def test_read_racing_a_write_does_not_fill_cache(db_connection, sample_song_data, monkeypatch):
+    """Test that a read finishing after a write does not cache the row it read before it."""
+    song = create_song(sample_song_data)
+    decode = operations._song_from_row
+    raced = []
+
+    def write_during_read(row):
+        # The first decode is get_song's; the write commits before its fill
+        if not raced:
+            raced.append(row)
+            update_song(song.id, {'name': 'Written During Read'})
+        return decode(row)
+
+    try:
+        get_song_cache().clear()
+        monkeypatch.setattr(operations, '_song_from_row', write_during_read)
+        assert get_song(song.id).name == sample_song_data['name']
+        assert get_song_cache().get(_song_key(song.id)) is None
+        assert get_song(song.id).name == 'Written During Read'
+        
+        # Nor does one that finishes after a delete
+        monkeypatch.setattr(operations, '_song_from_row', lambda row: delete_song(song.id) and decode(row))
+        get_song_cache().clear()
+        get_song(song.id)
+        assert get_song_cache().get(_song_key(song.id)) is None
+    finally:
+        delete_song(song.id)
+
+def test_fill_interleaved_with_eviction(db_connection, sample_song_data, monkeypatch):
+    """Test that an eviction landing between a fill's checks and its store wins."""
+    song = create_song(sample_song_data)
+    may_fill = operations._may_fill
+
+    def evict_then_check(cache):
+        # A write commits and evicts after the read queried but before it stores
+        update_song(song.id, {'name': 'Evicted During Fill'})
+        return may_fill(cache)
+
+    try:
+        get_song_cache().clear()
+        monkeypatch.setattr(operations, '_may_fill', evict_then_check)
+        assert get_song(song.id).name == sample_song_data['name']
+        assert get_song_cache().get(_song_key(song.id)) is None
+        monkeypatch.setattr(operations, '_may_fill', may_fill)
+        assert get_song(song.id).name == 'Evicted During Fill'
+    finally:
+        delete_song(song.id)
+
+def test_get_songs(db_connection, sample_song_data):
+    """Test fetching many songs in request order with missing ids reported."""
+    ids = [f'test-batch-{i}' for i in range(3)]
+    for song_id in ids:
+        create_song({**sample_song_data, 'id': song_id})
+    try:
+        get_song_cache().clear()
+        get_song(ids[1])
+        
+        batch = get_songs([ids[2], 'test-batch-missing', ids[0], ids[1], ids[2]])
+        assert [song.id for song in batch.songs] == [ids[2], ids[0], ids[1]]
+        assert batch.missing == ['test-batch-missing']
+        
+        # Rows fetched by the batch are cached for later single reads
+        with db_connection.cursor() as cur:
+            cur.execute("UPDATE songs SET name = 'Changed Directly' WHERE id = %s", (ids[0],))
+        db_connection.commit()
+        assert get_song(ids[0]).name == sample_song_data['name']
+        
+        assert get_songs([]).songs == []
+    finally:
+        for song_id in ids:
+            delete_song(song_id)
+
+def test_get_songs_invalid(db_connection):
+    """Test that malformed or oversized id lists are rejected."""
+    with pytest.raises(InvalidDataError):
+        get_songs(['ok', 42])
+    with pytest.raises(InvalidDataError):
+        get_songs([f'id-{i}' for i in range(MAX_BATCH_GET + 1)])
+
+def test_list_pages_cached_until_write(db_connection, sample_song_data):
+    """Test that list results are cached and every write invalidates them."""
+    song_data = sample_song_data.copy()
+    song_data['genre'] = 'Listed Genre'
+    song = create_song(song_data)
+    try:
+        first = list_songs(genre='Listed Genre')
+        assert list_songs(genre='Listed Genre') is first
+        page = list_songs_page(genre='Listed Genre')
+        assert list_songs_page(genre='Listed Genre') is page
+        
+        version = get_list_cache().version('songs')
+        update_song(song.id, {'name': 'Relisted'})
+        assert get_list_cache().version('songs') == version + 1
+        assert list_songs(genre='Listed Genre')[0].name == 'Relisted'
+        assert list_songs_page(genre='Listed Genre').songs[0].name == 'Relisted'
+    finally:
+        delete_song(song.id)
+    
+    assert list_songs(genre='Listed Genre') == []
+
+def test_search_songs(db_connection, sample_song_data):
+    """Test ranked search with prefix matching and keyset pagination."""
+    songs = []
+    for i, (name, artist) in enumerate([
+        ('Morning Chant', 'Searchable Choir'),
+        ('Evening Chant', 'Searchable Choir'),
+        ('Chanting Monks', 'Other Ensemble'),
+        ('Unrelated Tune', 'Searchable Choir'),
+    ]):
+        song_data = sample_song_data.copy()
+        song_data.update({'id': f'test-search-{i}', 'name': name, 'artist': artist})
+        songs.append(create_song(song_data))
+    
+    try:
+        # Name matches rank above artist-only matches
+        results = search_songs('searchable chant').songs
+        assert {song.id for song in results[:2]} == {'test-search-0', 'test-search-1'}
+        
+        # Prefix matching supports search-as-you-type
+        prefix_ids = {song.id for song in search_songs('chan').songs}
+        assert {'test-search-0', 'test-search-1', 'test-search-2'} <= prefix_ids
+        
+        seen = []
+        cursor = None
+        while True:
+            page = search_songs('searchable', limit=2, cursor=cursor)
+            seen.extend(song.id for song in page.songs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert sorted(seen) == ['test-search-0', 'test-search-1', 'test-search-3']
+        assert len(seen) == len(set(seen))
+    finally:
+        for song in songs:
+            delete_song(song.id)
+
+def test_search_songs_invalid(db_connection):
+    """Test that empty queries and malformed cursors are rejected."""
+    with pytest.raises(InvalidDataError):
+        search_songs('  ?! ')
+    with pytest.raises(InvalidDataError):
+        search_songs('chant', cursor='bogus')
+
+def test_list_songs_sorted(db_connection, sample_song_data):
+    """Test every sort column in both directions, including keyset paging."""
+    songs = []
+    for i in range(4):
+        song_data = sample_song_data.copy()
+        song_data.update({
+            'id': f'test-sort-{i}',
+            'name': f'Sorted {3 - i}',
+            'album': 'Same Album',
+            'release_date': date(2020, 1, 1 + i % 2),
+            'genre': 'Sorted Genre'
+        })
+        songs.append(create_song(song_data))
+    
+    try:
+        for sort in SORT_COLUMNS:
+            for order in ('asc', 'desc'):
+                expected = sorted(songs, key=lambda s: (getattr(s, sort), s.id), reverse=order == 'desc')
+                expected_ids = [song.id for song in expected]
+                
+                listed = list_songs(genre='Sorted Genre', sort=sort, order=order)
+                assert [song.id for song in listed] == expected_ids
+                
+                seen = []
+                cursor = None
+                while True:
+                    page = list_songs_page(limit=3, cursor=cursor, genre='Sorted Genre', sort=sort, order=order)
+                    seen.extend(song.id for song in page.songs)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+                assert seen == expected_ids
+        
+        # Cursors are bound to the sort they were issued for
+        cursor = list_songs_page(limit=1, genre='Sorted Genre', sort='album').next_cursor
+        with pytest.raises(InvalidDataError):
+            list_songs_page(limit=1, cursor=cursor, genre='Sorted Genre', sort='name')
+    finally:
+        for song in songs:
+            delete_song(song.id)
+
+def test_list_songs_invalid_sort(db_connection):
+    """Test that only whitelisted sorts are accepted."""
+    with pytest.raises(InvalidDataError):
+        list_songs(sort='duration_in_seconds')
+    with pytest.raises(InvalidDataError):
+        list_songs_page(sort='name; DROP TABLE songs')
+    with pytest.raises(InvalidDataError):
+        list_songs(order='sideways')
+
+def _plan_nodes(plan):
+    """Yield every node type in an EXPLAIN (FORMAT JSON) plan."""
+    yield plan['Node Type']
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+def _stats_bucket(buckets, value):
+    return next((bucket for bucket in buckets if bucket.value == value), None)
+
+def test_stats_rollup_tracks_writes(db_connection, sample_song_data):
+    """Test that inserts, updates and deletes keep the rollup current."""
+    before = get_stats()
+    first = create_song({**sample_song_data, 'id': 'test-stats-1', 'genre': 'Stats Genre',
+                         'release_date': date(1999, 5, 1), 'duration_in_seconds': 100})
+    second = create_song({**sample_song_data, 'id': 'test-stats-2', 'genre': 'Stats Genre',
+                          'release_date': date(1999, 6, 1), 'duration_in_seconds': 200})
+    try:
+        stats = get_stats()
+        assert stats.total.song_count == before.total.song_count + 2
+        assert stats.total.total_duration == before.total.total_duration + 300
+        genre = _stats_bucket(stats.by_genre, 'Stats Genre')
+        assert (genre.song_count, genre.total_duration, genre.average_duration) == (2, 300, 150.0)
+        assert _stats_bucket(stats.by_release_year, 1999).song_count == 2
+        
+        update_song(second.id, {'genre': 'Other Stats Genre', 'duration_in_seconds': 250})
+        stats = get_stats('genre')
+        assert _stats_bucket(stats.by_genre, 'Stats Genre').total_duration == 100
+        assert _stats_bucket(stats.by_genre, 'Other Stats Genre').total_duration == 250
+        assert stats.by_artist == [] and stats.by_release_year == []
+    finally:
+        delete_song(first.id)
+        delete_song(second.id)
+    
+    stats = get_stats()
+    assert stats.total == before.total
+    assert _stats_bucket(stats.by_genre, 'Stats Genre') is None
+    assert _stats_bucket(stats.by_release_year, 1999) is None
+
+def test_stats_rollup_matches_full_aggregate(db_connection, sample_song_data):
+    """Test that the rollup equals a GROUP BY over songs after bulk writes."""
+    rows = [
+        {**sample_song_data, 'id': f'test-stats-bulk-{i}', 'artist': f'Stats Artist {i % 3}',
+         'duration_in_seconds': 100 + i}
+        for i in range(20)
+    ]
+    bulk_upsert_songs(rows)
+    bulk_upsert_songs([{**row, 'genre': 'Bulk Stats Genre'} for row in rows[:5]] + [rows[5]])
+    try:
+        with db_connection.cursor() as cur:
+            cur.execute("""
+                SELECT 'artist', artist, count(*), sum(duration_in_seconds) FROM songs GROUP BY artist
+                UNION ALL
+                SELECT 'genre', genre, count(*), sum(duration_in_seconds) FROM songs GROUP BY genre
+                UNION ALL
+                SELECT 'release_year', extract(year FROM release_date)::int::text, count(*), sum(duration_in_seconds)
+                FROM songs GROUP BY 2
+                ORDER BY 1, 2
+            """)
+            expected = cur.fetchall()
+            cur.execute("SELECT dimension, value, song_count, total_duration FROM song_stats ORDER BY 1, 2")
+            assert cur.fetchall() == expected
+            cur.execute("SELECT count(*), sum(duration_in_seconds) FROM songs")
+            count, duration = cur.fetchone()
+        total = get_stats('artist').total
+        assert (total.song_count, total.total_duration) == (count, duration)
+    finally:
+        for row in rows:
+            delete_song(row['id'])
+
+def test_stats_rollup_writers_do_not_share_a_row(db_connection, sample_song_data):
+    """Test that writers touching different buckets do not wait on each other's rollup rows."""
+    other = get_db_connection()
+    insert = (
+        "INSERT INTO songs (id, name, artist, album, release_date, genre, duration_in_seconds) "
+        "VALUES (%s, 'n', %s, 'a', %s, %s, 1)"
+    )
+    try:
+        with db_connection.cursor() as cur:
+            cur.execute(insert, ('test-stats-lock-1', 'Lock Artist 1', date(1901, 1, 1), 'Lock Genre 1'))
+        # The first transaction is still open; the second must not block behind it
+        with other.cursor() as cur:
+            cur.execute("SET lock_timeout = '1s'")
+            cur.execute(insert, ('test-stats-lock-2', 'Lock Artist 2', date(1902, 1, 1), 'Lock Genre 2'))
+    finally:
+        other.rollback()
+        other.close()
+        db_connection.rollback()
+
+def test_get_stats_invalid_dimension(db_connection):
+    """Test that unknown dimensions are rejected."""
+    with pytest.raises(InvalidDataError):
+        get_stats('album')
+
+def test_sorted_lists_are_index_backed(db_connection):
+    """Test that every allowed sort has a plan without a Sort node."""
+    try:
+        with db_connection.cursor() as cur:
+            # With sorting priced out, a Sort node only appears if no index can deliver the order
+            cur.execute("SET LOCAL enable_sort = off")
+            for sort in SORT_COLUMNS:
+                for order in ('asc', 'desc'):
+                    for genre, artist in ((None, None), ('Rock', None), (None, 'Queen')):
+                        # The statements list_songs and a later list_songs_page page run
+                        position = (date(2000, 1, 1) if sort == 'release_date' else 'M', 'M')
+                        for shape, query, params in (
+                            _list_query(20, 0, genre, artist, sort, order),
+                            _page_query(20, position, genre, artist, sort, order),
+                        ):
+                            cur.execute(sql.SQL("EXPLAIN (FORMAT JSON) {}").format(query), params)
+                            plan = cur.fetchone()[0]
+                            if isinstance(plan, str):
+                                plan = json.loads(plan)
+                            nodes = set(_plan_nodes(plan[0]['Plan']))
+                            assert 'Sort' not in nodes, f"{shape} genre={genre} artist={artist}"
+    finally:
+        db_connection.rollback()
@@ -5,6 +5,7 @@ import pytest
 from aws_cdk import App, Stack
 from infrastructure.app_stack import OurChantsStack
 from aws_cdk import aws_s3 as s3
+from aws_cdk.assertions import Template
 
 @pytest.fixture(scope="module")
 def stack():
@@ -35,6 +36,34 @@ def test_lambda_created(stack):
     assert lambda_func.runtime.name == "python3.9"
     assert lambda_func.timeout.to_seconds() == 30
 
+def test_lambda_reads_database_secret(stack):
+    """Test that the Lambda is told which secret holds the database credentials"""
+    template = Template.from_stack(stack)
+    functions = template.find_resources("AWS::Lambda::Function")
+    variables = [
+        resource["Properties"]["Environment"]["Variables"]
+        for resource in functions.values()
+        if "Environment" in resource["Properties"]
+    ]
+    assert any("DB_SECRET_ARN" in env for env in variables)
+
+def test_read_replica_optional(stack):
+    """Test that the read replica is only provisioned when requested through context"""
+    assert stack.node.try_find_child("OurChantsReadReplica") is None
+
+    app = App(context={"read_replica": "true"})
+    replica_stack = OurChantsStack(app, "OurChantsReplicaTestStack")
+    assert replica_stack.node.try_find_child("OurChantsReadReplica") is not None
+
+    template = Template.from_stack(replica_stack)
+    functions = template.find_resources("AWS::Lambda::Function")
+    variables = [
+        resource["Properties"]["Environment"]["Variables"]
+        for resource in functions.values()
+        if "Environment" in resource["Properties"]
+    ]
+    assert any("DB_READ_HOST" in env for env in variables)
+
 def test_api_gateway_created(stack):
     """Test that API Gateway is created with correct configuration"""
     api = stack.node.find_child("OurChantsAPIGateway")
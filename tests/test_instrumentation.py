@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test suite for per-request timing instrumentation.
+"""
+
+import pytest
+from dotenv import load_dotenv
+from src.api import api
+from src.database import instrumentation, operations
+from src.database.cache import NullCache
+
+@pytest.fixture
+def uncached(monkeypatch):
+    """Fixture disabling the caches so every request reaches the database."""
+    load_dotenv()
+    monkeypatch.setattr(operations, '_song_cache', NullCache())
+    monkeypatch.setattr(operations, '_list_cache', NullCache())
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """Fixture capturing EMF records emitted by the handler."""
+    records = []
+    monkeypatch.setattr(api, '_cold_start', False)
+    monkeypatch.setattr(api, 'emit_metrics', lambda metrics, **kwargs: records.append((metrics, kwargs)))
+    return records
+
+def test_hooks_are_noops_outside_a_request():
+    """Test that timers and counters do nothing without an active request."""
+    assert instrumentation.current() is None
+    with instrumentation.timed('query'):
+        pass
+    instrumentation.count('rows', 5)
+    assert instrumentation.current() is None
+
+def test_disabled_by_default(uncached, emitted, monkeypatch):
+    """Test that no header or metrics are produced when instrumentation is off."""
+    monkeypatch.setattr(instrumentation, 'ENABLED', False)
+    response = api.handler({'httpMethod': 'GET', 'path': '/songs', 'queryStringParameters': {'limit': '3'}}, None)
+    assert 'Server-Timing' not in (response.get('headers') or {})
+    assert emitted == []
+
+def test_server_timing_and_metrics(uncached, emitted, monkeypatch):
+    """Test that a request reports connect/query/fetch/decode/serialize phases and counters."""
+    monkeypatch.setattr(instrumentation, 'ENABLED', True)
+    operations.close_pool()
+
+    response = api.handler({'httpMethod': 'GET', 'path': '/songs', 'queryStringParameters': {'limit': '3'}}, None)
+    assert response['statusCode'] == 200
+    timing = response['headers']['Server-Timing']
+    phases = [entry.split(';')[0] for entry in timing.split(', ')]
+    assert phases == ['connect', 'query', 'fetch', 'decode', 'serialize', 'total']
+    assert 'desc="1 round trips"' in timing
+
+    metrics, kwargs = emitted[-1]
+    assert kwargs['dimensions']['Route'] == 'GET /songs'
+    assert metrics['Connects'] == (1, 'Count')
+    assert metrics['RoundTrips'] == (1, 'Count')
+    assert metrics['Rows'] == (4, 'Count')  # keyset pages fetch one extra row
+    assert metrics['QueryTime'][1] == 'Milliseconds'
+
+    # The pooled connection is reused, so the next request has no connect phase
+    response = api.handler({'httpMethod': 'GET', 'path': '/songs/SONG001'}, None)
+    assert not response['headers']['Server-Timing'].startswith('connect')
+    assert emitted[-1][0]['Connects'] == (0, 'Count')
+    assert emitted[-1][1]['dimensions']['Route'] == 'GET /songs/{song_id}'
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test suite for API metrics and cold-start initialization.
+"""
+
+import io
+import json
+from dotenv import load_dotenv
+from src.api import api
+from src.api.metrics import emf_record, emit_metrics
+from src.database.operations import DatabaseError, close_pool, get_pool, prewarm_pool
+
+def test_emf_record_layout():
+    """Test that records follow the Embedded Metric Format."""
+    record = emf_record(
+        {'InitDuration': (12.5, 'Milliseconds')},
+        dimensions={'Service': 'test'},
+        properties={'RequestId': 'abc'},
+        namespace='Test'
+    )
+    directive = record['_aws']['CloudWatchMetrics'][0]
+    assert directive == {
+        'Namespace': 'Test',
+        'Dimensions': [['Service']],
+        'Metrics': [{'Name': 'InitDuration', 'Unit': 'Milliseconds'}]
+    }
+    assert isinstance(record['_aws']['Timestamp'], int)
+    assert record['Service'] == 'test'
+    assert record['InitDuration'] == 12.5
+    assert record['RequestId'] == 'abc'
+
+def test_emit_metrics_writes_one_line():
+    """Test that a record is written as a single JSON line."""
+    stream = io.StringIO()
+    emit_metrics({'ColdStart': (1, 'Count')}, stream=stream)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['ColdStart'] == 1
+
+def test_handler_reports_init_duration_once(monkeypatch, capsys):
+    """Test that only the first invocation of a container reports the cold start."""
+    monkeypatch.setattr(api, '_cold_start', True)
+    event = {'httpMethod': 'GET', 'path': '/missing'}
+
+    api.handler(event, None)
+    api.handler(event, None)
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 1
+    assert records[0]['ColdStart'] == 1
+    assert records[0]['InitDuration'] == api.INIT_DURATION_MS
+    assert api.INIT_DURATION_MS > 0
+
+def test_initialize_prewarm_failure_is_logged(monkeypatch):
+    """Test that an unreachable database does not fail module initialization."""
+    def failing_prewarm(connections):
+        raise DatabaseError("unreachable")
+
+    monkeypatch.setenv('DB_POOL_PREWARM', '2')
+    monkeypatch.setattr(api, 'prewarm_pool', failing_prewarm)
+    assert api._initialize() == 0
+
+    monkeypatch.setenv('DB_POOL_PREWARM', '0')
+    assert api._initialize() == 0
+
+def test_prewarm_pool_opens_idle_connections():
+    """Test that prewarmed connections are left idle in the pool."""
+    load_dotenv()
+    close_pool()
+    try:
+        prewarm_pool(2)
+        assert get_pool().idle_count == 2
+    finally:
+        close_pool()
+
+def test_pool_opens_min_size_connections(monkeypatch):
+    """Test that DB_POOL_MIN_SIZE connections are opened when the pool is created."""
+    load_dotenv()
+    close_pool()
+    monkeypatch.setenv('DB_POOL_MIN_SIZE', '2')
+    try:
+        assert get_pool().idle_count == 2
+    finally:
+        close_pool()
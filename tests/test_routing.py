@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test suite for API request routing.
+"""
+
+import json
+import pytest
+from src.api.api import handler, router
+from src.api.routing import Router
+
+def _handler(name):
+    return lambda event, params: name
+
+def test_static_and_parameter_routes():
+    """Test literal matches, parameter extraction and trailing slashes."""
+    r = Router()
+    r.add('GET', '/songs', _handler('list'))
+    r.add('GET', '/songs/{song_id}', _handler('get'))
+    r.add('GET', '/songs/{song_id}/credits/{credit_id}', _handler('credit'))
+
+    assert r.resolve('GET', '/songs').handler(None, None) == 'list'
+    assert r.resolve('GET', '/songs/').handler(None, None) == 'list'
+
+    match = r.resolve('get', '/songs/SONG001')
+    assert match.handler(None, None) == 'get'
+    assert match.params == {'song_id': 'SONG001'}
+    assert match.template == '/songs/{song_id}'
+
+    match = r.resolve('GET', '/songs/SONG001/credits/7')
+    assert match.params == {'song_id': 'SONG001', 'credit_id': '7'}
+
+def test_literal_segments_take_precedence():
+    """Test that a literal sibling wins over a parameter, with backtracking."""
+    r = Router()
+    r.add('GET', '/songs/search', _handler('search'))
+    r.add('GET', '/songs/{song_id}', _handler('get'))
+    r.add('GET', '/songs/{song_id}/lyrics', _handler('lyrics'))
+
+    assert r.resolve('GET', '/songs/search').handler(None, None) == 'search'
+    match = r.resolve('GET', '/songs/search/lyrics')
+    assert match.handler(None, None) == 'lyrics'
+    assert match.params == {'song_id': 'search'}
+
+def test_literal_segments_fall_back_per_method():
+    """Test that a literal route only shadows a parameter for its own methods."""
+    r = Router()
+    r.add('GET', '/songs/search', _handler('search'))
+    r.add('GET', '/songs/{song_id}', _handler('get'))
+    r.add('PUT', '/songs/{song_id}', _handler('put'))
+
+    assert r.resolve('GET', '/songs/search').handler(None, None) == 'search'
+    match = r.resolve('PUT', '/songs/search')
+    assert match.handler(None, None) == 'put'
+    assert match.params == {'song_id': 'search'}
+    assert match.template == '/songs/{song_id}'
+
+    match = r.resolve('POST', '/songs/search')
+    assert match.handler is None
+    assert match.params == {}
+    assert match.allowed == {'GET'}
+
+def test_unknown_paths_and_methods():
+    """Test 404-style and 405-style results."""
+    r = Router()
+    r.add('GET', '/songs/{song_id}', _handler('get'))
+    r.add('DELETE', '/songs/{song_id}', _handler('delete'))
+
+    assert r.resolve('GET', '/albums').handler is None
+    assert r.resolve('GET', '/albums').allowed == frozenset()
+    assert r.resolve('GET', '/songs/a/b').handler is None
+
+    match = r.resolve('POST', '/songs/SONG001')
+    assert match.handler is None
+    assert match.allowed == {'GET', 'DELETE'}
+
+def test_conflicting_registrations():
+    """Test that duplicate routes and mismatched parameter names are rejected."""
+    r = Router()
+    r.add('GET', '/songs/{song_id}', _handler('get'))
+    with pytest.raises(ValueError):
+        r.add('GET', '/songs/{song_id}', _handler('again'))
+    with pytest.raises(ValueError):
+        r.add('PUT', '/songs/{id}', _handler('put'))
+
+def test_api_routes_registered():
+    """Test that every API endpoint is in the routing table."""
+    assert router.resolve('GET', '/songs').allowed == {'GET', 'POST'}
+    assert router.resolve('POST', '/songs:batch').handler is not None
+    assert router.resolve('GET', '/songs/search').handler is not None
+    assert router.resolve('GET', '/songs/x').allowed == {'GET', 'PUT', 'DELETE'}
+    for song_id in ('search', 'export'):
+        assert router.resolve('PUT', f'/songs/{song_id}').params == {'song_id': song_id}
+        assert router.resolve('DELETE', f'/songs/{song_id}').handler is not None
+
+def test_handler_method_not_allowed():
+    """Test that a known path with an unsupported method returns 405."""
+    response = handler({'httpMethod': 'PATCH', 'path': '/songs/SONG001'}, None)
+    assert response['statusCode'] == 405
+    assert response['headers']['Allow'] == 'DELETE, GET, PUT'
+    assert json.loads(response['body']) == {'error': 'Method Not Allowed'}
+
+    response = handler({'httpMethod': 'GET', 'path': '/albums'}, None)
+    assert response['statusCode'] == 404
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test suite for API response serialization.
+"""
+
+import csv
+import io
+import json
+from dataclasses import asdict
+from datetime import date, datetime, timezone
+import pytest
+from dotenv import load_dotenv
+from src.api import serialization
+from src.api.api import handler
+from src.database.operations import Song, create_song, delete_song
+
+def _song(**overrides):
+    data = {
+        'id': 'SER001',
+        'name': 'Ça "quoted" \\ song',
+        'artist': 'Test Artist',
+        'album': None,
+        'release_date': date(2023, 1, 2),
+        'genre': 'Test Genre',
+        'duration_in_seconds': 180,
+        'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        'updated_at': None
+    }
+    data.update(overrides)
+    return Song(**data)
+
+def _expected(song):
+    return json.loads(json.dumps(asdict(song), default=lambda value: value.isoformat()))
+
+@pytest.fixture(params=['stdlib', 'orjson'])
+def backend(request, monkeypatch):
+    """Run a test against each available serializer backend."""
+    if request.param == 'stdlib':
+        monkeypatch.setattr(serialization, 'orjson', None)
+        monkeypatch.setattr(serialization, 'encode_song', serialization._encode_song_stdlib)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+def test_dumps_song_matches_stdlib_json(backend):
+    """Test that each backend produces the same document as json.dumps."""
+    song = _song()
+    assert json.loads(serialization.dumps_song(song)) == _expected(song)
+
+def test_dumps_songs(backend):
+    """Test list encoding, including the empty list."""
+    songs = [_song(id=f'SER{i}') for i in range(3)]
+    assert json.loads(serialization.dumps_songs(songs)) == [_expected(song) for song in songs]
+    assert serialization.dumps_songs([]) == '[]'
+
+def test_iter_songs_json_chunks(backend):
+    """Test that streamed chunks join into a valid JSON array."""
+    songs = [_song(id=f'SER{i}') for i in range(5)]
+    chunks = list(serialization.iter_songs_json(songs, chunk_size=2))
+    assert len(chunks) == 5
+    assert json.loads(''.join(chunks)) == [_expected(song) for song in songs]
+    assert ''.join(serialization.iter_songs_json([])) == '[]'
+
+def test_iter_songs_ndjson_and_csv(backend):
+    """Test the export encoders: one JSON document per line, CSV with a header row."""
+    songs = [_song(id=f'SER{i}') for i in range(5)]
+    chunks = list(serialization.iter_songs_ndjson(songs, chunk_size=2))
+    assert len(chunks) == 3
+    assert [json.loads(line) for line in ''.join(chunks).splitlines()] == [_expected(song) for song in songs]
+    assert list(serialization.iter_songs_ndjson([])) == []
+
+    chunks = list(serialization.iter_songs_csv(songs, chunk_size=2))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+    assert [row['id'] for row in rows] == [song.id for song in songs]
+    assert rows[0]['name'] == songs[0].name
+    assert rows[0]['album'] == ''
+    assert rows[0]['created_at'] == '2024-05-01T12:30:15.123456+00:00'
+    assert ''.join(serialization.iter_songs_csv([])) == ','.join(serialization.CSV_COLUMNS) + '\n'
+
+def test_dumps_handles_dates_and_dataclasses(backend):
+    """Test the generic encoder used for other payloads."""
+    payload = {'when': date(2024, 1, 1), 'song': _song()}
+    assert json.loads(serialization.dumps(payload)) == {'when': '2024-01-01', 'song': _expected(_song())}
+    with pytest.raises(TypeError):
+        serialization.dumps({'bad': object()})
+
+@pytest.fixture
+def song():
+    """Fixture providing a song stored in the database."""
+    load_dotenv()
+    song = create_song({
+        'id': 'test-serialization-1',
+        'name': 'Serialized Song',
+        'artist': 'Test Artist',
+        'album': 'Test Album',
+        'release_date': date(2023, 1, 1),
+        'genre': 'Test Genre',
+        'duration_in_seconds': 180
+    })
+    yield song
+    delete_song(song.id)
+
+def test_handler_serializes_dates(song):
+    """Test that song responses encode dates instead of failing."""
+    response = handler({'httpMethod': 'GET', 'path': f'/songs/{song.id}'}, None)
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['release_date'] == '2023-01-01'
+    assert datetime.fromisoformat(body['updated_at']) == song.updated_at
+
+    response = handler({
+        'httpMethod': 'GET',
+        'path': '/songs',
+        'queryStringParameters': {'artist': 'Test Artist', 'limit': '100'}
+    }, None)
+    assert response['statusCode'] == 200
+    assert song.id in [item['id'] for item in json.loads(response['body'])]
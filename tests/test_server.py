@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test suite for the WSGI/ASGI server adapter.
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import date
+import pytest
+from dotenv import load_dotenv
+from src.api import api, server
+from src.database.operations import create_song, delete_song
+
+@pytest.fixture
+def song():
+    """Fixture providing one stored song."""
+    load_dotenv()
+    song = create_song({
+        'id': 'test-server-1',
+        'name': 'Server Song',
+        'artist': 'Server Artist',
+        'album': 'Server Album',
+        'release_date': date(2023, 1, 1),
+        'genre': 'Server Genre',
+        'duration_in_seconds': 200
+    })
+    yield song
+    delete_song(song.id)
+
+@pytest.fixture
+def base_url():
+    """Fixture running the threaded WSGI server on a free port."""
+    httpd = server.make_app_server(port=0, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def _request(url, method='GET', body=None, headers=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_build_event():
+    """Test that plain HTTP requests become API Gateway proxy events."""
+    event = server.build_event('get', '/songs', 'genre=Rock&ids=a&ids=b', {'Accept': '*/*'}, b'')
+    assert event['httpMethod'] == 'GET'
+    assert event['queryStringParameters'] == {'genre': 'Rock', 'ids': 'b'}
+    assert event['multiValueQueryStringParameters']['ids'] == ['a', 'b']
+    assert event['body'] is None
+    assert server.build_event('GET', '/songs')['queryStringParameters'] is None
+
+    binary = server.build_event('POST', '/songs', body=b'\xff\x00')
+    assert binary['isBase64Encoded']
+
+def test_wsgi_server_routes(song, base_url):
+    """Test reads, writes, errors and compression through the HTTP server."""
+    status, headers, body = _request(f"{base_url}/songs/test-server-1")
+    assert status == 200
+    assert headers['Content-Type'] == 'application/json'
+    assert json.loads(body)['name'] == 'Server Song'
+
+    status, headers, body = _request(f"{base_url}/songs/test-server-1", 'PUT', {'name': 'Renamed'})
+    assert status == 200
+    assert 'X-Consistency-Token' in headers
+    assert json.loads(body)['name'] == 'Renamed'
+
+    status, headers, _ = _request(f"{base_url}/songs/test-server-1", 'PATCH', {})
+    assert status == 405
+    assert headers['Allow'] == 'DELETE, GET, PUT'
+    assert _request(f"{base_url}/nothing")[0] == 404
+
+    status, headers, body = _request(f"{base_url}/songs?limit=50", headers={'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert isinstance(json.loads(gzip.decompress(body)), list)
+
+    status, headers, body = _request(f"{base_url}/songs/export?format=csv&genre=Server%20Genre")
+    assert status == 200
+    assert headers['Content-Type'] == 'text/csv; charset=utf-8'
+    assert body.decode('utf-8').splitlines()[1].startswith('test-server-1,Renamed,')
+
+def _asgi(method, path, query=b'', body=b''):
+    """Drive asgi_app for one request and collect what it sends."""
+    sent = []
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query, 'headers': []}
+    asyncio.run(server.asgi_app(scope, receive, send))
+    return sent[0], b''.join(message.get('body', b'') for message in sent[1:])
+
+def test_asgi_app(song):
+    """Test the ASGI application serves the same routes."""
+    start, body = _asgi('GET', '/songs', b'ids=test-server-1,missing')
+    assert start['status'] == 200
+    assert json.loads(body)['missing'] == ['missing']
+
+    start, body = _asgi('POST', '/songs:batchGet', body=b'["test-server-1"]')
+    assert start['status'] == 200
+    assert [s['id'] for s in json.loads(body)['songs']] == ['test-server-1']
+
+def test_streamed_bodies(monkeypatch):
+    """Test that iterator bodies are streamed by the server and joined for Lambda."""
+    def chunks(event, params):
+        return {'statusCode': 200, 'body': iter(['[', '1', ',2', ']'])}
+
+    match = api.router.resolve('GET', '/stats')
+    monkeypatch.setattr(api.router, 'resolve', lambda method, path: match._replace(handler=chunks))
+
+    assert api.handler({'httpMethod': 'GET', 'path': '/stats'}, None)['body'] == '[1,2]'
+    start, body = _asgi('GET', '/stats')
+    assert body == b'[1,2]'
+
+def test_abandoned_bodies_are_closed(monkeypatch):
+    """Test that a body cut off by the Lambda size cap or a closed WSGI response is closed."""
+    closed = []
+
+    def body():
+        try:
+            while True:
+                yield 'x' * 64
+        finally:
+            closed.append(True)
+
+    def chunks(event, params):
+        return {'statusCode': 200, 'body': body()}
+
+    match = api.router.resolve('GET', '/stats')
+    monkeypatch.setattr(api.router, 'resolve', lambda method, path: match._replace(handler=chunks))
+    monkeypatch.setattr(api, 'LAMBDA_MAX_BODY_BYTES', 1000)
+
+    assert api.handler({'httpMethod': 'GET', 'path': '/stats'}, None)['statusCode'] == 413
+    assert closed == [True]
+
+    response = server._response_body({'statusCode': 200, 'body': body()})
+    assert next(response) == b'x' * 64
+    response.close()
+    assert closed == [True, True]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test suite for the slow-query log and its report script.
+"""
+
+import json
+import logging
+from datetime import date
+import pytest
+from dotenv import load_dotenv
+from scripts.slow_query_report import read_records, summarize
+from src.database import slow_queries
+from src.database.cache import NullCache
+from src.database import operations
+from src.database.operations import create_song, delete_song, get_song, list_songs, update_song
+
+@pytest.fixture
+def slow_log(monkeypatch, caplog):
+    """Fixture logging every statement as slow and explaining all of them."""
+    load_dotenv()
+    monkeypatch.setattr(slow_queries, 'THRESHOLD', 0.0)
+    monkeypatch.setattr(slow_queries, 'EXPLAIN_RATE', 1.0)
+    monkeypatch.setattr(operations, '_song_cache', NullCache())
+    monkeypatch.setattr(operations, '_list_cache', NullCache())
+    caplog.set_level(logging.WARNING, logger=slow_queries.__name__)
+    return caplog
+
+def _records(caplog):
+    return list(read_records(record.getMessage() for record in caplog.records))
+
+def test_param_shape_hides_values():
+    """Test that parameters are described by type and length only."""
+    assert slow_queries.param_shape(('abc', 3, None, ['a', 'b'])) == ['str', 'int', 'null', 'list[2]']
+    assert slow_queries.param_shape({'text': 'x', 'limit': 5}) == {'text': 'str', 'limit': 'int'}
+    assert slow_queries._threshold('') is None
+    assert slow_queries._threshold('-1') is None
+    assert slow_queries._threshold('250') == 0.25
+
+def test_slow_select_logged_with_plan(slow_log):
+    """Test that a slow read logs its statement, parameter shape and plan."""
+    list_songs(limit=5, genre='Rock')
+    record = _records(slow_log)[-1]
+    assert record['statement'].startswith('SELECT "id", "name"')
+    assert 'Rock' not in record['statement'] + json.dumps(record['params'])
+    assert record['params'] == ['str', 'int', 'int']
+    assert record['plan']['Plan']['Node Type'] == 'Limit'
+    assert 'Execution Time' in record['plan']
+
+def test_explained_writes_are_rolled_back(slow_log):
+    """Test that EXPLAIN ANALYZE of a write does not apply it a second time."""
+    try:
+        create_song({
+            'id': 'test-slow-1', 'name': 'Slow Song', 'artist': 'Slow Artist', 'album': 'Slow Album',
+            'release_date': date(2023, 1, 1), 'genre': 'Slow Genre', 'duration_in_seconds': 100
+        })
+        update_song('test-slow-1', {'name': 'Slower Song'})
+        insert, update = [r for r in _records(slow_log) if r['statement'].startswith(('INSERT', 'UPDATE'))]
+        # The INSERT cannot run again in its transaction, so only its estimate is kept
+        assert 'Actual Rows' not in insert['plan']['Plan']
+        assert update['plan']['Plan']['Actual Rows'] == 1
+        assert get_song('test-slow-1').name == 'Slower Song'
+        stats = operations.get_stats('genre')
+        assert [b.song_count for b in stats.by_genre if b.value == 'Slow Genre'] == [1]
+    finally:
+        delete_song('test-slow-1')
+
+def test_report_groups_by_statement():
+    """Test the report's grouping, ordering and plan hints."""
+    plan = {'Plan': {'Node Type': 'Limit', 'Plans': [
+        {'Node Type': 'Sort', 'Sort Key': ['name'], 'Actual Rows': 10, 'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'songs', 'Actual Rows': 5000}
+        ]}
+    ]}}
+    lines = [
+        'START RequestId: 1',
+        '2024-01-01T00:00:00Z WARNING {"event":"slow_query","statement":"SELECT a","params":[],"duration_ms":5.0,"rows":1}',
+        '{"event":"slow_query","statement":"SELECT b","params":["str"],"duration_ms":40.0,"rows":1,"plan":' + json.dumps(plan) + '}',
+        '{"event":"slow_query","statement":"SELECT a","params":[],"duration_ms":7.0,"rows":1}',
+        '{"event":"slow_query", broken',
+    ]
+    summary = summarize(read_records(lines))
+    assert [group['statement'] for group in summary] == ['SELECT b', 'SELECT a']
+    assert summary[1]['count'] == 2
+    assert summary[1]['total_ms'] == 12.0
+    assert summary[1]['max_ms'] == 7.0
+    assert summary[0]['hints'] == ['Sort by name (10 rows)', 'Seq Scan on songs (5000 rows)']
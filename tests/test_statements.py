@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test suite for the statement cache and server-side prepared statements.
+"""
+
+from datetime import date
+import pytest
+from dotenv import load_dotenv
+from src.database import operations, statements
+from src.database.cache import NullCache
+from src.database.operations import (
+    InvalidDataError,
+    create_song,
+    delete_song,
+    get_song,
+    list_songs,
+    update_song,
+)
+
+@pytest.fixture
+def uncached(monkeypatch):
+    """Fixture disabling the caches so every call reaches the database."""
+    load_dotenv()
+    monkeypatch.setattr(operations, '_song_cache', NullCache())
+    monkeypatch.setattr(operations, '_list_cache', NullCache())
+
+def _session_statements(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM pg_prepared_statements")
+        return {row[0] for row in cur.fetchall()}
+
+def test_placeholders_are_numbered():
+    """Test that positional, named and escaped placeholders are rewritten for PREPARE."""
+    positional = statements.Statement('s1', "SELECT * FROM songs WHERE genre = %s LIMIT %s")
+    assert positional.prepare == "PREPARE s1 AS SELECT * FROM songs WHERE genre = $1 LIMIT $2; EXECUTE s1 (%s, %s)"
+    assert positional.args(('Rock', 5)) == ['Rock', 5]
+
+    named = statements.Statement('s2', "SELECT %(text)s <%% name, word_similarity(%(text)s, album) LIMIT %(limit)s")
+    assert named.prepare.startswith("PREPARE s2 AS SELECT $1 <%% name, word_similarity($1, album) LIMIT $2;")
+    assert named.execute == "EXECUTE s2 (%s, %s)"
+    assert named.args({'limit': 3, 'text': 'abc', 'unused': 1}) == ['abc', 3]
+    assert named.named(['abc', 3]) == {'text': 'abc', 'limit': 3}
+
+    assert statements.Statement('s3', "SELECT 1").execute == "EXECUTE s3"
+
+def test_shapes_are_prepared_once_per_connection(uncached):
+    """Test that repeated calls with one shape reuse a single prepared statement."""
+    first = list_songs(limit=3, genre='Rock')
+    shape, query, _ = operations._list_query(3, 0, 'Rock', None, 'name', 'asc')
+    assert query is operations._list_query(5, 10, 'Pop', None, 'name', 'asc')[1]
+    name = statements.statement(shape, query, None).name
+
+    assert list_songs(limit=3, genre='Rock') == first
+    with operations._connection() as conn:
+        assert name in conn.prepared
+        assert name in _session_statements(conn)
+
+def test_lost_statements_are_prepared_again(uncached):
+    """Test recovery when the session forgets statements the connection remembers."""
+    song = get_song('SONG001')
+    with operations._connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DEALLOCATE ALL")
+        remembered = set(conn.prepared)
+    assert remembered
+    assert get_song('SONG001') == song
+
+def test_failed_first_execute_is_recovered(uncached):
+    """Test that a statement prepared by a failed call is reused by the next one."""
+    song = {
+        'id': 'test-prepared-1', 'name': 'Prepared Song', 'artist': 'Prepared Artist',
+        'album': 'Prepared Album', 'release_date': date(2023, 1, 1), 'genre': 'Prepared Genre',
+        'duration_in_seconds': 100
+    }
+    operations.close_pool()
+    try:
+        # A NULL name fails the INSERT after its PREPARE succeeded on the new connection
+        with pytest.raises(operations.DatabaseError):
+            create_song(dict(song, name=None))
+        assert create_song(song).name == 'Prepared Song'
+        assert update_song('test-prepared-1', {'genre': 'Pop', 'name': 'Renamed'}).name == 'Renamed'
+        with pytest.raises(InvalidDataError):
+            update_song('test-prepared-1', {'id': 'test-prepared-2'})
+    finally:
+        delete_song('test-prepared-1')
+
+def test_disabled_runs_plain_text(uncached, monkeypatch):
+    """Test that DB_PREPARED_STATEMENTS=false runs the cached SQL without preparing it."""
+    monkeypatch.setattr(statements, 'ENABLED', False)
+    operations.close_pool()
+    songs = list_songs(limit=2, artist='Queen')
+    assert all(song.artist == 'Queen' for song in songs)
+    with operations._connection() as conn:
+        assert conn.prepared == set()
+        assert _session_statements(conn) == set()